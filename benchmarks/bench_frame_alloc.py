@@ -0,0 +1,96 @@
+"""numpy → QImage 변환 경로의 프레임당 메모리 할당 micro-benchmark.
+
+    python -m benchmarks.bench_frame_alloc [--shape 512 512 600] [--frames 200]
+
+기존 경로 (np.flip + np.rot90 + float64 정규화 + tobytes) 와
+FrameBuffer 재사용 경로 (stride view + LUT → uint8 버퍼 → QImage wrap) 를 비교한다.
+프레임 도중 추가로 잡힌 메모리 (tracemalloc peak) 와 버퍼 재할당 횟수를 출력한다.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PyQt5.QtGui import QImage
+from functions.common.orientation import display_shape
+from functions.common.windowing import build_lut, lut_scratch_dtype, window_plane_into
+from gui.render.frame_buffer import FrameBuffer
+from gui.render.slice_renderer import uint8_to_qimage
+
+
+def legacy_frame(tensor, axis, index):
+    slicing = [slice(None)] * tensor.ndim
+    slicing[axis] = index
+    img = np.rot90(np.flip(tensor[tuple(slicing)], axis=0))
+    norm = (img - img.min()) / (np.ptp(img) + 1e-5) * 255
+    img = norm.astype(np.uint8)
+    h, w = img.shape
+    return QImage(img.tobytes(), w, h, w, QImage.Format_Grayscale8)
+
+
+def buffered_frame(tensor, axis, index, window, lut, buffer):
+    shape = display_shape(tensor.shape, axis)
+    out = buffer.array(np.uint8, shape)
+    scratch = buffer.array(lut_scratch_dtype(lut), shape)
+    return uint8_to_qimage(
+        window_plane_into(tensor, axis, index, out, window, lut=lut, scratch=scratch)
+    )
+
+
+def measure(name, frame, num_frames, num_slices):
+    frame(0)  # warm-up (버퍼 최초 할당)
+    tracemalloc.start()
+    peaks = []
+    start = time.perf_counter()
+    for i in range(num_frames):
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        frame(i % num_slices)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - base)
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    print(
+        f"{name:>10}: {elapsed / num_frames * 1000:7.3f} ms/frame, "
+        f"transient alloc max {max(peaks) / 1024:9.1f} KiB, "
+        f"median {np.median(peaks) / 1024:9.1f} KiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shape", type=int, nargs=3, default=[512, 512, 600])
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    tensor = rng.integers(-1024, 3000, size=args.shape, dtype=np.int16)
+    window = (400.0, 40.0)
+    lut = build_lut(tensor.dtype, *window)
+
+    for axis, view_type in [(2, "axial"), (1, "coronal"), (0, "sagittal")]:
+        print(f"[{view_type}]")
+        num_slices = tensor.shape[axis]
+        measure(
+            "legacy",
+            lambda i: legacy_frame(tensor, axis, i),
+            args.frames,
+            num_slices,
+        )
+        buffer = FrameBuffer()
+        measure(
+            "buffered",
+            lambda i: buffered_frame(tensor, axis, i, window, lut, buffer),
+            args.frames,
+            num_slices,
+        )
+        print(f"{'':>10}  FrameBuffer allocations: {buffer.allocations} (warm-up 포함)")
+
+
+if __name__ == "__main__":
+    main()
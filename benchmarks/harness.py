@@ -0,0 +1,83 @@
+"""latency percentile / peak memory / allocation 측정과 baseline 비교."""
+import gc
+import json
+import time
+import tracemalloc
+import numpy as np
+
+
+def measure(func, repeat=20, warmup=2, setup=None):
+    """func 를 repeat 번 실행해 latency(ms) percentile 과 메모리 지표 반환.
+
+    setup 은 매 실행 전에 호출되며 측정 시간에 포함되지 않는다.
+    peak_kib: 실행 중 추가로 잡힌 최대 메모리, alloc_blocks: 실행 후 남은 블록 수 증가분.
+    """
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        func()
+
+    latencies = []
+    peaks = []
+    blocks = []
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for _ in range(repeat):
+            if setup is not None:
+                setup()
+            before = tracemalloc.take_snapshot()
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            start = time.perf_counter()
+            func()
+            latencies.append((time.perf_counter() - start) * 1000.0)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - base)
+            after = tracemalloc.take_snapshot()
+            blocks.append(
+                sum(
+                    stat.count_diff
+                    for stat in after.compare_to(before, "filename")
+                    if stat.count_diff > 0
+                )
+            )
+    finally:
+        tracemalloc.stop()
+
+    latencies = np.array(latencies)
+    return {
+        "repeat": repeat,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p90_ms": float(np.percentile(latencies, 90)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "mean_ms": float(latencies.mean()),
+        "peak_kib": float(max(peaks) / 1024.0),
+        "alloc_blocks": int(np.median(blocks)),
+    }
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(path, results):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def compare(results, baseline, latency_tolerance=0.25, memory_tolerance=0.25):
+    """baseline 대비 p50 latency / peak memory 가 허용치 이상 늘어난 항목 목록."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric, tolerance in (("p50_ms", latency_tolerance), ("peak_kib", memory_tolerance)):
+            old, new = previous[metric], current[metric]
+            # 아주 작은 값은 측정 잡음이 커서 절대 하한을 둔다
+            floor = 0.5 if metric == "p50_ms" else 64.0
+            if new > max(old * (1.0 + tolerance), old + floor):
+                regressions.append((name, metric, old, new))
+    return regressions
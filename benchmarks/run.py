@@ -0,0 +1,225 @@
+"""로딩 / 렌더링 hot path 의 headless 벤치마크.
+
+    python -m benchmarks.run [--sizes small medium] [--repeat 20]
+                             [--output results.json]
+                             [--save-baseline benchmarks/baseline.json]
+                             [--compare benchmarks/baseline.json]
+
+Qt 는 offscreen 플랫폼으로 실행되고, 입력 데이터 (.nii / .nii.gz / DICOM series) 는
+--data-dir (기본: 임시 폴더) 아래에 직접 생성한다.
+항목별 latency p50/p90/p99, 실행 중 peak memory, 남은 allocation 블록 수를 기록한다.
+--compare 는 baseline 대비 p50 또는 peak memory 가 허용치 이상 늘면 exit code 1.
+baseline 은 같은 머신에서 --save-baseline 으로 만든 것만 의미가 있다.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# 디코딩 경로 자체를 측정하도록 디스크 volume 캐시는 기본으로 끔
+os.environ.setdefault("CARROT_VOLUME_CACHE_MB", "0")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # styles/*.css 는 상대 경로로 읽힌다
+
+from PyQt5.QtCore import QCoreApplication, QEvent
+from PyQt5.QtWidgets import QApplication
+import numpy as np
+from functions.common.normalization import min_max_normalize
+from functions.common.orientation import display_plane, display_shape
+from functions.common.statistics import sampled_percentiles
+from functions.common.windowing import (
+    build_lut,
+    default_window,
+    lut_scratch_dtype,
+    window_plane_into,
+)
+from functions.io.file_loader import load_dicom, load_nifty
+from functions.utils.load_file import load_nifti_array
+from functions.utils.meta_access import type_checking
+from gui.layout.containers import LeftContainer
+from gui.layout.image_panel import SliceViewer
+from gui.render.thumbnail_cache import thumbnail_slice
+from benchmarks import harness
+from benchmarks.synthetic import SIZES, generate
+
+
+def bench_loading(datasets, repeat):
+    results = {}
+    for name, paths in datasets.items():
+        first_dcm = sorted(os.listdir(paths["dicom"]))[0]
+        for label, path in (
+            ("nii", paths["nii"]),
+            ("nii.gz", paths["nii.gz"]),
+            ("dcm", os.path.join(paths["dicom"], first_dcm)),
+        ):
+            results[f"type_checking/{label}/{name}"] = harness.measure(
+                lambda: type_checking(path), repeat
+            )
+        for label in ("nii", "nii.gz"):
+            path = paths[label]
+            # memmap 은 접근 전까지 읽지 않으므로 전체 값을 한 번 훑어서 비교 가능하게 한다
+            results[f"load_nifti_array/{label}/{name}"] = harness.measure(
+                lambda: load_nifti_array(path)[0].max(), max(3, repeat // 4), warmup=1
+            )
+        results[f"load_dicom/{name}"] = harness.measure(
+            lambda: load_dicom(paths["dicom"]), max(3, repeat // 4), warmup=1
+        )
+    return results
+
+
+def bench_kernels(datasets, repeat):
+    """functions/common 의 windowing / 정규화 / percentile 커널 (Qt 없이)."""
+    results = {}
+    for name, paths in datasets.items():
+        image_data = load_nifty(paths["nii"])
+        tensor = np.asarray(image_data["tensor"])  # 디스크 읽기 제외
+        width, level = default_window(image_data["stats"])
+        variants = {
+            "int16-lut": (tensor, build_lut(tensor.dtype, width, level)),
+            "float32": (tensor.astype(np.float32), None),
+        }
+        for label, (volume, lut) in variants.items():
+            for axis, view_type in ((2, "axial"), (0, "sagittal")):
+                shape = display_shape(volume.shape, axis)
+                out = np.empty(shape, dtype=np.uint8)
+                scratch = np.empty(shape, dtype=lut_scratch_dtype(lut))
+                index = volume.shape[axis] // 2
+                results[f"window_plane_into/{label}/{view_type}/{name}"] = harness.measure(
+                    lambda v=volume, a=axis, i=index, o=out, s=scratch, l=lut: window_plane_into(
+                        v, a, i, o, (width, level), lut=l, scratch=s
+                    ),
+                    repeat,
+                )
+            plane = display_plane(volume, 2, volume.shape[2] // 2)
+            out = np.empty(plane.shape, dtype=np.uint8)
+            scratch = np.empty(plane.shape, dtype=np.float32)
+            results[f"min_max_normalize/{label}/{name}"] = harness.measure(
+                lambda p=plane, o=out, s=scratch: min_max_normalize(p, out=o, scratch=s), repeat
+            )
+        results[f"sampled_percentiles/{name}"] = harness.measure(
+            lambda: sampled_percentiles(tensor), repeat
+        )
+    return results
+
+
+def bench_rendering(app, datasets, repeat):
+    results = {}
+    for name, paths in datasets.items():
+        image_data = load_nifty(paths["nii"])
+        tensor, stats = image_data["tensor"], image_data["stats"]
+        slope, inter = image_data["slope"], image_data["inter"]
+        window = default_window(stats)
+
+        for view_type in ("axial", "coronal", "sagittal"):
+            viewer = SliceViewer(tensor, view_type, stats=stats, slope=slope, inter=inter)
+            viewer.prefetcher.depth = 0  # 측정 대상 프레임 외의 백그라운드 렌더 제외
+            viewer.resize(800, 800)
+            viewer.show()
+            app.processEvents()
+            viewer._update_slice()  # coronal / sagittal 은 display proxy 생성 시작
+            if viewer.proxy is not None:
+                viewer.proxy.wait()  # 측정은 proxy 가 준비된 상태 기준
+            step = [0]
+
+            def next_slice(viewer=viewer):
+                viewer.cache.clear()  # 매번 실제로 렌더링하도록
+                step[0] = (step[0] + 7) % viewer.num_slices
+
+            results[f"_update_slice/{view_type}/{name}"] = harness.measure(
+                lambda viewer=viewer: viewer._update_slice(step[0]),
+                repeat,
+                setup=next_slice,
+            )
+            arr = display_plane(tensor, viewer.axis, viewer.num_slices // 2)
+            results[f"_numpy_to_pixmap/{view_type}/{name}"] = harness.measure(
+                lambda viewer=viewer, arr=arr: viewer._numpy_to_pixmap(arr), repeat
+            )
+            viewer.scheduler.discard(viewer)
+            viewer.close()
+            viewer.deleteLater()
+
+        container = LeftContainer()
+        img_array = thumbnail_slice(tensor)
+
+        def clear_container():
+            container.clear()
+            QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+        results[f"_add_thumbnail/{name}"] = harness.measure(
+            lambda: container._add_thumbnail(
+                img_array, paths["nii"], lambda *_: None, window, slope, inter
+            ),
+            repeat,
+            setup=clear_container,
+        )
+        container.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    return results
+
+
+def print_results(results):
+    print(
+        f"{'benchmark':<40} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} "
+        f"{'peak KiB':>11} {'blocks':>8}"
+    )
+    for name in sorted(results):
+        r = results[name]
+        print(
+            f"{name:<40} {r['p50_ms']:9.3f} {r['p90_ms']:9.3f} {r['p99_ms']:9.3f} "
+            f"{r['peak_kib']:11.1f} {r['alloc_blocks']:8d}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", choices=sorted(SIZES), default=["small", "medium"])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--data-dir", default=None, help="synthetic 데이터 위치 (재사용 가능)")
+    parser.add_argument("--only", choices=["loading", "kernels", "rendering"], default=None)
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--save-baseline", default=None, help="결과를 baseline 으로 저장")
+    parser.add_argument("--compare", default=None, help="비교할 baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 증가율 (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    with tempfile.TemporaryDirectory(prefix="carrot-bench-") as tmp:
+        data_dir = args.data_dir or tmp
+        print(f"[Info] Generating synthetic data in {data_dir}")
+        datasets = generate(data_dir, args.sizes)
+
+        results = {}
+        if args.only in (None, "loading"):
+            results.update(bench_loading(datasets, args.repeat))
+        if args.only in (None, "kernels"):
+            results.update(bench_kernels(datasets, args.repeat))
+        if args.only in (None, "rendering"):
+            results.update(bench_rendering(app, datasets, args.repeat))
+
+    print_results(results)
+    if args.output:
+        harness.save_results(args.output, results)
+    if args.save_baseline:
+        harness.save_results(args.save_baseline, results)
+        print(f"[Info] Baseline saved to {args.save_baseline}")
+
+    if args.compare:
+        if not os.path.isfile(args.compare):
+            print(f"[Error] Baseline not found: {args.compare}")
+            return 2
+        regressions = harness.compare(
+            results, harness.load_results(args.compare), args.tolerance, args.tolerance
+        )
+        for name, metric, old, new in regressions:
+            print(f"[Warning] Regression {name} {metric}: {old:.3f} → {new:.3f}")
+        if regressions:
+            return 1
+        print("[Info] No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""벤치마크용 synthetic NIfTI (.nii / .nii.gz) 와 DICOM series 생성."""
+import os
+import numpy as np
+import nibabel as nib
+from pydicom.dataset import FileDataset, FileMetaDataset
+from pydicom.uid import ExplicitVRLittleEndian, generate_uid
+
+# name → (x, y, z)
+SIZES = {
+    "small": (128, 128, 64),
+    "medium": (256, 256, 160),
+    "large": (512, 512, 300),
+}
+
+
+def phantom(shape, dtype=np.int16, seed=0):
+    """CT 비슷한 값 분포 (공기 -1000, 연조직 ~40, 뼈 ~1000) 의 타원체 phantom."""
+    rng = np.random.default_rng(seed)
+    grids = np.ogrid[tuple(slice(0, n) for n in shape)]
+    radius = sum(((g - n / 2) / (n / 2.2)) ** 2 for g, n in zip(grids, shape))
+    volume = np.where(radius < 1.0, 40, -1000).astype(np.float32)
+    volume[radius < 0.3] = 1000
+    volume += rng.normal(0, 20, size=shape).astype(np.float32)
+    return volume.astype(dtype)
+
+
+def write_nifti(path, shape, dtype=np.int16):
+    affine = np.diag([-0.8, 0.8, 1.5, 1.0])  # LAS → 로딩 시 재정렬 경로도 측정
+    nib.save(nib.Nifti1Image(phantom(shape, dtype), affine), path)
+    return path
+
+
+def write_dicom_series(folder, shape):
+    os.makedirs(folder, exist_ok=True)
+    rows, cols, num_slices = shape[1], shape[0], shape[2]
+    volume = phantom((num_slices, rows, cols))
+    series_uid = generate_uid()
+    for i in range(num_slices):
+        meta = FileMetaDataset()
+        meta.MediaStorageSOPClassUID = "1.2.840.10008.5.1.4.1.1.2"  # CT Image Storage
+        meta.MediaStorageSOPInstanceUID = generate_uid()
+        meta.TransferSyntaxUID = ExplicitVRLittleEndian
+        path = os.path.join(folder, f"slice_{i:04d}.dcm")
+        ds = FileDataset(path, {}, file_meta=meta, preamble=b"\0" * 128)
+        ds.SOPClassUID = meta.MediaStorageSOPClassUID
+        ds.SOPInstanceUID = meta.MediaStorageSOPInstanceUID
+        ds.StudyInstanceUID = "1.2.3.4"
+        ds.SeriesInstanceUID = series_uid
+        ds.Modality = "CT"
+        ds.InstanceNumber = i + 1
+        ds.Rows, ds.Columns = rows, cols
+        ds.SamplesPerPixel = 1
+        ds.PhotometricInterpretation = "MONOCHROME2"
+        ds.BitsAllocated, ds.BitsStored, ds.HighBit = 16, 16, 15
+        ds.PixelRepresentation = 1
+        ds.PixelSpacing = [0.7, 0.7]
+        ds.SliceThickness = 1.5
+        ds.ImageOrientationPatient = [1, 0, 0, 0, 1, 0]
+        ds.ImagePositionPatient = [0.0, 0.0, i * 1.5]
+        ds.RescaleSlope, ds.RescaleIntercept = 1, 0
+        ds.PixelData = volume[i].tobytes()
+        try:
+            ds.save_as(path, enforce_file_format=True)
+        except TypeError:  # pydicom 2.x
+            ds.is_little_endian, ds.is_implicit_VR = True, False
+            ds.save_as(path, write_like_original=False)
+    return folder
+
+
+def generate(root, sizes=("small", "medium")):
+    """root 아래 크기별 데이터 생성 (이미 있으면 재사용). {name: {kind: path}} 반환."""
+    datasets = {}
+    for name in sizes:
+        shape = SIZES[name]
+        folder = os.path.join(root, name)
+        os.makedirs(folder, exist_ok=True)
+        nii = os.path.join(folder, "volume.nii")
+        gz = os.path.join(folder, "volume.nii.gz")
+        dcm = os.path.join(folder, "dicom")
+        if not os.path.isfile(nii):
+            write_nifti(nii, shape)
+        if not os.path.isfile(gz):
+            write_nifti(gz, shape)
+        if not os.path.isdir(dcm):
+            write_dicom_series(dcm, shape)
+        datasets[name] = {"nii": nii, "nii.gz": gz, "dicom": dcm}
+    return datasets
@@ -1,12 +1,27 @@
 import numpy as np
 
 
-def min_max_normalize(array: np.ndarray, out_range=(0, 255)) -> np.ndarray:
-    min_val = array.min()
-    max_val = array.max()
-    scale = out_range[1] - out_range[0]
-
-    # ptp = peak-to-peak = max - min, but 명시적으로 작성
-    norm = (array - min_val) / (max_val - min_val + 1e-5)  # 0~1
-    scaled = norm * scale + out_range[0]  # 범위 변환
-    return scaled.astype(np.uint8)
+def min_max_normalize(
+    array: np.ndarray, out_range=(0, 255), out=None, scratch=None, slope=1.0, inter=0.0
+) -> np.ndarray:
+    """배열 자체 min-max 범위를 out_range 로 선형 변환한 uint8 배열.
+
+    out (uint8) / scratch (float32) 를 넘기면 그 버퍼에 바로 기록해 추가 할당이 없다.
+    min/max 는 원본 dtype 그대로 구하며, slope 가 음수면 실제 값 기준으로 뒤집힌다.
+    """
+    if out is None:
+        out = np.empty(array.shape, dtype=np.uint8)
+    if scratch is None:
+        scratch = np.empty(array.shape, dtype=np.float32)
+    min_val, max_val = float(array.min()), float(array.max())
+    if slope < 0:
+        min_val, max_val = max_val, min_val
+    scale = (out_range[1] - out_range[0]) / (max_val - min_val + np.copysign(1e-5, slope))
+
+    np.copyto(scratch, array, casting="unsafe")
+    # (array - min) * scale + out_min 을 곱셈/덧셈 한 번씩으로
+    scratch *= scale
+    scratch += out_range[0] - min_val * scale
+    np.clip(scratch, out_range[0], out_range[1], out=scratch)
+    np.copyto(out, scratch, casting="unsafe")
+    return out
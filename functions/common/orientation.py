@@ -0,0 +1,29 @@
+def to_display(plane):
+    """RAS 평면 (첫 축 → 가로, 둘째 축 → 세로) 을 화면 방향 2D view 로 (복사 없음).
+
+    np.rot90(np.flip(plane, axis=0)) 와 같은 결과를 stride 만으로 표현한다.
+    """
+    return plane[::-1, ::-1].T
+
+
+def display_plane(tensor, axis: int, index: int):
+    """RAS 텐서에서 axis 방향 index 번째 한 장을 화면 방향 view 로 꺼냄 (복사 없음)."""
+    slicing = [slice(None)] * tensor.ndim
+    slicing[axis] = index
+    return to_display(tensor[tuple(slicing)])
+
+
+def display_shape(shape, axis: int, crop=None):
+    """display_plane 결과의 (rows, cols). crop (x0, y0, x1, y1) 이 있으면 잘라낸 크기."""
+    if crop is not None:
+        x0, y0, x1, y1 = crop
+        return y1 - y0, x1 - x0
+    a_axis, b_axis = [ax for ax in range(3) if ax != axis]
+    return shape[b_axis], shape[a_axis]
+
+
+def crop_view(view, crop=None):
+    if crop is None:
+        return view
+    x0, y0, x1, y1 = crop
+    return view[y0:y1, x0:x1]
@@ -0,0 +1,22 @@
+import numpy as np
+
+
+def downsample_2x(volume, axis=2, chunk_slices=32):
+    """3D 볼륨을 axis 에 수직인 평면 안에서만 2x2 block 평균으로 축소 (원본 dtype 유지).
+
+    axis 방향 (슬라이스) 으로는 섞지 않으므로 결과의 슬라이스 index 는 원본과 같다.
+    홀수 길이의 마지막 한 줄은 버린다. 결과는 axis 가 가장 바깥 (슬라이스 한 장이 연속
+    메모리) 인 배열의 view 이며, axis 방향으로 chunk_slices 장씩 처리하므로 memmap
+    원본이어도 한 번에 읽는 양은 chunk 하나 분량이다.
+    """
+    source = np.moveaxis(volume, axis, 0)  # (slices, a, b) view
+    count = source.shape[0]
+    na, nb = source.shape[1] // 2 * 2, source.shape[2] // 2 * 2
+    out = np.empty((count, na // 2, nb // 2), dtype=volume.dtype)
+    for start in range(0, count, chunk_slices):
+        chunk = np.asarray(source[start : start + chunk_slices, :na, :nb], dtype=np.float32)
+        mean = chunk.reshape(chunk.shape[0], na // 2, 2, nb // 2, 2).mean(axis=(2, 4))
+        if out.dtype.kind in "iu":
+            np.rint(mean, out=mean)
+        out[start : start + chunk.shape[0]] = mean
+    return np.moveaxis(out, 0, axis)
@@ -0,0 +1,256 @@
+"""voxel spacing 을 반영한 평면 reslicing (axis 정렬 / oblique) 과 보간.
+
+평면 위 출력 픽셀마다 voxel 좌표를 계산해 nearest / linear / cubic 으로 샘플링한다.
+좌표 grid 와 스크롤과 무관한 축의 보간 tap (index, weight) 은 평면 geometry 별로
+캐시하므로, 같은 평면을 스크롤할 때는 법선 방향 좌표와 intensity 만 다시 계산한다.
+"""
+from collections import OrderedDict
+from itertools import product
+import threading
+import numpy as np
+
+INTERPOLATION_ORDERS = {"nearest": 0, "linear": 1, "cubic": 3}
+_EPS = 1e-6
+
+
+def rotation_matrix(yaw=0.0, pitch=0.0):
+    """화면 세로축 기준 yaw, 가로축 기준 pitch (도) 회전. 평면 basis (u, v, n) 좌표계 기준."""
+    yaw, pitch = np.radians(yaw), np.radians(pitch)
+    cy, sy = np.cos(yaw), np.sin(yaw)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    # basis 좌표 (u, v, n): yaw 는 u-n 평면, pitch 는 v-n 평면 회전
+    r_yaw = np.array([[cy, 0.0, -sy], [0.0, 1.0, 0.0], [sy, 0.0, cy]])
+    r_pitch = np.array([[1.0, 0.0, 0.0], [0.0, cp, -sp], [0.0, sp, cp]])
+    return r_yaw @ r_pitch
+
+
+def plane_basis(axis, rotation=None):
+    """axis 방향 화면 평면의 (u: 화면 오른쪽, v: 화면 아래, n: index 증가 방향) 단위 벡터.
+
+    display_plane 과 같은 방향 (오른쪽 = 첫 남은 축 감소, 아래 = 둘째 남은 축 감소).
+    rotation 은 basis 좌표계에서의 회전 (rotation_matrix).
+    """
+    a_axis, b_axis = [ax for ax in range(3) if ax != axis]
+    basis = np.zeros((3, 3))
+    basis[0, a_axis] = -1.0
+    basis[1, b_axis] = -1.0
+    basis[2, axis] = 1.0
+    if rotation is not None:
+        basis = np.asarray(rotation) @ basis
+    return basis
+
+
+def cubic_weights(frac):
+    """cubic convolution (Keys, a = -0.5) 의 4 tap weight (floor-1 .. floor+2)."""
+    a = -0.5
+    t = frac
+    w0 = a * (t**3 - 2 * t**2 + t)
+    w1 = (a + 2) * t**3 - (a + 3) * t**2 + 1
+    w2 = -(a + 2) * t**3 + (2 * a + 3) * t**2 - a * t
+    w3 = -a * (t**3 - t**2)
+    return w0, w1, w2, w3
+
+
+def axis_taps(coord, length, order):
+    """한 축 좌표 → [(index, weight)] (weight None = 1). index 는 가장자리로 clip."""
+    coord = np.asarray(coord, dtype=np.float32)
+    if order == 0 or (coord.ndim == 0 and abs(coord - np.rint(coord)) < 1e-3):
+        return [(np.clip(np.rint(coord), 0, length - 1).astype(np.intp), None)]
+    base = np.floor(coord)
+    frac = coord - base
+    base = base.astype(np.intp)
+    if order == 1:
+        offsets, weights = (0, 1), (1.0 - frac, frac)
+    elif order == 3:
+        offsets, weights = (-1, 0, 1, 2), cubic_weights(frac)
+    else:
+        raise ValueError(f"Unsupported interpolation order: {order}")
+    return [(np.clip(base + o, 0, length - 1), w) for o, w in zip(offsets, weights)]
+
+
+class PlaneSampler:
+    """한 평면 geometry (볼륨 shape / spacing / basis / 출력 크기 / crop) 의 샘플링 grid.
+
+    출력 (r, c) 의 d 축 voxel 좌표 = base[d][r, c] + offset * normal[d]. offset 은 볼륨
+    중심에서 n 방향 거리 (mm) 이다.
+    """
+
+    def __init__(self, shape, spacing, axis, rotation, out_shape, crop=None):
+        self.shape = tuple(int(n) for n in shape[:3])
+        self.spacing = np.asarray(spacing, dtype=np.float64)
+        self.axis = axis
+        self.out_shape = tuple(out_shape)
+        a_axis, b_axis = [ax for ax in range(3) if ax != axis]
+        rows, cols = self.shape[b_axis], self.shape[a_axis]
+        x0, y0, x1, y1 = crop if crop is not None else (0, 0, cols, rows)
+        height, width = self.out_shape
+
+        u, v, n = plane_basis(axis, rotation)
+        # 출력 픽셀 중심 → 화면 (원본 해상도) 좌표 → 중심 기준 mm
+        xs = x0 + (np.arange(width) + 0.5) * (x1 - x0) / width - 0.5
+        ys = y0 + (np.arange(height) + 0.5) * (y1 - y0) / height - 0.5
+        dx = (xs - (cols - 1) / 2.0) * self.spacing[a_axis]
+        dy = (ys - (rows - 1) / 2.0) * self.spacing[b_axis]
+        center = (np.array(self.shape) - 1) / 2.0 * self.spacing
+        # 좌표는 mm → voxel index (spacing 으로 나눔)
+        u_vox, v_vox = u / self.spacing, v / self.spacing
+        self.center = center / self.spacing
+        self.normal = n / self.spacing
+        # 축별 좌표. 평면 위에서 변하지 않는 축은 scalar, 한 방향으로만 변하면 (1, w) / (h, 1)
+        self.base = [None] * 3
+        for d in range(3):
+            value = np.float32(self.center[d])
+            if abs(u_vox[d]) >= _EPS:
+                value = value + (dx * u_vox[d])[None, :]
+            if abs(v_vox[d]) >= _EPS:
+                value = value + (dy * v_vox[d])[:, None]
+            self.base[d] = np.asarray(value, dtype=np.float32)
+        # 축 정렬 평면은 가로 (a) / 세로 (b) 방향 보간을 나눠서 계산할 수 있음
+        self.separable = rotation is None
+        self._plane_axes = (a_axis, b_axis)
+        self._taps = {}  # (축, order) → 스크롤과 무관한 축의 tap (캐시)
+        self._inside = {}  # 축 → 스크롤과 무관한 축의 볼륨 안쪽 mask (캐시)
+        self._lock = threading.Lock()
+
+    def offset_of(self, index):
+        """axis 방향 slice index → 평면 offset (mm). 회전이 없으면 정확히 그 슬라이스."""
+        count = self.shape[self.axis]
+        return (index - (count - 1) / 2.0) * self.spacing[self.axis]
+
+    def coords(self, d, offset):
+        if abs(self.normal[d]) < _EPS:
+            return self.base[d]
+        return self.base[d] + np.float32(offset * self.normal[d])
+
+    def _axis_taps(self, d, offset, order):
+        if abs(self.normal[d]) >= _EPS:
+            return axis_taps(self.coords(d, offset), self.shape[d], order)
+        with self._lock:
+            taps = self._taps.get((d, order))
+        if taps is None:
+            taps = axis_taps(self.base[d], self.shape[d], order)
+            with self._lock:
+                self._taps[(d, order)] = taps
+        return taps
+
+    def _axis_inside(self, d, offset):
+        if abs(self.normal[d]) >= _EPS:
+            c = self.coords(d, offset)
+            return (c > -0.5) & (c < self.shape[d] - 0.5)
+        with self._lock:
+            inside = self._inside.get(d)
+        if inside is None:
+            c = self.base[d]
+            inside = (c > -0.5) & (c < self.shape[d] - 0.5)
+            with self._lock:
+                self._inside[d] = inside
+        return inside
+
+    def sample(self, volume, offset, order=1, fill=0):
+        """평면 하나를 샘플링한 (rows, cols) 배열. nearest 는 원본 dtype, 그 외 float32.
+
+        볼륨 밖 (oblique 평면의 가장자리) 은 fill.
+        """
+        taps = [self._axis_taps(d, offset, order) for d in range(3)]
+        if order == 0:
+            gathered = volume[taps[0][0][0], taps[1][0][0], taps[2][0][0]]
+            out = np.array(np.broadcast_to(gathered, self.out_shape), dtype=volume.dtype)
+        elif self.separable:
+            out = self._sample_separable(volume, taps)
+        else:
+            out = np.zeros(self.out_shape, dtype=np.float32)
+            for combo in product(*taps):
+                gathered = volume[combo[0][0], combo[1][0], combo[2][0]]
+                weight = self._weight(combo)
+                out += gathered if weight is None else gathered * weight
+        outside = self.outside(offset)
+        if outside is not None:
+            out[outside] = fill
+        return out
+
+    def _sample_separable(self, volume, taps):
+        """축 정렬 평면: 법선 방향 → 가로 → 세로 순서로 1D 보간 (cubic 64 tap 대신 4 + 4 + 4)."""
+        a_axis, b_axis = self._plane_axes
+        # 법선 방향 tap 은 scalar index: 원본 2D 슬라이스의 가중합 (정수 위치면 한 장)
+        plane = None
+        for index, weight in taps[self.axis]:
+            slicing = [slice(None)] * 3
+            slicing[self.axis] = int(index)
+            part = volume[tuple(slicing)]  # view (복사 없음)
+            part = part if weight is None else part * np.float32(weight)
+            plane = part if plane is None else plane + part
+        if a_axis > b_axis:
+            plane = plane.T
+        plane = np.asarray(plane, dtype=np.float32)  # (a, b) 순서
+        # 가로: 출력 열마다 a 축 tap → (width, b)
+        cols = None
+        for index, weight in taps[a_axis]:
+            part = plane[np.ravel(index)]
+            if weight is not None:
+                part = part * np.ravel(weight)[:, None]
+            cols = part if cols is None else cols + part
+        # 세로: 출력 행마다 b 축 tap → (height, width)
+        out = None
+        for index, weight in taps[b_axis]:
+            part = cols[:, np.ravel(index)].T
+            if weight is not None:
+                part = part * np.ravel(weight)[:, None]
+            out = part if out is None else out + part
+        return np.array(np.broadcast_to(out, self.out_shape), dtype=np.float32)
+
+    @staticmethod
+    def _weight(combo):
+        weight = None
+        for _, w in combo:
+            if w is not None:
+                weight = w if weight is None else weight * w
+        return weight
+
+    def outside(self, offset):
+        """볼륨 밖에 놓인 출력 픽셀 mask. 모두 안쪽이면 None."""
+        inside = True
+        for d in range(3):
+            inside = inside & self._axis_inside(d, offset)
+        if np.all(inside):
+            return None
+        return ~np.broadcast_to(inside, self.out_shape)
+
+    def voxel_at(self, row, col, offset):
+        """출력 픽셀 (row, col) 의 가장 가까운 voxel (x, y, z). 볼륨 밖이면 None."""
+        voxel = []
+        for d in range(3):
+            c = self.coords(d, offset)
+            value = float(np.broadcast_to(c, self.out_shape)[row, col])
+            index = int(np.rint(value))
+            if not 0 <= index < self.shape[d]:
+                return None
+            voxel.append(index)
+        return voxel
+
+
+_samplers = OrderedDict()
+_samplers_lock = threading.Lock()
+
+
+def plane_sampler(shape, spacing, axis, rotation, out_shape, crop=None, capacity=8):
+    """geometry 별 PlaneSampler (최근 capacity 개 캐시). 여러 스레드에서 호출 가능."""
+    rotation_key = None if rotation is None else tuple(np.round(rotation, 6).ravel())
+    key = (
+        tuple(shape[:3]),
+        tuple(float(s) for s in spacing),
+        axis,
+        rotation_key,
+        tuple(out_shape),
+        crop,
+    )
+    with _samplers_lock:
+        sampler = _samplers.get(key)
+        if sampler is not None:
+            _samplers.move_to_end(key)
+            return sampler
+    sampler = PlaneSampler(shape, spacing, axis, rotation, out_shape, crop)
+    with _samplers_lock:
+        _samplers[key] = sampler
+        while len(_samplers) > capacity:
+            _samplers.popitem(last=False)
+    return sampler
@@ -0,0 +1,89 @@
+import numpy as np
+
+
+def compute_volume_stats(
+    tensor, slope=1.0, inter=0.0, bins=1024, chunk_slices=16, max_voxels=32 * 1024**2
+):
+    """볼륨 전체 통계를 청크 단위로 한 번만 계산 (값은 slope/inter 적용 후 단위).
+
+    min/max, 0.5~99.5 percentile, histogram 을 반환한다.
+    max_voxels 보다 큰 볼륨은 마지막 축을 일정 간격으로 샘플링한다.
+    4D 는 전체를 읽지 않도록 처음/가운데/마지막 frame 만 사용한다.
+    """
+    if tensor.ndim == 4 and tensor.shape[3] > 3:
+        frames = sorted({0, tensor.shape[3] // 2, tensor.shape[3] - 1})
+        tensor = tensor[..., frames]
+    if tensor.ndim < 3:
+        chunks_of = lambda: [tensor]
+    else:
+        n = tensor.shape[2]
+        stride = max(1, int(np.ceil(tensor.size / max_voxels)))
+        indices = np.arange(0, n, stride)
+
+        def chunks_of():
+            for start in range(0, len(indices), chunk_slices):
+                yield tensor[:, :, indices[start : start + chunk_slices]]
+
+    # 1차: min / max
+    lo, hi = np.inf, -np.inf
+    for chunk in chunks_of():
+        if chunk.size == 0:
+            continue
+        lo = min(lo, float(np.nanmin(chunk)))
+        hi = max(hi, float(np.nanmax(chunk)))
+    if not np.isfinite(lo) or not np.isfinite(hi):
+        lo, hi = 0.0, 0.0
+    if hi <= lo:
+        hi = lo + 1.0
+
+    # 2차: histogram (원본 값 기준) → percentile
+    histogram = np.zeros(bins, dtype=np.int64)
+    for chunk in chunks_of():
+        counts, _ = np.histogram(chunk, bins=bins, range=(lo, hi))
+        histogram += counts
+    edges = np.linspace(lo, hi, bins + 1)
+    p_low, p_high = percentiles_from_histogram(histogram, edges, (0.5, 99.5))
+
+    # 실제 값 단위로 변환 (slope 가 음수면 순서가 뒤집힘)
+    real = sorted([lo * slope + inter, hi * slope + inter])
+    p_real = sorted([p_low * slope + inter, p_high * slope + inter])
+    return {
+        "min": real[0],
+        "max": real[1],
+        "p_low": p_real[0],
+        "p_high": p_real[1],
+        "histogram": histogram,
+        "bin_edges": edges * slope + inter,
+    }
+
+
+def percentiles_from_histogram(histogram, edges, percents):
+    cumulative = np.cumsum(histogram)
+    total = cumulative[-1] if len(cumulative) else 0
+    if total == 0:
+        return [float(edges[0]) for _ in percents]
+    result = []
+    for p in percents:
+        idx = int(np.searchsorted(cumulative, total * p / 100.0))
+        idx = min(idx, len(histogram) - 1)
+        result.append(float(edges[idx + 1] if p > 50 else edges[idx]))
+    return result
+
+
+def sampled_percentiles(array, percents=(0.5, 99.5), bins=1024, max_samples=256 * 1024):
+    """일정 간격으로 뽑은 표본의 histogram 으로 percentile 추정 (값은 원본 단위).
+
+    각 축을 같은 간격으로 건너뛰어 max_samples 개 안팎만 읽으므로 memmap 볼륨에서도
+    전체를 읽지 않는다. 정확도는 bin 폭 (범위 / bins) 수준이다.
+    """
+    step = max(1, int(np.ceil((array.size / max_samples) ** (1.0 / max(array.ndim, 1)))))
+    sample = np.asarray(array[(slice(None, None, step),) * array.ndim])
+    if sample.size == 0:
+        return [0.0 for _ in percents]
+    lo, hi = float(np.nanmin(sample)), float(np.nanmax(sample))
+    if not np.isfinite(lo) or not np.isfinite(hi):
+        return [0.0 for _ in percents]
+    if hi <= lo:
+        return [lo for _ in percents]
+    histogram, edges = np.histogram(sample, bins=bins, range=(lo, hi))
+    return percentiles_from_histogram(histogram, edges, percents)
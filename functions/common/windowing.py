@@ -0,0 +1,88 @@
+import numpy as np
+from functions.common.normalization import min_max_normalize
+from functions.common.orientation import crop_view, display_plane
+
+# CT window presets: name → (width, level) [HU]
+WINDOW_PRESETS = {
+    "brain": (80.0, 40.0),
+    "subdural": (250.0, 75.0),
+    "lung": (1500.0, -600.0),
+    "mediastinum": (350.0, 50.0),
+    "abdomen": (400.0, 40.0),
+    "bone": (1800.0, 400.0),
+}
+
+
+def default_window(stats):
+    """robust percentile (0.5~99.5) 기반 기본 window (width, level)."""
+    width = max(stats["p_high"] - stats["p_low"], 1e-3)
+    level = (stats["p_high"] + stats["p_low"]) / 2.0
+    return width, level
+
+
+def build_lut(dtype, width, level, slope=1.0, inter=0.0):
+    """원본 정수 값 → uint8 lookup table (int8 / uint8 / int16 / uint16). 그 외에는 None.
+
+    LUT 인덱스는 원본의 bit pattern (unsigned view) 이므로 부호/엔디안 변환이 필요 없다.
+    float32 / 32-bit 정수는 값 범위가 너무 넓어 테이블 대신 window_into 의 float32 경로를 쓴다.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind not in "iu" or dtype.itemsize not in (1, 2):
+        return None
+    index_type = np.uint8 if dtype.itemsize == 1 else np.uint16
+    raw = np.arange(np.iinfo(index_type).max + 1, dtype=index_type).view(dtype)
+    real = raw.astype(np.float32) * slope + inter
+    return window_to_uint8(real, width, level)
+
+
+def window_to_uint8(values, width, level):
+    low = level - width / 2.0
+    scaled = (values - low) * (255.0 / max(width, 1e-6))
+    np.clip(scaled, 0, 255, out=scaled)
+    return scaled.astype(np.uint8)
+
+
+def window_into(view, out, width, level, slope=1.0, inter=0.0, lut=None, scratch=None):
+    """(strided) 2D view → 미리 할당된 uint8 out 에 바로 기록.
+
+    scratch 는 view 와 같은 shape 의 작업 버퍼 (LUT 경로: intp, 그 외: float32).
+    scratch/out 을 재사용하면 프레임당 추가 메모리 할당이 없다.
+    """
+    if lut is not None:
+        if scratch is None:
+            scratch = np.empty(view.shape, dtype=np.intp)
+        index_type = np.uint8 if view.dtype.itemsize == 1 else np.uint16
+        # 방향 전환된 view 를 연속 index 버퍼로 한 번에 gather
+        np.copyto(scratch, view.view(index_type), casting="unsafe")
+        np.take(lut, scratch, out=out, mode="clip")
+        return out
+
+    if scratch is None:
+        scratch = np.empty(view.shape, dtype=np.float32)
+    np.copyto(scratch, view, casting="unsafe")
+    # (raw * slope + inter - low) * 255 / width 를 곱셈/덧셈 한 번씩으로
+    gain = 255.0 / max(width, 1e-6)
+    scratch *= slope * gain
+    scratch += (inter - (level - width / 2.0)) * gain
+    np.clip(scratch, 0, 255, out=scratch)
+    np.copyto(out, scratch, casting="unsafe")
+    return out
+
+
+def lut_scratch_dtype(lut):
+    """window_into 에 넘길 scratch 버퍼 dtype."""
+    return np.intp if lut is not None else np.float32
+
+
+def window_plane_into(
+    tensor, axis, index, out, window=None, slope=1.0, inter=0.0, lut=None, scratch=None, crop=None
+):
+    """방향 전환 + (crop) + windowing 을 한 번에: 볼륨의 한 장 → 호출자의 uint8 out.
+
+    out / scratch 의 shape 는 orientation.display_shape(tensor.shape, axis, crop) 와 같아야 한다.
+    window 가 None 이면 그 슬라이스 자체 min-max 범위를 쓴다 (scratch 는 float32).
+    """
+    view = crop_view(display_plane(tensor, axis, index), crop)
+    if window is None:
+        return min_max_normalize(view, out=out, scratch=scratch, slope=slope, inter=inter)
+    return window_into(view, out, window[0], window[1], slope, inter, lut, scratch)
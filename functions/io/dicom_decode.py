@@ -0,0 +1,250 @@
+"""압축 transfer syntax DICOM 의 process pool 디코딩과 enhanced multi-frame 객체의 frame 분해.
+
+JPEG 2000 / JPEG-LS / JPEG / RLE 압축 해제는 pydicom (과 plugin) 안에서 GIL 을 잡고 돌기
+때문에 스레드를 늘려도 한 코어만 쓴다. 압축된 시리즈는 볼륨을 공유 메모리
+(multiprocessing.shared_memory) 에 할당하고, 워커 프로세스는 (파일 경로, frame, 슬라이스
+index) 만 받아 디코딩 결과를 그 볼륨에 바로 기록한다. 픽셀은 pickle 로 오가지 않는다.
+
+이 모듈은 워커 프로세스에서도 import 되므로 numpy / pydicom 외의 무거운 의존성을 두지 않는다.
+(CARROT_DECODE_PROCESSES 로 워커 수 조절, 0 이면 스레드 디코딩만 사용)
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+import numpy as np
+import pydicom
+
+try:
+    from pydicom.pixels import pixel_array  # pydicom 3: frame 하나만 읽어서 디코딩
+except ImportError:  # pydicom 2.x
+    pixel_array = None
+
+
+def decode_processes(default=None):
+    default = (os.cpu_count() or 1) if default is None else default
+    try:
+        return max(0, int(os.environ.get("CARROT_DECODE_PROCESSES", default)))
+    except ValueError:
+        return default
+
+
+def is_compressed(dcm):
+    """file meta 의 TransferSyntaxUID 가 압축 (encapsulated) 인지. 없으면 비압축으로 본다."""
+    file_meta = getattr(dcm, "file_meta", None)  # FrameHeader 는 원본 dataset 의 것
+    syntax = file_meta.get("TransferSyntaxUID") if file_meta is not None else None
+    return syntax is not None and syntax.is_compressed
+
+
+def read_pixels(path, frame=None):
+    """파일 하나 (frame 이 주어지면 multi-frame 의 그 frame 만) 의 raw 픽셀 배열."""
+    if frame is None:
+        return pydicom.dcmread(path, force=True).pixel_array
+    if pixel_array is None:
+        # pydicom 2.x 는 frame 단위 디코딩이 없어 전체를 디코딩한 뒤 한 장만 사용
+        return pydicom.dcmread(path, force=True).pixel_array[frame]
+    # 나머지 frame 은 읽지도 디코딩하지도 않음 (encapsulated 는 offset table 로 찾아감)
+    return pixel_array(path, index=frame)
+
+
+def store_slice(volume, index, pixels, rescale=None):
+    if rescale is None:
+        volume[index] = pixels
+    else:
+        # 슬라이스별 rescale 은 한 장 단위로만 변환 (볼륨 전체 float 배열을 만들지 않음)
+        slope, inter = rescale
+        real = pixels * slope + inter
+        if volume.dtype.kind in "iu":
+            np.rint(real, out=real)
+        volume[index] = real
+
+
+# --- enhanced multi-frame ---
+
+# functional group sequence → 단일 frame 헤더의 keyword
+_FUNCTIONAL_GROUPS = {
+    "PlanePositionSequence": ("ImagePositionPatient",),
+    "PlaneOrientationSequence": ("ImageOrientationPatient",),
+    "PixelMeasuresSequence": ("PixelSpacing", "SliceThickness", "SpacingBetweenSlices"),
+    "PixelValueTransformationSequence": ("RescaleSlope", "RescaleIntercept"),
+    "FrameContentSequence": ("InStackPositionNumber",),
+}
+
+
+def _group_values(group, values):
+    for sequence, keywords in _FUNCTIONAL_GROUPS.items():
+        items = group.get(sequence)
+        if not items:
+            continue
+        for keyword in keywords:
+            value = items[0].get(keyword)
+            if value is not None:
+                values[keyword] = value
+
+
+class FrameHeader:
+    """enhanced multi-frame 객체의 frame 하나를 단일 frame 헤더처럼 보이게 하는 proxy.
+
+    위치 / 방향 / 간격 / rescale 은 functional group (per-frame 이 shared 보다 우선) 에서,
+    나머지는 원본 dataset 에서 읽는다.
+    """
+
+    def __init__(self, dataset, frame, values):
+        self.dataset = dataset
+        self.frame = frame
+        self._values = values
+
+    def get(self, keyword, default=None):
+        if keyword in self._values:
+            return self._values[keyword]
+        return self.dataset.get(keyword, default)
+
+    def __contains__(self, keyword):
+        return keyword in self._values or keyword in self.dataset
+
+    def __getattr__(self, name):
+        values = self.__dict__.get("_values", {})
+        if name in values:
+            return values[name]
+        return getattr(self.__dict__["dataset"], name)
+
+
+def split_frames(dcm):
+    """헤더 → [(헤더, frame)]. 프레임별 위치가 있는 enhanced multi-frame 만 frame 단위로 나눈다.
+
+    단일 frame 이나 위치 정보가 없는 multi-frame (cine 등) 은 [(dcm, None)] 그대로.
+    """
+    frames = int(dcm.get("NumberOfFrames", 1) or 1)
+    per_frame = dcm.get("PerFrameFunctionalGroupsSequence")
+    if frames < 2 or not per_frame or len(per_frame) != frames:
+        return [(dcm, None)]
+    shared = {}
+    for group in dcm.get("SharedFunctionalGroupsSequence") or []:
+        _group_values(group, shared)
+
+    result = []
+    for frame, group in enumerate(per_frame):
+        values = dict(shared)
+        _group_values(group, values)
+        if "ImagePositionPatient" not in values:
+            return [(dcm, None)]
+        values["NumberOfFrames"] = 1
+        result.append((FrameHeader(dcm, frame, values), frame))
+    return result
+
+
+# --- 공유 메모리 볼륨 ---
+
+_blocks = []  # (볼륨 weakref, SharedMemory). 볼륨이 사라진 블록은 다음 할당 때 해제
+_blocks_lock = threading.Lock()
+
+
+def _release_blocks(release_all=False):
+    with _blocks_lock:
+        # 한 번에 나눔 (tuple 비교는 살아 있는 ndarray 끼리 == 를 호출하게 된다)
+        kept, released = [], []
+        for entry in _blocks:
+            (released if release_all or entry[0]() is None else kept).append(entry)
+        _blocks[:] = kept
+    for _, block in released:
+        try:
+            block.close()
+        except BufferError:
+            pass  # 종료 시점에 아직 살아 있는 view (프로세스와 함께 해제)
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+atexit.register(_release_blocks, True)
+
+
+def shared_zeros(shape, dtype):
+    """공유 메모리에 할당한 0 배열과 블록 이름. 새 블록은 OS 가 0 으로 채워서 준다.
+
+    블록은 배열 (과 그 view) 이 모두 사라진 뒤 다음 할당 또는 종료 시 해제한다.
+    """
+    _release_blocks()
+    dtype = np.dtype(dtype)
+    size = max(1, int(np.prod(shape)) * dtype.itemsize)
+    block = shared_memory.SharedMemory(create=True, size=size)
+    volume = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    with _blocks_lock:
+        _blocks.append((weakref.ref(volume), block))
+    return volume, block.name
+
+
+# --- process pool ---
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _decode_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Qt / 디코딩 스레드가 떠 있는 프로세스를 fork 하지 않도록 spawn
+            _pool = ProcessPoolExecutor(
+                max_workers=decode_processes(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _discard_pool(pool):
+    """워커가 죽은 (BrokenProcessPool) pool 은 버리고 다음 요청 때 새로 만든다."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def _decode_task(name, shape, dtype, index, path, frame, rescale):
+    """워커 프로세스: 공유 메모리 볼륨에 붙어 index 슬라이스 하나를 디코딩해 기록."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        volume = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        store_slice(volume, index, read_pixels(path, frame), rescale)
+        del volume
+    finally:
+        block.close()
+    return True
+
+
+def process_decoder(volume, name, paths, frames, rescales):
+    """index → 워커 프로세스가 shared_zeros 볼륨의 index 슬라이스를 채우는 함수 (성공 여부).
+
+    호출한 스레드는 결과를 기다리기만 하므로 SeriesDecoder / 스레드 풀에서 그대로 쓸 수 있고,
+    호출 스레드 수만큼 (최대 워커 수) 동시에 디코딩된다.
+    """
+    shape, dtype = volume.shape, volume.dtype.str
+
+    def decode(index):
+        pool = _decode_pool()
+        try:
+            future = pool.submit(
+                _decode_task,
+                name,
+                shape,
+                dtype,
+                index,
+                paths[index],
+                frames[index],
+                rescales[index],
+            )
+            return future.result()
+        except BrokenProcessPool as e:
+            _discard_pool(pool)
+            print(f"[Warning] Decode worker died on DICOM file {paths[index]}: {e}")
+        except Exception as e:
+            print(f"[Warning] Failed to decode DICOM file {paths[index]}: {e}")
+        return False
+
+    return decode
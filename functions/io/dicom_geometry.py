@@ -0,0 +1,128 @@
+"""DICOM 시리즈의 공간 정보 (슬라이스 순서, affine, voxel 간격).
+
+ImageOrientationPatient / ImagePositionPatient / PixelSpacing 를 시리즈 전체 헤더에서
+한 번에 배열로 모아 계산한다. affine 은 NIfTI 와 같은 RAS 기준이며 (rows, cols, slices)
+순서 배열의 voxel index → mm 변환이므로, load_nifty 와 같은 방식
+(reorient_array_to_RAS) 으로 RAS tensor 를 만들 수 있다.
+"""
+import numpy as np
+import nibabel as nib
+from nibabel.orientations import io_orientation
+
+_LPS_TO_RAS = np.diag([-1.0, -1.0, 1.0, 1.0])  # DICOM 환자 좌표 (LPS) → NIfTI (RAS)
+TILT_TOLERANCE = 0.1  # 도. 이보다 크게 기울어진 슬라이스 진행 방향은 gantry tilt
+GAP_TOLERANCE = 0.01  # 간격 중앙값 대비 비율. 이보다 크게 벗어나면 불균일 간격
+
+
+def _header_array(headers, keyword, size):
+    """모든 헤더의 keyword 값을 (N, size) float 배열로. 하나라도 없으면 None."""
+    values = []
+    for dcm in headers:
+        value = dcm.get(keyword)
+        if value is None or len(value) != size:
+            return None
+        values.append([float(v) for v in value])
+    return np.asarray(values, dtype=np.float64)
+
+
+def _slice_thickness(dcm):
+    value = dcm.get("SpacingBetweenSlices") or dcm.get("SliceThickness")
+    return abs(float(value)) if value else 1.0
+
+
+def slice_order(headers):
+    """슬라이스 정렬 순서 (index 배열). 법선 방향 위치 기준, 위치 정보가 없으면 InstanceNumber."""
+    iop = _header_array(headers, "ImageOrientationPatient", 6)
+    ipp = _header_array(headers, "ImagePositionPatient", 3)
+    if iop is None or ipp is None:
+        numbers = [int(dcm.get("InstanceNumber", 0) or 0) for dcm in headers]
+        return np.argsort(numbers, kind="stable")
+    normals = np.cross(iop[:, :3], iop[:, 3:])
+    locations = np.einsum("ij,ij->i", ipp, normals)  # 슬라이스별 법선 방향 위치
+    return np.argsort(locations, kind="stable")
+
+
+def series_affine(headers):
+    """정렬된 헤더 → (RAS affine, geometry dict).
+
+    geometry: normal (LPS 법선), slice_spacing (mm), tilt (도), uniform (간격 균일 여부),
+    oriented (위치/방향 정보 유무). 간격이 불균일하면 affine 은 평균 간격을 쓴다.
+    """
+    count = len(headers)
+    pixel_spacing = _header_array(headers[:1], "PixelSpacing", 2)
+    row_spacing, col_spacing = pixel_spacing[0] if pixel_spacing is not None else (1.0, 1.0)
+    iop = _header_array(headers, "ImageOrientationPatient", 6)
+    ipp = _header_array(headers, "ImagePositionPatient", 3)
+    thickness = _slice_thickness(headers[0])
+    if iop is None or ipp is None:
+        affine = np.diag([row_spacing, col_spacing, thickness, 1.0])
+        geometry = {
+            "normal": [0.0, 0.0, 1.0],
+            "slice_spacing": thickness,
+            "tilt": 0.0,
+            "uniform": True,
+            "oriented": False,
+        }
+        return _LPS_TO_RAS @ affine, geometry
+
+    if not np.allclose(iop, iop[0], atol=1e-4):
+        print("[Warning] ImageOrientationPatient differs between slices; using the first")
+    row_cos, col_cos = iop[0, :3], iop[0, 3:]
+    normal = np.cross(row_cos, col_cos)
+    steps = np.diff(ipp @ normal)
+    step = (ipp[-1] - ipp[0]) / (count - 1) if count > 1 else np.zeros(3)
+    if np.linalg.norm(step) < 1e-6:
+        step = normal * thickness  # 한 장짜리 / 위치가 모두 같은 시리즈
+    spacing = float(np.median(steps)) if count > 1 else thickness
+    uniform = bool(
+        count < 3 or np.all(np.abs(steps - spacing) <= GAP_TOLERANCE * abs(spacing) + 1e-3)
+    )
+    # 슬라이스 진행 방향이 법선과 어긋난 각도 (gantry tilt 면 0 이 아님)
+    cos_tilt = abs(np.dot(step, normal)) / np.linalg.norm(step)
+    tilt = float(np.degrees(np.arccos(np.clip(cos_tilt, 0.0, 1.0))))
+
+    affine = np.eye(4)
+    affine[:3, 0] = col_cos * row_spacing  # row index 증가 = 열 방향 cosine 으로 이동
+    affine[:3, 1] = row_cos * col_spacing
+    affine[:3, 2] = step  # tilt 가 있으면 법선과 다른 방향 (shear)
+    affine[:3, 3] = ipp[0]
+    geometry = {
+        "normal": normal.tolist(),
+        "slice_spacing": abs(spacing),
+        "tilt": tilt if tilt > TILT_TOLERANCE else 0.0,
+        "uniform": uniform,
+        "oriented": True,
+    }
+    return _LPS_TO_RAS @ affine, geometry
+
+
+def series_geometry(headers):
+    """정렬 전 헤더 목록 → (order, affine, geometry).
+
+    RAS 로 바꿨을 때 슬라이스 축이 뒤집히지 않는 방향으로 정렬하므로, 정렬된 순서의
+    index 가 RAS tensor 의 슬라이스 축 index 와 같다 (progressive 로딩의 ready mask 기준).
+    """
+    order = slice_order(headers)
+    affine, geometry = series_affine([headers[i] for i in order])
+    if io_orientation(affine)[2, 1] < 0:
+        order = order[::-1]
+        affine, geometry = series_affine([headers[i] for i in order])
+    return order, affine, geometry
+
+
+def ras_slice_axis(affine):
+    """(rows, cols, slices) 배열의 슬라이스 축이 RAS tensor 에서 놓이는 축."""
+    return int(io_orientation(affine)[2, 0])
+
+
+def nifti_header(affine, shape, dtype, slope=1.0, inter=0.0):
+    """NIfTI 와 같은 schema 를 위한 header (shape / dtype / zooms / sform / scl)."""
+    header = nib.Nifti1Header()
+    header.set_data_dtype(dtype)
+    header.set_data_shape(shape)
+    header.set_zooms(tuple(np.linalg.norm(affine[:3, :3], axis=0)) + (1.0,) * (len(shape) - 3))
+    header.set_sform(affine, code="scanner")
+    header.set_qform(affine, code="scanner")
+    if slope != 1.0 or inter != 0.0:
+        header.set_slope_inter(slope, inter)
+    return header
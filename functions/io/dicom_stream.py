@@ -0,0 +1,131 @@
+"""DICOM 시리즈를 백그라운드에서 슬라이스 단위로 디코딩 (progressive 표시용).
+
+볼륨은 먼저 할당해 두고 가운데 (또는 prioritize 로 지정한 위치) 에서 가까운 슬라이스부터
+채운다. ready[i] 가 True 인 슬라이스만 유효하며, 뷰어는 나머지를 placeholder 로 그린다.
+GzipInflater 와 같은 인터페이스 (start / done / error / progress) 를 따른다.
+"""
+import os
+import threading
+import numpy as np
+from functions.utils.tracing import span
+
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)  # 파일 I/O 위주라 코어 수보다 여유 있게
+
+
+class SeriesDecoder:
+    """count 장의 슬라이스를 decode(index) 로 채운다. 실패한 슬라이스는 0 으로 남는다.
+
+    slice_axis 는 tensor 에서 슬라이스 번호에 해당하는 축.
+    """
+
+    def __init__(
+        self, count, decode, slice_axis=2, focus=None, workers=_MAX_WORKERS, name=""
+    ):
+        self.count = count
+        self.slice_axis = slice_axis
+        self.ready = np.zeros(count, dtype=bool)
+        self.failed = []
+        self.error = None
+        self.done = threading.Event()
+        self.name = name
+        self._decode = decode
+        self._pending = np.ones(count, dtype=bool)
+        self._focus = count // 2 if focus is None else focus
+        self._workers = max(1, min(workers, count))
+        self._lock = threading.Lock()
+        self._on_complete = []
+        self._finished = False
+        self._cancelled = False
+        self._running = 0
+        self._done_count = 0
+
+    def mark_ready(self, index):
+        """이미 채운 슬라이스 (시리즈 dtype 확인용으로 먼저 디코딩한 것) 표시."""
+        with self._lock:
+            self._pending[index] = False
+            self.ready[index] = True
+            self._done_count += 1
+
+    def start(self, on_complete=None):
+        if on_complete is not None:
+            self.add_done_callback(on_complete)
+        with self._lock:
+            if self._running or self._finished:
+                return
+            # 남은 슬라이스가 없어도 스레드 하나는 돌려서 완료 callback 을 같은 경로로 호출
+            self._running = max(1, min(self._workers, int(self._pending.sum())))
+            workers = self._running
+        for _ in range(workers):
+            threading.Thread(target=self._run, daemon=True).start()
+
+    def add_done_callback(self, callback):
+        """모든 슬라이스를 처리한 뒤 디코딩 스레드에서 호출. 이미 끝났으면 바로 호출."""
+        with self._lock:
+            if not self._finished:
+                self._on_complete.append(callback)
+                return
+        if self.error is None:
+            callback()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    def progress(self):
+        return self._done_count, self.count
+
+    def prioritize(self, index):
+        """다음 디코딩을 index 에서 가까운 슬라이스부터 (사용자가 보고 있는 위치)."""
+        self._focus = int(index)
+
+    def cancel(self):
+        with self._lock:
+            self._cancelled = True
+
+    def _next_index(self):
+        with self._lock:
+            if self._cancelled:
+                return None
+            candidates = np.flatnonzero(self._pending)
+            if candidates.size == 0:
+                return None
+            index = int(candidates[np.argmin(np.abs(candidates - self._focus))])
+            self._pending[index] = False
+            return index
+
+    def _run(self):
+        try:
+            with span("io.decode_stream", series=self.name):
+                while True:
+                    index = self._next_index()
+                    if index is None:
+                        break
+                    ok = self._decode(index)
+                    with self._lock:
+                        self._done_count += 1
+                        if ok:
+                            self.ready[index] = True
+                        else:
+                            self.failed.append(index)
+        except Exception as e:
+            self.error = str(e)
+            print(f"[Error] Failed to decode series {self.name}: {e}")
+        self._worker_exit()
+
+    def _worker_exit(self):
+        with self._lock:
+            self._running -= 1
+            if self._running > 0:
+                return
+            if self._cancelled and self.error is None:
+                self.error = "cancelled"
+            self._finished = True
+            callbacks, self._on_complete = self._on_complete, []
+        try:
+            if self.error is None:
+                for callback in callbacks:
+                    callback()
+        except Exception as e:
+            self.error = str(e)
+            print(f"[Error] Failed to finish series {self.name}: {e}")
+        finally:
+            self.done.set()
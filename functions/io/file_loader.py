@@ -1,6 +1,26 @@
 import os
-from functions.utils.meta_access import type_checking
-from functions.utils.load_file import load_nifti_array
+from functions.utils.meta_access import index_directory, type_checking
+from functions.utils.load_file import load_nifti_array, reorient_array_to_RAS
+from functions.io.gzip_volume import open_nifti_gz
+from functions.io.dicom_stream import SeriesDecoder
+from functions.io.dicom_decode import (
+    decode_processes,
+    is_compressed,
+    process_decoder,
+    read_pixels,
+    shared_zeros,
+    split_frames,
+    store_slice,
+)
+from functions.io.dicom_geometry import (
+    nifti_header,
+    ras_slice_axis,
+    series_affine,
+    series_geometry,
+)
+from functions.io.volume_cache import default_volume_cache
+from functions.common.statistics import compute_volume_stats
+from functions.utils.tracing import span
 
 import os
 import numpy as np
@@ -11,20 +31,92 @@ def load_nifty(path: str):
     file_format = type_checking(path)
 
     if file_format == "nifti":
-        tensor, header, affine = load_nifti_array(path)
-        return {
+        cache = default_volume_cache()
+        cache_key = cache.key("nifti", [path])
+        cached = cache.load(cache_key)
+        if cached is not None:
+            image_data = cached[0]
+            if image_data["tensor"] is None:
+                # 비압축 .nii 는 원본이 이미 memmap 이라 통계/메타데이터만 캐시
+                image_data["tensor"] = load_nifti_array(path)[0]
+            image_data.update(path=path, folder=os.path.dirname(path))
+            return image_data
+
+        inflater = None
+        if path.lower().endswith(".gz"):
+            # 백그라운드에서 inflate 하며 앞쪽 슬라이스부터 표시 (다 풀린 사본은 캐시에 등록)
+            data_path = cache.data_path(cache_key, ".nii") if cache.enabled else None
+            tensor, header, affine, inflater = open_nifti_gz(path, data_path)
+        else:
+            tensor, header, affine = load_nifti_array(path)
+        slope, inter = header.get_slope_inter()
+        slope = 1.0 if slope is None else float(slope)
+        inter = 0.0 if inter is None else float(inter)
+        image_data = {
             "type": "nifti",
-            "tensor": tensor,
+            "tensor": tensor,  # 원본 dtype (실제 값 = tensor * slope + inter)
             "header": header,
             "affine": affine,
+            "slope": slope,
+            "inter": inter,
+            "stats": None,
             "path": path,
             "folder": os.path.dirname(path),
         }
+        if inflater is None:
+            image_data["stats"] = _volume_stats(tensor, slope, inter)
+            cache.store(cache_key, [image_data], write_tensors=False)
+        else:
+            # 통계 계산과 캐시 등록은 다 풀린 뒤 inflate 스레드에서
+            def on_inflated():
+                image_data["stats"] = _volume_stats(tensor, slope, inter)
+                if isinstance(inflater.buffer, np.memmap):
+                    cache.store(cache_key, [image_data], data_files=[data_path])
+
+            image_data["loading"] = inflater
+            inflater.start(on_inflated)
+        return image_data
 
     else:
         raise ValueError(f"Unsupported file type: {file_format}")
 
 
+def _start_progressive(result, cache, cache_keys):
+    """시리즈별 SeriesDecoder 시작. 각 시리즈는 끝나는 대로 통계를 계산하고, 실패 없이
+    끝났으면 시리즈 단위 캐시 (cache_keys[i]) 에 저장한다.
+
+    저장된 memmap tensor 는 image_data["stored_tensor"] 에 남긴다. 디코딩 완료를 확인한 쪽
+    (GUI) 이 메모리의 볼륨과 바꾸면 메모리 예산에서 빠진다 (eager 경로의 cache.store 와 같은 효과).
+    """
+
+    def on_series_done(image_data, cache_key):
+        decoder = image_data["loading"]
+        image_data["stats"] = _volume_stats(
+            image_data["tensor"], image_data["slope"], image_data["inter"]
+        )
+        if decoder.failed:
+            print(
+                f"[Warning] Series {image_data['series_uid']}: "
+                f"{len(decoder.failed)} slices failed to decode (left blank)"
+            )
+            return  # 빈 슬라이스가 남은 볼륨은 캐시하지 않음
+        stored = cache.store(cache_key, [image_data])[0]
+        if stored["tensor"] is not image_data["tensor"]:
+            image_data["stored_tensor"] = stored["tensor"]
+
+    for image_data, cache_key in zip(result, cache_keys):
+        image_data["loading"].start(
+            lambda image_data=image_data, cache_key=cache_key: on_series_done(
+                image_data, cache_key
+            )
+        )
+
+
+def _volume_stats(tensor, slope, inter):
+    with span("io.stats"):
+        return compute_volume_stats(tensor, slope, inter)
+
+
 # import os
 # import pydicom
 # import numpy as np
@@ -97,77 +189,410 @@ import os
 import numpy as np
 import pydicom
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)  # 파일 I/O 위주라 코어 수보다 여유 있게
 
 
-def compute_slice_location(dcm):
-    """슬라이스의 위치를 normal 벡터 방향으로 투영한 값 반환."""
-    orientation = np.array(dcm.ImageOrientationPatient).reshape(2, 3)
-    position = np.array(dcm.ImagePositionPatient)
-    normal = np.cross(orientation[0], orientation[1])
-    location = np.dot(position, normal)
-    return location
+class LoadCancelled(Exception):
+    """사용자가 로딩을 취소했을 때 발생."""
 
 
-def load_dicom(folder_path: str):
+def _check_cancelled(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise LoadCancelled("Loading cancelled by user.")
+
+
+def _parallel_map(func, items, on_done=None, cancel_event=None):
+    """items 를 스레드 풀에서 처리하고 입력 순서대로 결과 반환."""
+    results = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        futures = {executor.submit(func, item): i for i, item in enumerate(items)}
+        try:
+            for future in as_completed(futures):
+                _check_cancelled(cancel_event)
+                results[futures[future]] = future.result()
+                if on_done is not None:
+                    on_done()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return results
+
+
+def _read_header(path):
+    try:
+        # force: preamble (128 bytes + "DICM") 없는 파일도 허용
+        return pydicom.dcmread(path, stop_before_pixels=True, force=True)
+    except Exception as e:
+        print(f"[Warning] Failed to read DICOM file {path}: {e}")
+        return None
+
+
+def _frame_geometry(dcm):
+    return (
+        int(dcm.Rows),
+        int(dcm.Columns),
+        int(dcm.get("SamplesPerPixel", 1)),
+        int(dcm.get("NumberOfFrames", 1) or 1),
+    )
+
+
+def _rescale_of(dcm):
+    return (
+        float(dcm.get("RescaleSlope", 1.0) or 1.0),
+        float(dcm.get("RescaleIntercept", 0.0) or 0.0),
+    )
+
+
+def _rescaled_dtype(raw_dtype, rescales):
+    """슬라이스마다 rescale 이 다를 때 실제 값을 담을 가장 작은 dtype.
+
+    slope/intercept 가 모두 정수면 int16/int32 중 범위에 맞는 것, 아니면 float32.
+    """
+    raw_dtype = np.dtype(raw_dtype)
+    integral = all(float(s).is_integer() and float(i).is_integer() for s, i in rescales)
+    if raw_dtype.kind not in "iu" or not integral:
+        return np.dtype(np.float32)
+    info = np.iinfo(raw_dtype)
+    ends = [v * s + i for s, i in rescales for v in (info.min, info.max)]
+    for candidate in (np.int16, np.int32):
+        limits = np.iinfo(candidate)
+        if limits.min <= min(ends) and max(ends) <= limits.max:
+            return np.dtype(candidate)
+    return np.dtype(np.float32)
+
+
+def _decode_into(volume, index, path, frame=None, rescale=None):
+    """한 파일 (multi-frame 이면 그 frame) 의 픽셀을 디코딩해 volume[index] 에 바로 기록."""
+    try:
+        store_slice(volume, index, read_pixels(path, frame), rescale)
+        return True
+    except Exception as e:
+        print(f"[Warning] Failed to decode DICOM file {path}: {e}")
+        return False
+
+
+def _report_geometry(series_uid, geometry):
+    if not geometry["oriented"]:
+        print(
+            f"[Warning] Series {series_uid}: no ImagePositionPatient/ImageOrientationPatient, "
+            "sorted by InstanceNumber"
+        )
+    if geometry["tilt"]:
+        print(f"[Warning] Series {series_uid}: gantry tilt {geometry['tilt']:.1f} deg")
+    if not geometry["uniform"]:
+        print(
+            f"[Warning] Series {series_uid}: non-uniform slice spacing "
+            f"(median {geometry['slice_spacing']:.2f} mm)"
+        )
+    print(f"[Info] Series {series_uid} direction normal: {np.round(geometry['normal'], 4)}")
+
+
+def _series_geometry_fields(shape, dtype, affine, geometry, slope, inter):
+    """load_nifty 와 같은 header / affine. (slices, rows, cols) 3D 볼륨만 RAS 로 배치한다."""
+    if len(shape) != 3:
+        # multi-frame / color 는 기존 (rows, cols, ..., slices) 배치 유지
+        return {"header": None, "affine": None, "geometry": geometry}
+    return {
+        "header": nifti_header(affine, shape[1:] + shape[:1], dtype, slope, inter),
+        "affine": affine,
+        "geometry": geometry,
+    }
+
+
+def _series_tensor(volume, affine):
+    """(slices, rows, cols, ...) 볼륨 → tensor view (복사 없음). affine 이 있으면 RAS."""
+    tensor = np.moveaxis(volume, 0, -1)
+    if affine is None:
+        return tensor
+    return reorient_array_to_RAS(tensor, affine)
+
+
+def _slice_decoder(volume, paths, frames, rescales):
+    """index → volume[index] 를 디코딩하는 함수 (성공 여부 반환)."""
+
+    def decode(index):
+        return _decode_into(volume, index, paths[index], frames[index], rescales[index])
+
+    return decode
+
+
+def _allocate_series(shape, dtype, paths, frames, rescales, compressed, zeros=True):
+    """시리즈 볼륨 할당 + 슬라이스 디코더.
+
+    압축 transfer syntax 는 GIL 에 묶이지 않도록 공유 메모리 볼륨 + 워커 프로세스로 디코딩,
+    비압축은 파일 I/O 위주라 스레드로 충분하다.
+    """
+    if compressed and decode_processes() > 0:
+        volume, name = shared_zeros(shape, dtype)
+        return volume, process_decoder(volume, name, paths, frames, rescales)
+    volume = (np.zeros if zeros else np.empty)(shape, dtype=dtype)
+    return volume, _slice_decoder(volume, paths, frames, rescales)
+
+
+def _series_decoder(volume, decode, image_data, middle):
+    """가운데 슬라이스가 채워진 volume 의 나머지를 decode 로 채울 SeriesDecoder (시작 전)."""
+    affine = image_data["affine"]
+    decoder = SeriesDecoder(
+        volume.shape[0],
+        decode,
+        slice_axis=ras_slice_axis(affine) if affine is not None else volume.ndim - 1,
+        focus=middle,
+        name=image_data["series_uid"],
+    )
+    decoder.mark_ready(middle)
+    return decoder
+
+
+def _preview_plane(pixels, geometry):
+    """썸네일용 2D 한 장 (multi-frame 은 가운데 frame, color 는 첫 채널)."""
+    _, _, samples, frames = geometry
+    if frames > 1:
+        pixels = pixels[frames // 2]
+    if samples > 1:
+        pixels = pixels[..., 0]
+    return pixels
+
+
+def start_series(image_data):
+    """lazy 로 헤더만 인덱싱한 시리즈의 볼륨을 할당하고 백그라운드 디코딩 시작.
+
+    이후는 progressive 와 같다 (image_data["loading"], 끝나면 통계 + 시리즈 단위 캐시 저장).
+    """
+    deferred = image_data.pop("deferred")
+    middle, rescales = deferred["middle"], deferred["rescales"]
+    # 채워지지 않은 슬라이스가 화면에 그대로 보이므로 0 으로 할당
+    volume, decode = _allocate_series(
+        deferred["shape"],
+        deferred["dtype"],
+        image_data["path_list"],
+        deferred["frames"],
+        rescales,
+        deferred["compressed"],
+    )
+    store_slice(volume, middle, deferred["first"], rescales[middle])
+    image_data["tensor"] = _series_tensor(volume, image_data["affine"])
+    image_data["loading"] = _series_decoder(volume, decode, image_data, middle)
+    _start_progressive([image_data], default_volume_cache(), [deferred["cache_key"]])
+    return image_data
+
+
+def load_dicom(
+    folder_path: str,
+    progress_callback=None,
+    cancel_event=None,
+    progressive=False,
+    lazy=False,
+):
     if not os.path.isdir(folder_path):
         raise ValueError("DICOM input must be a folder.")
 
-    dicom_files = [
-        os.path.join(folder_path, f)
-        for f in os.listdir(folder_path)
-        if f.lower().endswith(".dcm")
-    ]
+    # 확장자와 무관하게 내용으로 판별 (PACS export 의 확장자 없는 파일 포함, 하위 폴더까지)
+    dicom_files = index_directory(folder_path)["dicom"]
     if not dicom_files:
         raise ValueError("No DICOM files found in the folder.")
 
+    return load_dicom_files(
+        dicom_files, folder_path, progress_callback, cancel_event, progressive, lazy
+    )
+
+
+def load_dicom_files(
+    dicom_files,
+    folder_path: str,
+    progress_callback=None,
+    cancel_event=None,
+    progressive=False,
+    lazy=False,
+):
+    """주어진 DICOM 파일 목록을 시리즈별 볼륨으로 조립 (folder_path 는 key 생성용).
+
+    progressive=True 면 헤더 정렬과 가운데 슬라이스 하나만 디코딩하고 바로 반환한다.
+    나머지는 image_data["loading"] (SeriesDecoder) 가 가운데부터 백그라운드에서 채우며,
+    통계 계산과 캐시 저장은 시리즈마다 끝난 뒤에 한다 (시리즈 단위 캐시).
+
+    lazy=True 면 볼륨을 할당하지 않고 시리즈마다 대표 슬라이스 (image_data["preview"])
+    만 디코딩한다. tensor 는 None 이고, start_series 를 호출해야 디코딩이 시작된다.
+    이미 디코딩해 둔 시리즈는 시리즈 단위 캐시에서 바로 연다.
+    """
+    # multi-frame 은 path_list 에 frame 수만큼 같은 경로가 들어 있으므로 한 번씩만
+    dicom_files = list(dict.fromkeys(dicom_files))
+    # 같은 파일 구성 (경로 + size + mtime) 이면 디코딩 없이 캐시된 볼륨을 memmap
+    cache = default_volume_cache()
+    cache_key = cache.key("dicom", sorted(dicom_files))
+    cached = cache.load(cache_key)
+    if cached is not None:
+        for image_data in cached:
+            image_data["folder"] = os.path.dirname(folder_path)
+            image_data["key"] = os.path.join(folder_path, image_data["series_uid"])
+        if progress_callback is not None:
+            progress_callback(1, 1)
+        return cached
+
+    # 진행률: 헤더 스캔 + 픽셀 디코딩 = 파일 수 * 2 (progressive 는 헤더 + 시리즈별 한 장)
+    total = len(dicom_files) * (1 if progressive or lazy else 2)
+    done = [0]
+
+    def on_done():
+        done[0] += 1
+        if progress_callback is not None:
+            progress_callback(done[0], total)
+
+    # 1. 헤더만 병렬로 읽어서 시리즈 UID 기준으로 그룹화
+    with span("io.dicom_headers", files=len(dicom_files)):
+        headers = _parallel_map(_read_header, dicom_files, on_done, cancel_event)
     series_dict = defaultdict(list)
-    for path in dicom_files:
+    for dcm, path in zip(headers, dicom_files):
+        if dcm is None or "Rows" not in dcm:  # 이미지가 아닌 객체 (SR, PR 등) 제외
+            continue
         try:
-            dcm = pydicom.dcmread(path, stop_before_pixels=False)
             series_uid = dcm.SeriesInstanceUID
-            series_dict[series_uid].append((dcm, path))
-        except Exception as e:
+            # enhanced multi-frame 은 frame 하나를 슬라이스 하나로 (frame 별 위치 / 방향)
+            frames = split_frames(dcm)
+        except (AttributeError, TypeError, ValueError) as e:
             print(f"[Warning] Failed to read DICOM file {path}: {e}")
             continue
+        series_dict[series_uid].extend((header, path, frame) for header, frame in frames)
+    if not (progressive or lazy):
+        # 디코딩 진행률은 슬라이스 (multi-frame 은 frame) 단위
+        total = len(dicom_files) + sum(len(s) for s in series_dict.values())
 
     result = []
+    series_keys = []  # progressive 로 디코딩할 시리즈의 캐시 key
 
     for series_uid, slices in series_dict.items():
+        _check_cancelled(cancel_event)
         try:
-            valid_slices = [s for s in slices if hasattr(s[0], "PixelData")]
-            valid_slices = sorted(
-                valid_slices, key=lambda x: compute_slice_location(x[0])
-            )
-
-            arrays = [s[0].pixel_array for s in valid_slices]
-            shapes = [a.shape for a in arrays]
-            if len(set(shapes)) != 1:
+            # 2. 픽셀 디코딩 전에 정렬 / shape 검사 (위치 / 방향은 전체 헤더를 배열로 한 번에)
+            order, affine, geometry = series_geometry([s[0] for s in slices])
+            valid_slices = [slices[i] for i in order]
+            geometries = {_frame_geometry(s[0]) for s in valid_slices}
+            if len(geometries) != 1:
                 print(f"[Warning] Skipping Series {series_uid} due to shape mismatch")
                 continue
-
-            volume = np.stack(arrays, axis=-1)
+            paths = [s[1] for s in valid_slices]
+            frames = [s[2] for s in valid_slices]
+            compressed = any(is_compressed(s[0]) for s in valid_slices)
+            series_key = cache.key("dicom", sorted(paths))
+            if lazy or progressive:
+                cached = cache.load(series_key)  # 전에 열어서 다 디코딩한 시리즈
+                if cached is not None:
+                    image_data = cached[0]
+                    image_data["folder"] = os.path.dirname(folder_path)
+                    image_data["key"] = os.path.join(folder_path, series_uid)
+                    result.append(image_data)
+                    on_done()
+                    continue
+
+            # 3. 가운데 슬라이스로 dtype/shape 확인 후 볼륨 한 번만 할당
+            #    rescale 이 모든 슬라이스에서 같으면 원본 dtype + slope/inter 메타데이터,
+            #    다르면 (PET 등) 슬라이스별로 실제 값으로 변환해 공통 dtype 에 저장
+            rescales = [_rescale_of(s[0]) for s in valid_slices]
+            uniform = len(set(rescales)) == 1
+            middle = len(valid_slices) // 2
+            first = read_pixels(paths[middle], frames[middle])
+            dtype = first.dtype if uniform else _rescaled_dtype(first.dtype, rescales)
+            shape = (len(valid_slices),) + first.shape
+            slice_rescales = [None] * len(valid_slices) if uniform else rescales
+            on_done()
 
             # 방향 확인용 로그
-            first_dcm = valid_slices[0][0]
-            ori = np.array(first_dcm.ImageOrientationPatient).reshape(2, 3)
-            normal = np.cross(ori[0], ori[1])
-            print(f"[Info] Series {series_uid} direction normal: {normal}")
-
-            result.append(
-                {
-                    "type": "dicom",
-                    "tensor": volume,
-                    "series_uid": series_uid,
-                    "folder": os.path.dirname(folder_path),
-                    "key": os.path.join(folder_path, series_uid),
-                    "path_list": [s[1] for s in valid_slices],
+            _report_geometry(series_uid, geometry)
+
+            slope, inter = rescales[0] if uniform else (1.0, 0.0)
+            image_data = {
+                "type": "dicom",
+                "series_uid": series_uid,
+                "folder": os.path.dirname(folder_path),
+                "key": os.path.join(folder_path, series_uid),
+                "path_list": paths,
+                "slope": slope,
+                "inter": inter,
+                "stats": None,
+            }
+            image_data.update(
+                _series_geometry_fields(shape, dtype, affine, geometry, slope, inter)
+            )
+            affine = image_data["affine"]
+
+            if lazy:
+                # 썸네일용 한 장만 남기고 볼륨 할당 / 디코딩은 start_series 에서
+                image_data["tensor"] = None
+                image_data["preview"] = _preview_plane(first, geometries.pop())
+                image_data["deferred"] = {
+                    "shape": shape,
+                    "dtype": dtype,
+                    "middle": middle,
+                    "first": first,
+                    "frames": frames,
+                    "rescales": slice_rescales,
+                    "compressed": compressed,
+                    "cache_key": series_key,
+                    "nbytes": int(np.prod(shape)) * dtype.itemsize,  # 할당할 볼륨 크기
                 }
+                result.append(image_data)
+                continue
+
+            # progressive 는 채워지지 않은 슬라이스가 화면에 그대로 보이므로 0 으로 할당
+            volume, decode = _allocate_series(
+                shape, dtype, paths, frames, slice_rescales, compressed, zeros=progressive
             )
+            store_slice(volume, middle, first, slice_rescales[middle])
+            del first
+
+            if progressive:
+                # 복사 없는 view 라 디코딩 결과가 바로 보임. 정렬 순서 = RAS 슬라이스 축 index
+                image_data["tensor"] = _series_tensor(volume, affine)
+                image_data["loading"] = _series_decoder(volume, decode, image_data, middle)
+                result.append(image_data)
+                series_keys.append(series_key)
+                continue
 
+            # 4. 나머지 슬라이스는 병렬로 디코딩해 인덱스 위치에 바로 기록
+            with span("io.decode", series=series_uid, slices=len(valid_slices)):
+                decoded = _parallel_map(
+                    decode,
+                    [i for i in range(len(valid_slices)) if i != middle],
+                    on_done,
+                    cancel_event,
+                )
+            decoded.insert(middle, True)
+            if not all(decoded):
+                keep = np.array(decoded)
+                volume = volume[keep]  # 실패한 슬라이스 제외 (드문 경우만 복사)
+                valid_slices = [s for s, k in zip(valid_slices, keep) if k]
+                image_data["path_list"] = [s[1] for s in valid_slices]
+                # 빠진 슬라이스만큼 간격이 바뀌므로 geometry 다시 계산
+                affine, geometry = series_affine([s[0] for s in valid_slices])
+                image_data.update(
+                    _series_geometry_fields(
+                        volume.shape, volume.dtype, affine, geometry, slope, inter
+                    )
+                )
+
+            # NIfTI 와 같은 RAS 배치 - 복사 없는 view
+            volume = _series_tensor(volume, image_data["affine"])
+            image_data["tensor"] = volume
+            image_data["stats"] = _volume_stats(volume, slope, inter)
+            result.append(image_data)
+
+        except LoadCancelled:
+            raise
         except Exception as e:
             print(f"[Error] Failed to process Series {series_uid}: {e}")
 
     if not result:
         raise ValueError("No valid DICOM series found in the folder.")
 
-    return result
+    if lazy:
+        return result  # 디코딩 / 캐시 저장은 시리즈별 start_series 에서
+
+    if progressive:
+        decoding = [d for d in result if d.get("loading") is not None]
+        _start_progressive(decoding, cache, series_keys)
+        return result
+
+    # 디코딩한 볼륨은 캐시에 쓰고 memmap 으로 교체 (메모리 예산에서도 빠짐)
+    return cache.store(cache_key, result)
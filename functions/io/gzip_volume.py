@@ -0,0 +1,159 @@
+"""압축된 .nii.gz 를 백그라운드 스레드에서 native dtype 버퍼로 inflate.
+
+gzip 은 하나의 deflate 스트림이라 중간부터 풀 수 없으므로 (병렬 inflate 불가)
+스트림을 순서대로 풀면서 미리 할당한 버퍼에 바로 기록하고, 앞쪽 슬라이스부터
+화면에 쓸 수 있게 한다. 버퍼는 volume 캐시 폴더의 비압축 .nii 파일 memmap 이라
+다 풀린 뒤 캐시에 등록하면 이후에는 inflate 없이 memmap 으로 바로 열린다.
+"""
+import os
+import threading
+import zlib
+import nibabel as nib
+import numpy as np
+from functions.utils.load_file import reorient_array_to_RAS, scaled_header, squeeze_singleton
+from functions.utils.tracing import span
+
+_READ_BYTES = 4 * 1024**2  # 한 번에 읽는 압축 데이터
+_OUT_BYTES = 16 * 1024**2  # 한 번에 풀어내는 최대 크기 (압축률이 높아도 메모리 상한 유지)
+
+_active_lock = threading.Lock()
+_active = {}  # key: 비압축 사본 경로 (없으면 원본 경로), value: (inflater, buffer)
+
+
+class GzipInflater:
+    """gzip 스트림을 처음부터 순서대로 풀어 buffer (uint8, 파일 전체 크기) 에 기록.
+
+    bytes_done 까지는 buffer 내용이 유효하다. data_offset 이후는 NIfTI 데이터
+    (Fortran 순서) 이므로 파일 기준 마지막 축 plane 이 앞에서부터 채워진다.
+    """
+
+    def __init__(self, source, buffer, data_offset, plane_bytes):
+        self.source = source
+        self.buffer = buffer
+        self.data_offset = data_offset
+        self.plane_bytes = max(1, plane_bytes)
+        self.total_bytes = buffer.shape[0]
+        self.bytes_done = 0
+        self.ready = None  # 파일 plane 순서가 RAS 축과 다를 수 있어 슬라이스 단위 상태는 없음
+        self.error = None
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+        self._on_complete = []
+        self._finished = False
+        self._thread = None
+
+    def start(self, on_complete=None):
+        if on_complete is not None:
+            self.add_done_callback(on_complete)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def add_done_callback(self, callback):
+        """성공적으로 다 풀린 뒤 inflate 스레드에서 호출. 이미 끝났으면 바로 호출."""
+        with self._lock:
+            if not self._finished:
+                self._on_complete.append(callback)
+                return
+        if self.error is None:
+            callback()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    def available_planes(self):
+        """앞에서부터 다 풀린 plane 수 (파일 축 순서 기준)."""
+        return max(0, self.bytes_done - self.data_offset) // self.plane_bytes
+
+    def progress(self):
+        return self.bytes_done, self.total_bytes
+
+    def _run(self):
+        try:
+            with span("io.inflate", path=self.source):
+                self._inflate()
+            if isinstance(self.buffer, np.memmap):
+                self.buffer.flush()
+        except Exception as e:
+            self.error = str(e)
+            print(f"[Error] Failed to decompress {self.source}: {e}")
+        with self._lock:
+            self._finished = True
+            callbacks, self._on_complete = self._on_complete, []
+        try:
+            if self.error is None:
+                for callback in callbacks:
+                    callback()
+        finally:
+            self.done.set()
+            with _active_lock:
+                for key, (inflater, _) in list(_active.items()):
+                    if inflater is self:
+                        del _active[key]
+
+    def _inflate(self):
+        buffer, total = self.buffer, self.total_bytes
+        pos = 0
+        decomp = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        with open(self.source, "rb") as f:
+            while pos < total:
+                data = f.read(_READ_BYTES)
+                if not data:
+                    break
+                while data and pos < total:
+                    out = decomp.decompress(data, _OUT_BYTES)
+                    n = min(len(out), total - pos)
+                    buffer[pos : pos + n] = np.frombuffer(out, np.uint8, count=n)
+                    pos += n
+                    self.bytes_done = pos
+                    if decomp.eof:
+                        # 여러 member 로 이어 붙인 gzip (pigz 등)
+                        data = decomp.unused_data
+                        if data:
+                            decomp = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    else:
+                        data = decomp.unconsumed_tail
+        if pos < total:
+            raise ValueError(f"Truncated gzip stream ({pos} of {total} bytes)")
+
+
+def open_nifti_gz(path: str, data_path=None):
+    """header 만 읽고 버퍼를 할당한 뒤 (tensor, header, affine, inflater) 반환.
+
+    tensor 는 아직 0 으로 채워진 RAS view 이고, inflater.start() 후 앞에서부터 채워진다.
+    data_path 가 있으면 그 위치의 비압축 .nii 파일을 버퍼로 쓰고, 없거나 쓸 수 없으면 메모리.
+    """
+    with span("io.decode", path=path):
+        nii_img = nib.load(path)  # header / extension 만 inflate
+    header = scaled_header(nii_img)
+    affine = nii_img.affine
+    dtype = header.get_data_dtype()
+    shape = header.get_data_shape()
+    data_offset = int(nii_img.dataobj.offset)
+    data_bytes = int(np.prod(shape)) * dtype.itemsize
+    plane_bytes = data_bytes // shape[-1] if shape else data_bytes
+
+    with _active_lock:
+        active = _active.get(data_path or path)
+        if active is None:
+            buffer = None
+            if data_path is not None:
+                try:
+                    os.makedirs(os.path.dirname(data_path), exist_ok=True)
+                    buffer = np.memmap(
+                        data_path, np.uint8, mode="w+", shape=(data_offset + data_bytes,)
+                    )
+                except OSError as e:
+                    print(f"[Warning] Cannot write decompressed copy, using memory: {e}")
+            if buffer is None:
+                buffer = np.zeros(data_offset + data_bytes, np.uint8)
+            inflater = GzipInflater(path, buffer, data_offset, plane_bytes)
+            _active[data_path or path] = (inflater, buffer)
+        else:
+            inflater, buffer = active
+
+    data = buffer[data_offset:].view(dtype).reshape(shape, order="F")
+    with span("io.reorient"):
+        tensor = reorient_array_to_RAS(data, affine)
+    return squeeze_singleton(tensor), header, affine, inflater
@@ -0,0 +1,146 @@
+from collections import OrderedDict
+import numpy as np
+from functions.io.file_loader import load_nifty, load_dicom_files
+
+
+def resident_bytes(tensor):
+    """텐서가 실제로 점유하는 메모리 (memmap 기반이면 0, view 는 원본 배열 기준)."""
+    if tensor is None:
+        return 0
+    base = tensor
+    while isinstance(base, np.ndarray):
+        if isinstance(base, np.memmap):
+            return 0
+        if base.base is None:
+            return base.nbytes
+        base = base.base
+    return getattr(tensor, "nbytes", 0)
+
+
+def mapped_bytes(tensor):
+    base = tensor
+    while isinstance(base, np.ndarray):
+        if isinstance(base, np.memmap):
+            return base.nbytes
+        base = base.base
+    return 0
+
+
+class StudyStore:
+    """메모리 예산이 있는 study_dicts. (dict 처럼 key → image_data)
+
+    예산을 넘으면 가장 오래 보지 않은 study 의 tensor 만 내려놓고
+    (header, stats, 경로 등 메타데이터는 유지) 다시 열 때 reload 로 복구한다.
+    """
+
+    def __init__(self, max_bytes=4 * 1024**3):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # LRU 순서 (마지막이 최근)
+        self._resident = {}  # key: study key, value: 점유 bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reloads = 0
+
+    # --- dict 인터페이스 (메타데이터 조회, LRU 순서는 바꾸지 않음) ---
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __getitem__(self, key):
+        return self._entries[key]
+
+    def __setitem__(self, key, image_data):
+        if image_data.get("tensor") is not None:
+            if self.is_evicted(key):
+                self.reloads += 1
+            image_data["evicted"] = False
+        self._entries[key] = image_data
+        self._entries.move_to_end(key)
+        self._resident[key] = resident_bytes(image_data.get("tensor"))
+        self._enforce_budget(protect=key)
+
+    def __delitem__(self, key):
+        del self._entries[key]
+        self._resident.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def get(self, key, default=None):
+        return self._entries.get(key, default)
+
+    def keys(self):
+        return self._entries.keys()
+
+    def items(self):
+        return self._entries.items()
+
+    # --- 메모리 관리 ---
+
+    def is_evicted(self, key):
+        return bool(self._entries.get(key, {}).get("evicted"))
+
+    def open(self, key):
+        """뷰어에 띄울 study 조회. 최근 사용으로 표시하며, 내려간 상태면 None."""
+        entry = self._entries[key]
+        if entry.get("evicted"):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def reload(self, key):
+        """내려간 study 를 다시 로드한 image_data 반환 (워커 스레드에서 호출 가능)."""
+        entry = dict(self._entries[key])
+        if entry["type"] == "nifti":
+            image_data = load_nifty(entry["path"])  # 비압축 .nii 는 memmap
+        else:
+            series = load_dicom_files(entry["path_list"], entry["source"])
+            matches = [s for s in series if s["series_uid"] == entry["series_uid"]]
+            if not matches:
+                raise ValueError(f"Series {entry['series_uid']} could not be reloaded.")
+            image_data = matches[0]
+        # 원래 key / folder / source 유지
+        for field in ("key", "folder", "source"):
+            image_data[field] = entry[field]
+        return image_data
+
+    def _enforce_budget(self, protect=None):
+        for key in list(self._entries):
+            if self.resident_total() <= self.max_bytes:
+                break
+            if key == protect or self._resident.get(key, 0) == 0:
+                continue
+            if self._entries[key].get("loading") is not None:
+                continue  # 아직 백그라운드에서 채우는 중인 tensor 는 내려놓지 않음
+            self._evict(key)
+
+    def _evict(self, key):
+        entry = self._entries[key]
+        entry["tensor"] = None
+        entry["evicted"] = True
+        self._resident[key] = 0
+        self.evictions += 1
+
+    def resident_total(self):
+        return sum(self._resident.values())
+
+    def usage(self):
+        return {
+            "resident_bytes": self.resident_total(),
+            "mapped_bytes": sum(
+                mapped_bytes(e.get("tensor")) for e in self._entries.values()
+            ),
+            "budget_bytes": self.max_bytes,
+            "studies": len(self._entries),
+            "evicted": sum(1 for e in self._entries.values() if e.get("evicted")),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "reloads": self.reloads,
+        }
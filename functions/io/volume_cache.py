@@ -0,0 +1,265 @@
+"""디코딩이 끝난 볼륨의 디스크 캐시 (.npy / 비압축 .nii + JSON 메타데이터).
+
+key 는 원본 파일들의 경로 + size + mtime 으로 만들며, 같은 study 를 다시 열면
+DICOM 디코딩이나 gzip inflate 없이 memmap 으로 바로 연다.
+캐시 폴더 전체 크기가 max_bytes 를 넘으면 가장 오래 쓰지 않은 항목부터 지운다.
+(CARROT_VOLUME_CACHE_MB 로 크기 조절, 0 이면 사용 안 함)
+"""
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+import numpy as np
+import nibabel as nib
+from functions.utils.load_file import load_nifti_array
+from functions.utils.tracing import span
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "carrot-viewer", "volumes"
+)
+_FORMAT_VERSION = 2  # 2: DICOM tensor 를 affine 기준 RAS 로 저장
+_ORPHAN_AGE = 24 * 3600  # 메타데이터 없이 남은 데이터 파일 (중단된 쓰기) 정리 기준 (초)
+# image_data 중 캐시에 같이 저장하는 값 (key / folder / source 는 로드 경로로 다시 계산)
+_FIELDS = (
+    "type",
+    "affine",
+    "slope",
+    "inter",
+    "stats",
+    "series_uid",
+    "path_list",
+    "geometry",
+)
+
+
+def cache_budget_bytes(default_mb=10240):
+    try:
+        return int(os.environ.get("CARROT_VOLUME_CACHE_MB", default_mb)) * 1024**2
+    except ValueError:
+        return default_mb * 1024**2
+
+
+def _encode(value):
+    """numpy 값을 JSON 으로 저장 가능한 형태로."""
+    if isinstance(value, np.ndarray):
+        return {"__ndarray__": value.tolist(), "dtype": value.dtype.str}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if "__ndarray__" in value:
+            return np.asarray(value["__ndarray__"], dtype=np.dtype(value["dtype"]))
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+def _encode_header(header):
+    if header is None:
+        return None
+    return {
+        "class": type(header).__name__,
+        "binaryblock": base64.b64encode(header.binaryblock).decode("ascii"),
+    }
+
+
+def _decode_header(data):
+    if data is None:
+        return None
+    header_class = getattr(nib, data["class"], nib.Nifti1Header)
+    return header_class(base64.b64decode(data["binaryblock"]))
+
+
+class VolumeCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = cache_budget_bytes() if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def key(self, kind, paths):
+        """원본 파일들의 (경로, size, mtime) 기준 key. 파일이 바뀌면 다른 key 가 된다."""
+        digest = hashlib.sha1(kind.encode("utf-8"))
+        for path in paths:
+            st = os.stat(path)
+            digest.update(f"|{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def data_path(self, key, suffix=".npy", index=0):
+        return os.path.join(self.cache_dir, f"{key}_{index}{suffix}")
+
+    def _meta_path(self, key):
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def load(self, key):
+        """캐시된 image_data 목록 (tensor 는 memmap) 또는 None.
+
+        메타데이터만 저장된 항목 (원본이 이미 memmap 가능한 .nii) 은 tensor 가 None.
+        """
+        if not self.enabled:
+            return None
+        meta_path = self._meta_path(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("version") != _FORMAT_VERSION:
+            return None
+
+        result = []
+        try:
+            with span("io.cache_load", key=key):
+                for volume in meta["volumes"]:
+                    image_data = {k: _decode(v) for k, v in volume["fields"].items()}
+                    image_data["header"] = _decode_header(volume.get("header"))
+                    image_data["tensor"] = self._open_data(volume.get("data"))
+                    result.append(image_data)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[Warning] Discarding broken volume cache entry {key}: {e}")
+            self.remove(key)
+            return None
+        os.utime(meta_path)  # LRU 기준: 메타데이터 파일의 mtime
+        return result
+
+    def _open_data(self, name):
+        if name is None:
+            return None
+        path = os.path.join(self.cache_dir, name)
+        if path.endswith(".npy"):
+            return np.moveaxis(np.load(path, mmap_mode="r"), 0, -1)
+        return load_nifti_array(path)[0]  # gzip inflate 로 만든 비압축 .nii 사본
+
+    def store(self, key, image_list, data_files=None, write_tensors=True):
+        """image_data 목록을 저장. tensor 를 .npy 로 쓴 경우 memmap 으로 바꾼 목록 반환.
+
+        data_files[i] 가 주어지면 (캐시 폴더 안에 이미 만들어진 파일) tensor 를 새로 쓰지
+        않고 그 파일을 가리킨다. write_tensors=False 면 나머지는 메타데이터만 저장한다.
+        """
+        if not self.enabled:
+            return image_list
+        data_files = data_files or [None] * len(image_list)
+        volumes = []
+        stored = []
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with span("io.cache_store", key=key):
+                for i, (image_data, data_file) in enumerate(zip(image_list, data_files)):
+                    image_data = dict(image_data)
+                    if data_file is None and write_tensors:
+                        path = self.data_path(key, ".npy", i)
+                        tmp = path + ".tmp.npy"
+                        # 마지막 축 (슬라이스) 을 바깥 축으로 저장해야 한 장씩 읽을 때 연속 접근
+                        source = np.moveaxis(image_data["tensor"], -1, 0)
+                        out = np.lib.format.open_memmap(
+                            tmp, mode="w+", dtype=source.dtype, shape=source.shape
+                        )
+                        out[...] = source
+                        out.flush()
+                        del out, source
+                        os.replace(tmp, path)
+                        image_data["tensor"] = self._open_data(os.path.basename(path))
+                        data_file = os.path.basename(path)
+                    elif data_file is not None:
+                        data_file = os.path.basename(data_file)
+                    volumes.append(
+                        {
+                            "data": data_file,
+                            "header": _encode_header(image_data.get("header")),
+                            "fields": {
+                                k: _encode(image_data[k]) for k in _FIELDS if k in image_data
+                            },
+                        }
+                    )
+                    stored.append(image_data)
+                meta_path = self._meta_path(key)
+                with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+                    json.dump({"version": _FORMAT_VERSION, "volumes": volumes}, f)
+                os.replace(meta_path + ".tmp", meta_path)
+        except (OSError, ValueError) as e:
+            print(f"[Warning] Failed to write volume cache: {e}")
+            return image_list
+        self.enforce_budget(protect=key)
+        return stored
+
+    def remove(self, key):
+        for name in self._files_of(key):
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass  # 다른 곳에서 memmap 으로 열려 있으면 (Windows) 다음 정리 때 삭제
+
+    def _files_of(self, key):
+        try:
+            return [n for n in os.listdir(self.cache_dir) if n.startswith(key)]
+        except OSError:
+            return []
+
+    def usage(self):
+        """{key: (마지막 사용 시각, bytes)} 와 메타데이터 없는 파일 목록."""
+        entries = {}
+        orphans = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries, orphans
+        sizes = {}
+        for name in names:
+            try:
+                st = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            sizes[name] = st
+        keys = {n[:-5] for n in sizes if n.endswith(".json")}
+        for name, st in sizes.items():
+            key = name.split("_", 1)[0].split(".", 1)[0]
+            if key in keys:
+                used, total = entries.get(key, (0.0, 0))
+                if name == key + ".json":
+                    used = st.st_mtime
+                entries[key] = (used, total + st.st_size)
+            else:
+                orphans.append((name, st.st_mtime))
+        return entries, orphans
+
+    def enforce_budget(self, protect=None):
+        with self._lock:
+            entries, orphans = self.usage()
+            now = time.time()
+            for name, mtime in orphans:
+                if now - mtime > _ORPHAN_AGE:
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+            total = sum(size for _, size in entries.values())
+            for key, (_, size) in sorted(entries.items(), key=lambda e: e[1][0]):
+                if total <= self.max_bytes:
+                    break
+                if key == protect:
+                    continue
+                self.remove(key)
+                total -= size
+
+
+_default_cache = None
+
+
+def default_volume_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = VolumeCache()
+    return _default_cache
@@ -5,32 +5,81 @@ from nibabel.orientations import (
     apply_orientation,
 )
 import nibabel as nib
+from functions.utils.tracing import span
 import numpy as np
 import os
 
 
+def native_array(img):
+    """scl_slope/inter 를 적용하지 않은 원본 dtype 배열.
+
+    비압축 .nii 는 nibabel 이 memmap 으로 열기 때문에 실제 디스크 읽기는
+    슬라이스에 접근할 때 일어난다. (get_fdata 는 float64 로 전체를 읽음)
+    """
+    dataobj = img.dataobj
+    if hasattr(dataobj, "get_unscaled"):
+        return np.asanyarray(dataobj.get_unscaled())
+    return np.asanyarray(dataobj)
+
+
 def reorient_to_RAS(img):
-    arr = img.get_fdata()
-    orig_ornt = io_orientation(img.affine)  # 현재 방향
+    return reorient_array_to_RAS(native_array(img), img.affine)
+
+
+def reorient_array_to_RAS(arr, affine):
+    orig_ornt = io_orientation(affine)  # 현재 방향
     target_ornt = axcodes2ornt(("R", "A", "S"))  # 이미지 회전
     transform = ornt_transform(orig_ornt, target_ornt)
-    reoriented = apply_orientation(arr, transform)
+    reoriented = apply_orientation(arr, transform)  # flip/transpose view (복사 없음)
     return reoriented
 
 
+def ras_voxel_spacing(affine):
+    """reorient_array_to_RAS 결과의 (x, y, z) 축별 voxel 간격 (mm). affine 이 없으면 1."""
+    if affine is None:
+        return (1.0, 1.0, 1.0)
+    affine = np.asarray(affine, dtype=np.float64)
+    spacing = [1.0, 1.0, 1.0]
+    for input_axis, (ras_axis, _) in enumerate(io_orientation(affine)):
+        if np.isnan(ras_axis) or input_axis >= 3:
+            continue
+        spacing[int(ras_axis)] = float(np.linalg.norm(affine[:3, input_axis])) or 1.0
+    return tuple(spacing)
+
+
+def scaled_header(nii_img):
+    """header 복사본에 원본 scl_slope/inter 를 되돌려 기록.
+
+    nibabel 은 로드 시 header 의 scl_slope/inter 를 비우고 dataobj 로 옮긴다.
+    """
+    header = nii_img.header.copy()
+    slope = getattr(nii_img.dataobj, "slope", 1.0)
+    inter = getattr(nii_img.dataobj, "inter", 0.0)
+    if slope != 1.0 or inter != 0.0:
+        header.set_slope_inter(slope, inter)
+    return header
+
+
+def squeeze_singleton(tensor):
+    """길이 1 인 4번째 축 (혹은 첫 축) 제거."""
+    if tensor.ndim == 4 and tensor.shape[-1] == 1:
+        return np.squeeze(tensor, axis=-1)
+    elif tensor.ndim == 4 and tensor.shape[0] == 1:
+        return np.squeeze(tensor, axis=0)
+    return tensor
+
+
 def load_nifti_array(path: str):
     if not os.path.isfile(path):
         raise FileNotFoundError(f"File does not exist: {path}")
     try:
-        nii_img = nib.load(path)
-        header = nii_img.header
+        with span("io.decode", path=path):
+            nii_img = nib.load(path, mmap=True)
+        header = scaled_header(nii_img)
         affine = nii_img.affine
-        tensor = reorient_to_RAS(nii_img)
-        if tensor.ndim == 4 and tensor.shape[-1] == 1:
-            tensor = np.squeeze(tensor, axis=-1)
-        elif tensor.ndim == 4 and tensor.shape[0] == 1:
-            tensor = np.squeeze(tensor, axis=0)
-        return tensor, header, affine
+        with span("io.reorient"):
+            tensor = reorient_to_RAS(nii_img)
+        return squeeze_singleton(tensor), header, affine
 
     except Exception as e:
         raise RuntimeError(f"Failed to load NIfTI file: {e}")
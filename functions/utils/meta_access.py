@@ -1,30 +1,178 @@
 import os
+import stat
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functions.utils.tracing import span, traced
 
+_HEAD_BYTES = 4096  # 한 번만 읽는 앞부분 (gzip 이면 이 안에서 NIfTI header 까지 inflate)
+_NIFTI1_MAGIC = (b"n+1\x00", b"ni1\x00")
+_NIFTI2_MAGIC = (b"n+2\x00", b"ni2\x00")
+_NOISE_NAMES = {"dicomdir", "thumbs.db", "desktop.ini", "lockfile", "version"}
+_NOISE_EXTENSIONS = (
+    ".txt", ".xml", ".json", ".jpg", ".jpeg", ".png",
+    ".pdf", ".exe", ".ini", ".htm", ".html", ".csv",
+)
+_DICOM_VRS = {
+    b"AE", b"AS", b"AT", b"CS", b"DA", b"DS", b"DT", b"FL", b"FD", b"IS", b"LO",
+    b"LT", b"OB", b"OD", b"OF", b"OL", b"OW", b"PN", b"SH", b"SL", b"SQ", b"SS",
+    b"ST", b"TM", b"UC", b"UI", b"UL", b"UN", b"UR", b"US", b"UT",
+}
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+_SNIFF_CACHE_SIZE = 65536  # 파일별 판별 결과를 기억하는 최대 개수 (LRU)
 
+
+def _sniff_nifti(head):
+    if len(head) >= 348 and head[344:348] in _NIFTI1_MAGIC:
+        return "nifti"
+    if len(head) >= 8 and head[4:8] in _NIFTI2_MAGIC:
+        # NIfTI-2: sizeof_hdr = 540 (endian 무관하게 확인)
+        if 540 in struct.unpack("<i", head[:4]) + struct.unpack(">i", head[:4]):
+            return "nifti"
+    return False
+
+
+def _sniff_dicom(head):
+    if len(head) >= 132 and head[128:132] == b"DICM":
+        return "dicom"
+    # preamble 없는 DICOM: 첫 태그가 (0002,xxxx) 또는 (0008,xxxx) little endian
+    if len(head) >= 8 and head[:2] in (b"\x02\x00", b"\x08\x00"):
+        element = struct.unpack("<H", head[2:4])[0]
+        if head[4:6] in _DICOM_VRS:  # explicit VR
+            return "dicom"
+        length = struct.unpack("<I", head[4:8])[0]
+        if element <= 0x0020 and length < 1024:  # implicit VR, 그럴듯한 길이
+            return "dicom"
+    return False
+
+
+def sniff_bytes(head: bytes):
+    """파일 앞부분 bytes 로 형식 판별. "nifti" / "dicom" / False."""
+    if head[:2] == b"\x1f\x8b":
+        try:
+            # 첫 chunk 만 inflate (파일 전체를 풀지 않음)
+            inflated = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(head, 548)
+        except zlib.error:
+            return False
+        return _sniff_nifti(inflated)
+    return _sniff_nifti(head) or _sniff_dicom(head)
+
+
+@traced("io.sniff")
 def type_checking(path):
     if not os.path.isfile(path):
         return False
 
     try:
         with open(path, "rb") as f:
-            header = f.read(352)
-        nifti_magic = header[344:348]
-        if nifti_magic in [b"n+1\x00", b"ni1\x00"]:
-            return "nifti"
+            head = f.read(_HEAD_BYTES)
+        return sniff_bytes(head)
+    except Exception as e:
+        pass
 
-        elif header.startswith(b"\x1f\x8b"):
-            import gzip
+    return False
 
-            with gzip.open(path, "rb") as f:
-                gz_header = f.read(352)
-                gz_magic = gz_header[344:348]
-                if gz_magic in [b"n+1\x00", b"ni1\x00"]:
-                    return "nifti"
 
-        if header[128:132] == b"DICM":
-            return "dicom"
+def is_noise_file(name: str, size: int):
+    """명백히 영상이 아닌 파일 (숨김 파일, DICOMDIR, 문서 등) 은 열어보지 않음."""
+    lower = name.lower()
+    return (
+        lower.startswith(".")
+        or lower in _NOISE_NAMES
+        or lower.endswith(_NOISE_EXTENSIONS)
+        or size < 132
+    )
 
-    except Exception as e:
-        pass
 
-    return False
+_index_lock = threading.Lock()
+_index_cache = {}  # key: (root, recursive), value: (폴더별 mtime, index)
+_sniff_lock = threading.Lock()
+_sniff_cache = OrderedDict()  # key: path, value: ((mtime_ns, size), 형식). LRU
+
+
+def _scan_tree(root, recursive):
+    """os.scandir 한 번의 순회로 (폴더별 mtime, [(path, mtime_ns, size)]) 수집."""
+    dir_mtimes = {}
+    files = []
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        try:
+            dir_mtimes[folder] = os.stat(folder).st_mtime_ns
+            with os.scandir(folder) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive and not entry.name.startswith("."):
+                                stack.append(entry.path)
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    if stat.S_ISREG(st.st_mode) and not is_noise_file(entry.name, st.st_size):
+                        files.append((entry.path, st.st_mtime_ns, st.st_size))
+        except OSError as e:
+            print(f"[Warning] Failed to scan folder {folder}: {e}")
+    return dir_mtimes, files
+
+
+def _tree_unchanged(dir_mtimes):
+    for folder, mtime in dir_mtimes.items():
+        try:
+            if os.stat(folder).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _sniff_entry(item):
+    path, mtime, size = item
+    with _sniff_lock:
+        cached = _sniff_cache.get(path)
+        if cached is not None and cached[0] == (mtime, size):
+            _sniff_cache.move_to_end(path)
+            return cached[1]
+    try:
+        with open(path, "rb") as f:
+            file_format = sniff_bytes(f.read(_HEAD_BYTES))
+    except OSError:
+        file_format = False
+    with _sniff_lock:
+        _sniff_cache[path] = ((mtime, size), file_format)
+        _sniff_cache.move_to_end(path)
+        while len(_sniff_cache) > _SNIFF_CACHE_SIZE:
+            _sniff_cache.popitem(last=False)
+    return file_format
+
+
+def index_directory(root: str, recursive=True):
+    """폴더 트리의 영상 파일을 형식별로 분류. {"nifti": [...], "dicom": [...]} (정렬됨).
+
+    결과는 폴더 mtime 기준으로 캐시되어, 바뀌지 않은 폴더를 다시 드롭하면
+    디렉터리 stat 만으로 끝난다. 폴더가 바뀌어도 이미 판별한 파일은 다시 열지 않는다.
+    """
+    root = os.path.abspath(root)
+    cache_key = (root, recursive)
+    with _index_lock:
+        cached = _index_cache.get(cache_key)
+    if cached is not None and _tree_unchanged(cached[0]):
+        return {k: list(v) for k, v in cached[1].items()}
+
+    with span("io.index", root=root):
+        dir_mtimes, files = _scan_tree(root, recursive)
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+            formats = list(executor.map(_sniff_entry, files, chunksize=64))
+
+    index = {"nifti": [], "dicom": []}
+    for (path, _, _), file_format in zip(files, formats):
+        if file_format:
+            index[file_format].append(path)
+    for paths in index.values():
+        paths.sort()
+
+    with _index_lock:
+        _index_cache[cache_key] = (dir_mtimes, index)
+    return {k: list(v) for k, v in index.items()}
@@ -0,0 +1,116 @@
+"""hot path 타이밍 span 기록과 Chrome trace (chrome://tracing, Perfetto) 내보내기.
+
+CARROT_TRACE=1 또는 set_enabled(True) 로 켠다. 꺼져 있으면 span() 은
+전역 플래그 확인 후 공유 null context 를 돌려주는 것이 전부다.
+
+    with span("decode", path=path):
+        ...
+
+    @traced("thumbnail")
+    def render_thumbnail(...):
+        ...
+"""
+from collections import deque
+from contextlib import nullcontext
+import functools
+import json
+import os
+import threading
+import time
+
+_enabled = os.environ.get("CARROT_TRACE", "") not in ("", "0")
+_events = deque(maxlen=200_000)  # (name, start_ns, duration_ns, thread_id, args)
+_NULL_SPAN = nullcontext()
+_origin_ns = time.perf_counter_ns()
+
+
+def is_enabled():
+    return _enabled
+
+
+def set_enabled(enabled: bool):
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def clear():
+    _events.clear()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        # deque.append 는 스레드 안전 (워커 스레드에서도 기록)
+        _events.append(
+            (self.name, self.start, end - self.start, threading.get_ident(), self.args)
+        )
+        return False
+
+
+def span(name, **args):
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def traced(name=None):
+    """함수 전체를 span 으로 감싸는 decorator. 꺼져 있으면 플래그 확인만 추가된다."""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def summary():
+    """span 이름별 {count, total_ms, mean_ms, max_ms}."""
+    result = {}
+    for name, _, duration, _, _ in list(_events):
+        entry = result.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        ms = duration / 1e6
+        entry["count"] += 1
+        entry["total_ms"] += ms
+        entry["max_ms"] = max(entry["max_ms"], ms)
+    for entry in result.values():
+        entry["mean_ms"] = entry["total_ms"] / entry["count"]
+    return result
+
+
+def export_chrome_trace(path):
+    """기록된 span 을 Chrome trace event JSON 으로 저장. 저장한 이벤트 수 반환."""
+    pid = os.getpid()
+    trace_events = [
+        {
+            "name": name,
+            "cat": name.split(".")[0],
+            "ph": "X",
+            "ts": (start - _origin_ns) / 1000.0,  # us
+            "dur": duration / 1000.0,
+            "pid": pid,
+            "tid": tid,
+            "args": {k: str(v) for k, v in args.items()},
+        }
+        for name, start, duration, tid, args in list(_events)
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+    return len(trace_events)
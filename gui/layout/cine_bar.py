@@ -0,0 +1,93 @@
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton, QScrollBar, QSpinBox
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+import os
+
+
+def default_cine_fps(default=10):
+    try:
+        return max(1, int(os.environ.get("CARROT_CINE_FPS", default)))
+    except ValueError:
+        return default
+
+
+class CineBar(QWidget):
+    """4D 볼륨의 시간(volume) 축 scrollbar + cine 재생 버튼 + fps 설정."""
+
+    frame_changed = pyqtSignal(int)
+    playing_changed = pyqtSignal(bool)
+
+    def __init__(self, num_frames: int, fps=None, parent=None):
+        super().__init__(parent)
+        self.num_frames = num_frames
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._advance)
+        self._init_ui(fps if fps is not None else default_cine_fps())
+
+    def _init_ui(self, fps):
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(4, 2, 4, 2)
+        layout.setSpacing(4)
+        self.setStyleSheet("background-color: black; color: #ddd;")
+
+        self.play_button = QPushButton("▶")
+        self.play_button.setFixedSize(28, 20)
+        self.play_button.setCheckable(True)
+        self.play_button.toggled.connect(self._on_play_toggled)
+
+        self.scrollbar = QScrollBar(Qt.Horizontal)
+        self.scrollbar.setMinimum(0)
+        self.scrollbar.setMaximum(self.num_frames - 1)
+        self.scrollbar.valueChanged.connect(self._on_scroll)
+
+        self.frame_label = QLabel()
+        self.frame_label.setFixedWidth(70)
+
+        self.fps_box = QSpinBox()
+        self.fps_box.setRange(1, 60)
+        self.fps_box.setValue(fps)
+        self.fps_box.setSuffix(" fps")
+        self.fps_box.valueChanged.connect(self._on_fps_changed)
+        self._on_fps_changed(fps)
+
+        layout.addWidget(self.play_button)
+        layout.addWidget(self.scrollbar)
+        layout.addWidget(self.frame_label)
+        layout.addWidget(self.fps_box)
+        self._update_label(0)
+
+    def current_frame(self):
+        return self.scrollbar.value()
+
+    def is_playing(self):
+        return self._timer.isActive()
+
+    def set_frame(self, frame: int):
+        self.scrollbar.setValue(int(frame) % self.num_frames)
+
+    def play(self):
+        self.play_button.setChecked(True)
+
+    def stop(self):
+        self.play_button.setChecked(False)
+
+    def _on_play_toggled(self, checked):
+        self.play_button.setText("❚❚" if checked else "▶")
+        if checked:
+            self._timer.start()
+        else:
+            self._timer.stop()
+        self.playing_changed.emit(checked)
+
+    def _on_fps_changed(self, fps):
+        self._timer.setInterval(int(round(1000.0 / fps)))
+
+    def _advance(self):
+        self.set_frame(self.current_frame() + 1)  # 마지막 frame 다음은 처음으로
+
+    def _on_scroll(self, frame):
+        self._update_label(frame)
+        self.frame_changed.emit(frame)
+
+    def _update_label(self, frame):
+        self.frame_label.setText(f"t {frame + 1} / {self.num_frames}")
@@ -6,11 +6,12 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap, QImage
+from PyQt5.QtGui import QPixmap
 from gui.layout.image_panel import SliceViewer, InitViewer
 from gui.layout.image_label import LabelContainer
 from gui.layout.tool_box import ToolBox
-import numpy as np
+from gui.render.thumbnail_cache import render_thumbnail
+from functions.utils.tracing import span
 
 from PyQt5.QtWidgets import QLabel
 from PyQt5.QtCore import pyqtSignal, Qt
@@ -155,26 +156,36 @@ class LeftContainer(QWidget):
         layout.addWidget(scroll_area)
         self.setLayout(layout)
 
-    def _add_thumbnail(self, img_array, key, callback):
-        # 1. 정규화 및 QPixmap 생성
-        norm = (img_array - img_array.min()) / (img_array.ptp() + 1e-5) * 255
-        img = norm.astype(np.uint8)
-        h, w = img.shape[:2]
-        qimg = QImage(img.tobytes(), w, h, w, QImage.Format_Grayscale8)
-        pixmap = QPixmap.fromImage(qimg)
-        scaled_pixmap = pixmap.scaled(
-            120, 130, Qt.KeepAspectRatio, Qt.SmoothTransformation
-        )
+    def _add_thumbnail(
+        self, img_array, key, callback, window=None, slope=1.0, inter=0.0
+    ):
+        # 1. 정규화 및 QImage 생성 (window 가 있으면 볼륨 전체 기준 window/level)
+        image = render_thumbnail(img_array, window, slope, inter)
 
         # 2. 썸네일 생성 및 이벤트 연결
+        self.add_thumbnail_image(key, image, callback)
+
+    def add_thumbnail_image(self, key, image, callback):
+        """이미 만들어진 썸네일 QImage 로 추가. image 가 None 이면 로딩 중 표시."""
         thumbnail = ClickableThumbnail(key, QPixmap())  # 먼저 빈 Pixmap으로 초기화
-        thumbnail.setPixmap(scaled_pixmap)  # 이미지는 여기서 설정
         thumbnail.clicked.connect(callback)
+        if image is None:
+            thumbnail.setText("Loading...")
+            thumbnail.setAlignment(Qt.AlignCenter)
+        else:
+            with span("thumbnail.pixmap"):
+                thumbnail.setPixmap(QPixmap.fromImage(image))  # 이미지는 여기서 설정
 
         # 3. 썸네일 표시
         self.scroll_layout.addWidget(thumbnail)
         self.thumbnails[key] = thumbnail
 
+    def set_thumbnail_image(self, key, image):
+        thumbnail = self.thumbnails.get(key)
+        if thumbnail is not None:
+            thumbnail.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+            thumbnail.setPixmap(QPixmap.fromImage(image))
+
     # def _add_thumbnail(self, img_array):  # 썸네일은 min-max normalization
     #     thumbnail = QLabel()
     #     thumbnail.setFixedSize(120, 130)
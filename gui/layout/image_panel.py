@@ -1,7 +1,37 @@
-from PyQt5.QtWidgets import QWidget, QLabel, QScrollBar, QHBoxLayout, QSizePolicy
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QPixmap, QImage
+from PyQt5.QtWidgets import (
+    QWidget,
+    QLabel,
+    QScrollBar,
+    QHBoxLayout,
+    QVBoxLayout,
+    QSizePolicy,
+)
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QPixmap, QPainter, QPen, QColor
+from gui.render.slice_cache import SliceCache
+from gui.render.prefetcher import SlicePrefetcher
+from gui.render.scheduler import RenderScheduler
+from gui.render.frame_buffer import FrameBuffer
+from gui.render.pyramid import VolumePyramid
+from gui.render.display_proxy import DisplayProxy, needs_proxy
+from gui.layout.cine_bar import CineBar
+from gui.layout.slice_fill_bar import SliceFillBar
+from gui.render.slice_renderer import (
+    AXIS_OF_VIEW,
+    placeholder_image,
+    uint8_to_qimage,
+    render_resliced,
+    render_slice,
+    window_slice,
+)
+from functions.common.orientation import display_shape
+from functions.common.reslice import INTERPOLATION_ORDERS, plane_sampler, rotation_matrix
+from functions.common.statistics import sampled_percentiles
+from functions.common.windowing import WINDOW_PRESETS, build_lut, default_window
+from functions.utils.tracing import span
+from collections import deque
 import numpy as np
+import time
 
 
 def load_stylesheet(path):
@@ -25,17 +55,83 @@ class InitViewer(QWidget):
 
 
 class SliceViewer(QWidget):
-    def __init__(self, tensor: np.ndarray, view_type: str):
+    cursor_clicked = pyqtSignal(int, int, int)  # 클릭한 위치의 RAS voxel 좌표
+    index_changed = pyqtSignal(int, int)  # axis, index
+    window_changed = pyqtSignal(float, float)  # width, level
+
+    def __init__(
+        self,
+        tensor: np.ndarray,
+        view_type: str,
+        cache=None,
+        stats=None,
+        slope=1.0,
+        inter=0.0,
+        scheduler=None,
+        show_cine=True,
+        pyramid=None,
+        loading=None,
+        spacing=None,
+        interpolation="linear",
+    ):
         super().__init__()
 
-        self.tensor = tensor
+        if tensor.ndim not in (3, 4):
+            raise ValueError(f"Unsupported tensor shape: {tensor.shape}")
+        # 4D 는 마지막 축이 시간/volume. 화면에는 현재 frame 의 3D view 만 사용
+        self.source = tensor
+        self.num_frames = tensor.shape[3] if tensor.ndim == 4 else 1
+        self.current_frame = 0
+        self.playing = False  # cine 재생 중이면 다음 frame 들을 미리 렌더링
+        self.tensor = self._frame_volume(0)
         self.view_type = view_type
         self.axis = self._get_axis(view_type)  # return 값 0,1,2
         self.num_slices = tensor.shape[self.axis]
         self.current_index = self.num_slices // 2
-        self._init_ui()
+        self.stats = stats  # 로드 시 계산된 볼륨 통계 (min/max/percentile/histogram)
+        self.slope = slope
+        self.inter = inter
+        # RAS 축별 voxel 간격 (mm). 화면 비율과 reslicing 에 사용
+        self.spacing = tuple(float(s) for s in spacing) if spacing is not None else (1.0,) * 3
+        if interpolation not in INTERPOLATION_ORDERS:
+            raise ValueError(f"Unknown interpolation: {interpolation}")
+        self.interpolation = interpolation  # nearest / linear / cubic
+        self.oblique = (0.0, 0.0)  # (yaw, pitch) 도, alt + 좌클릭 드래그로 기울임
+        self.rotation = None  # oblique 회전 행렬, None 이면 축 정렬 평면
+        self._oblique_origin = None  # alt + 좌클릭 드래그 시작점
+        self.window = None  # (width, level), None 이면 슬라이스별 min-max 정규화
+        self.lut = None
+        self._drag_origin = None  # 우클릭 드래그 window/level 조절 시작점
+        self._cursor_drag = False  # 좌클릭 드래그 중 crosshair 이동
+        self.crosshair = None  # (x, y, z) voxel, None 이면 표시 안 함
+        self._pixmap_size = None
+        self.frame_buffer = FrameBuffer()  # GUI 스레드 렌더링용 재사용 버퍼
+        self.cache = cache if cache is not None else SliceCache()
+        self.prefetcher = SlicePrefetcher(self.cache)
+        # 다시 그리기는 scheduler 가 프레임 단위로 모아서 처리
+        self.scheduler = scheduler if scheduler is not None else RenderScheduler(self)
+        self._scroll_direction = 0
+        # 백그라운드에서 채우는 중인 볼륨 (GzipInflater / SeriesDecoder), 다 채워지면 None
+        self.loading = loading
+        # 작은 화면용 LOD (2x, 4x). 4D 는 frame 마다 달라서, 채우는 중인 볼륨은
+        # 덜 채워진 내용으로 만들어지므로 사용하지 않음
+        if pyramid is None and self.num_frames == 1 and loading is None:
+            pyramid = VolumePyramid(self.tensor)
+        self.pyramid = pyramid
+        # coronal / sagittal 용 windowing 된 uint8 사본. 조작이 멈춘 뒤 백그라운드에서 생성
+        self.proxy = None
+        self.zoom = 1.0  # 1.0 = 화면에 맞춤, ctrl+wheel 로 확대
+        self.pan = (0.5, 0.5)  # 보이는 영역 중심 (슬라이스 크기 대비 비율)
+        self._pan_origin = None  # 가운데 버튼 드래그 시작점
+        self.overlay = None  # 성능 overlay (fps, frame ms, cache hit rate, 메모리)
+        self.usage_provider = None  # overlay 용 메모리 사용량 dict 반환 함수 (StudyStore.usage)
+        self.last_frame_ms = 0.0
+        self._frame_stamps = deque(maxlen=60)
+        if stats is not None:
+            self.set_window(*default_window(stats), update=False)
+        self._init_ui(show_cine and self.num_frames > 1)
 
-    def _init_ui(self):
+    def _init_ui(self, show_cine=False):
         layout = QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
@@ -58,50 +154,524 @@ class SliceViewer(QWidget):
         self.scrollbar.setMinimum(0)
         self.scrollbar.setMaximum(self.num_slices - 1)
         self.scrollbar.setValue(self.current_index)
-        self.scrollbar.valueChanged.connect(self._update_slice)
+        self.scrollbar.valueChanged.connect(self._on_scroll)
 
         scroll_layout = QHBoxLayout(self.scroll_container)
         scroll_layout.setContentsMargins(0, 0, 0, 0)
         scroll_layout.setSpacing(2)
+        self.fill_bar = SliceFillBar()
+        scroll_layout.addWidget(self.fill_bar)
         scroll_layout.addWidget(self.scrollbar)
+        self.update_loading()
 
-        layout.addWidget(self.label_container)
+        self.cine_bar = None
+        if show_cine:
+            view_column = QWidget()
+            column_layout = QVBoxLayout(view_column)
+            column_layout.setContentsMargins(0, 0, 0, 0)
+            column_layout.setSpacing(0)
+            self.cine_bar = CineBar(self.num_frames)
+            self.cine_bar.frame_changed.connect(self.set_frame)
+            self.cine_bar.playing_changed.connect(self.set_playing)
+            column_layout.addWidget(self.label_container)
+            column_layout.addWidget(self.cine_bar)
+            layout.addWidget(view_column)
+        else:
+            layout.addWidget(self.label_container)
         layout.addWidget(self.scroll_container)
-        QTimer.singleShot(0, lambda: self._update_slice(self.current_index))
+        self.scheduler.request(self, interactive=False)
+
+    def set_loading(self, loading, tensor=None):
+        """백그라운드 로딩 상태 교체. None (다 채워짐) 이면 LOD 피라미드를 만든다.
+
+        tensor 가 주어지면 같은 내용의 다른 배열 (캐시에 저장한 memmap) 로 원본을 바꾼다.
+        """
+        if tensor is not None and tensor is not self.source:
+            self._replace_source(tensor)
+        self.loading = loading
+        if loading is None and self.pyramid is None and self.num_frames == 1:
+            self.pyramid = VolumePyramid(self.tensor)
+        self.update_loading()
+
+    def _replace_source(self, tensor):
+        """원본 배열 교체. 이전 배열 (메모리의 디코딩 결과) 을 참조하는 것을 남기지 않는다."""
+        previous = self.tensor
+        self.source = tensor
+        self.tensor = self._frame_volume(self.current_frame)
+        proxy = self.proxy
+        if proxy is not None and proxy.ready.is_set() and proxy.tensor is previous:
+            proxy.tensor = self.tensor  # 다 만든 uint8 사본은 내용이 같으므로 그대로 사용
+        else:
+            self._drop_proxy()
+        if self.pyramid is not None and self.pyramid.tensor is previous:
+            self.pyramid = None
+
+    def _drop_proxy(self):
+        if self.proxy is not None:
+            self.proxy.cancel()
+            self.proxy = None
+
+    def _current_proxy(self):
+        """현재 tensor / 축 / window 로 만든 proxy (준비 중일 수 있음) 또는 None."""
+        proxy = self.proxy
+        if proxy is not None and proxy.matches(self.tensor, self.axis, self.window):
+            return proxy
+        return None
+
+    def _ensure_proxy(self):
+        if self.window is None or self.num_frames > 1 or self.loading is not None:
+            return
+        if self._resliced():
+            return  # reslicing 은 원본에서 직접 보간
+        if self._current_proxy() is not None:
+            return
+        self._drop_proxy()  # 예산은 모든 proxy 합이므로 이전 것을 먼저 돌려줌
+        if not needs_proxy(self.tensor, self.axis):
+            return
+        self.proxy = DisplayProxy(
+            self.tensor, self.axis, self.window, self.slope, self.inter, self.lut
+        )
+        self.proxy.start()
+
+    def _ready_mask(self):
+        """현재 축의 슬라이스별 디코딩 완료 여부. 슬라이스 단위로 채우는 로딩이 아니면 None."""
+        loading = self.loading
+        if loading is None or loading.ready is None or loading.slice_axis != self.axis:
+            return None
+        return loading.ready
+
+    def update_loading(self):
+        """scrollbar 옆 진행 막대 갱신 (채우는 중인 축에서만 표시)."""
+        mask = self._ready_mask()
+        self.fill_bar.setVisible(mask is not None)
+        self.fill_bar.set_mask(mask)
+
+    def _frame_volume(self, frame):
+        # memmap 기반이면 view 만 만들고 실제 읽기는 렌더링할 슬라이스에서만 일어난다
+        return self.source[..., frame] if self.source.ndim == 4 else self.source
+
+    def set_frame(self, frame, update=True):
+        """4D 볼륨의 표시 frame 변경."""
+        frame = int(frame) % self.num_frames
+        if frame == self.current_frame:
+            return
+        self.current_frame = frame
+        self.tensor = self._frame_volume(frame)
+        if self.cine_bar is not None and self.cine_bar.current_frame() != frame:
+            self.cine_bar.blockSignals(True)
+            self.cine_bar.set_frame(frame)
+            self.cine_bar.blockSignals(False)
+        if update:
+            self.scheduler.request(self)
+
+    def set_playing(self, playing: bool):
+        self.playing = playing
 
     def _get_axis(self, view_type):
-        return {"axial": 2, "coronal": 1, "sagittal": 0}[view_type]
+        if view_type not in AXIS_OF_VIEW:
+            raise ValueError("Invalid view type")
+        return AXIS_OF_VIEW[view_type]
 
-    def _update_slice(self, index=None):
-        if index is not None:
-            self.current_index = index
-        img = (
-            (self.tensor[:, :, self.current_index])
-            if self.view_type == "axial"
-            else (
-                (self.tensor[:, self.current_index, :])
-                if self.view_type == "coronal"
-                else (
-                    (self.tensor[self.current_index, :, :])
-                    if self.view_type == "sagittal"
-                    else (_ for _ in ()).throw(ValueError("Invalid view type"))
+    def set_window(self, width, level, update=True):
+        self.window = (float(width), float(level))
+        # 원본 값 → uint8 테이블은 window 가 바뀔 때만 다시 만든다
+        self.lut = build_lut(self.tensor.dtype, width, level, self.slope, self.inter)
+        self._drop_proxy()  # 다른 window 로 만든 proxy 는 더 이상 쓸 수 없음
+        if update:
+            self.scheduler.request(self)
+
+    def set_window_preset(self, name: str, update=True):
+        if name == "auto":
+            if self.stats is not None:
+                self.set_window(*default_window(self.stats), update=update)
+            else:
+                # 통계가 없는 볼륨 (로드 중 등) 은 표본 histogram 의 percentile 로 추정
+                p_low, p_high = sampled_percentiles(self.tensor)
+                p_low, p_high = sorted([p_low * self.slope + self.inter, p_high * self.slope + self.inter])
+                self.set_window(
+                    *default_window({"p_low": p_low, "p_high": p_high}), update=update
                 )
+        elif name in WINDOW_PRESETS:
+            self.set_window(*WINDOW_PRESETS[name], update=update)
+        else:
+            raise ValueError(f"Unknown window preset: {name}")
+
+    def set_index(self, index, update=True):
+        """scrollbar 시그널 없이 슬라이스 위치만 변경 (MPR 연동용)."""
+        index = int(np.clip(index, 0, self.num_slices - 1))
+        self.scrollbar.blockSignals(True)
+        self.scrollbar.setValue(index)
+        self.scrollbar.blockSignals(False)
+        self.current_index = index
+        if update:
+            self.scheduler.request(self)
+
+    def _plane_axes(self):
+        # 화면 가로 = 첫 번째 남은 축 (반전), 세로 = 두 번째 남은 축 (반전)
+        return [ax for ax in range(3) if ax != self.axis]
+
+    def _aspect(self):
+        """화면 가로/세로 한 픽셀의 간격 (mm). 등방성이면 None (기존 픽셀 비율 그대로)."""
+        a_axis, b_axis = self._plane_axes()
+        aspect = (self.spacing[a_axis], self.spacing[b_axis])
+        return None if aspect[0] == aspect[1] else aspect
+
+    def _resliced(self):
+        """Qt 스케일링 대신 numpy reslicer 로 그려야 하는지 (cubic 또는 oblique 평면)."""
+        return self.rotation is not None or self.interpolation == "cubic"
+
+    def set_interpolation(self, interpolation, update=True):
+        if interpolation not in INTERPOLATION_ORDERS:
+            raise ValueError(f"Unknown interpolation: {interpolation}")
+        self.interpolation = interpolation
+        if self._resliced():
+            self._drop_proxy()
+        if update:
+            self.scheduler.request(self)
+
+    def set_oblique(self, yaw, pitch, update=True):
+        """현재 축 평면을 화면 세로축 (yaw) / 가로축 (pitch) 기준으로 기울임 (도).
+
+        백그라운드 로딩 중에는 기울이지 않는다. 기울어진 평면은 아직 디코딩되지 않은
+        슬라이스를 지나가는데, ready mask 는 현재 축의 한 장 기준이라 빈 띠를 가릴 수 없다.
+        """
+        if self.loading is not None:
+            yaw, pitch = 0.0, 0.0
+        yaw, pitch = float(np.clip(yaw, -89.0, 89.0)), float(np.clip(pitch, -89.0, 89.0))
+        self.oblique = (yaw, pitch)
+        self.rotation = None if yaw == 0.0 and pitch == 0.0 else rotation_matrix(yaw, pitch)
+        if update:
+            self.scheduler.request(self)
+
+    def _oblique_sampler(self):
+        """현재 화면 (pixmap) 과 같은 geometry 의 PlaneSampler."""
+        pw, ph = self._pixmap_size
+        return plane_sampler(
+            self.tensor.shape, self.spacing, self.axis, self.rotation, (ph, pw), self._crop_rect()
+        )
+
+    def _crop_rect(self):
+        """확대 시 보이는 영역 (원본 해상도 화면 좌표 x0, y0, x1, y1). 확대 안 했으면 None."""
+        if self.zoom <= 1.0:
+            return None
+        rows, cols = display_shape(self.tensor.shape, self.axis)
+        cw = max(1, int(round(cols / self.zoom)))
+        ch = max(1, int(round(rows / self.zoom)))
+        x0 = int(np.clip(round(self.pan[0] * cols - cw / 2.0), 0, cols - cw))
+        y0 = int(np.clip(round(self.pan[1] * rows - ch / 2.0), 0, rows - ch))
+        return (x0, y0, x0 + cw, y0 + ch)
+
+    def _visible_rect(self):
+        crop = self._crop_rect()
+        if crop is not None:
+            return crop
+        rows, cols = display_shape(self.tensor.shape, self.axis)
+        return (0, 0, cols, rows)
+
+    def _label_offset(self, pos):
+        """위젯 좌표 → pixmap 안의 좌표 (pixmap 은 label 가운데 정렬)."""
+        pos = self.label.mapFrom(self, pos)
+        pw, ph = self._pixmap_size
+        return (
+            pos.x() - (self.label.width() - pw) / 2.0,
+            pos.y() - (self.label.height() - ph) / 2.0,
+        )
+
+    def set_zoom(self, zoom, anchor=None):
+        """zoom 배율 변경. anchor (위젯 좌표) 가 있으면 그 위치의 점이 화면에서 고정된다."""
+        zoom = float(np.clip(zoom, 1.0, 16.0))
+        if zoom == 1.0:
+            self.zoom, self.pan = 1.0, (0.5, 0.5)
+            self.scheduler.request(self)
+            return
+        rows, cols = display_shape(self.tensor.shape, self.axis)
+        x0, y0, x1, y1 = self._visible_rect()
+        fx, fy = 0.5, 0.5
+        if anchor is not None and self._pixmap_size is not None:
+            px, py = self._label_offset(anchor)
+            fx = float(np.clip(px / max(self._pixmap_size[0], 1), 0.0, 1.0))
+            fy = float(np.clip(py / max(self._pixmap_size[1], 1), 0.0, 1.0))
+        # anchor 아래의 점 (원본 좌표) 이 새 영역에서도 같은 비율 위치에 오도록
+        point_x, point_y = x0 + fx * (x1 - x0), y0 + fy * (y1 - y0)
+        new_w, new_h = cols / zoom, rows / zoom
+        self.zoom = zoom
+        self.pan = (
+            (point_x - fx * new_w + new_w / 2.0) / cols,
+            (point_y - fy * new_h + new_h / 2.0) / rows,
+        )
+        self.scheduler.request(self)
+
+    def _label_to_voxel(self, pos):
+        """위젯 좌표 → RAS voxel (x, y, z). 이미지 밖이면 None."""
+        if self._pixmap_size is None:
+            return None
+        px, py = self._label_offset(pos)
+        pw, ph = self._pixmap_size
+        x0, y0, x1, y1 = self._visible_rect()
+        a_axis, b_axis = self._plane_axes()
+        a_len, b_len = self.tensor.shape[a_axis], self.tensor.shape[b_axis]
+        col = x0 + int(px * (x1 - x0) / max(pw, 1))
+        row = y0 + int(py * (y1 - y0) / max(ph, 1))
+        if not (x0 <= col < x1 and y0 <= row < y1) or px < 0 or py < 0:
+            return None
+        if self.rotation is not None:
+            # oblique 평면은 출력 픽셀의 샘플링 좌표에서 가장 가까운 voxel
+            sampler = self._oblique_sampler()
+            row, col = min(int(py), ph - 1), min(int(px), pw - 1)
+            return sampler.voxel_at(row, col, sampler.offset_of(self.current_index))
+        voxel = [0, 0, 0]
+        voxel[self.axis] = self.current_index
+        voxel[a_axis] = a_len - 1 - col
+        voxel[b_axis] = b_len - 1 - row
+        return voxel
+
+    def _draw_crosshair(self, pixmap):
+        a_axis, b_axis = self._plane_axes()
+        a_len, b_len = self.tensor.shape[a_axis], self.tensor.shape[b_axis]
+        x0, y0, x1, y1 = self._visible_rect()
+        x = (a_len - 1 - self.crosshair[a_axis] + 0.5 - x0) * pixmap.width() / (x1 - x0)
+        y = (b_len - 1 - self.crosshair[b_axis] + 0.5 - y0) * pixmap.height() / (y1 - y0)
+        painter = QPainter(pixmap)
+        painter.setPen(QPen(QColor(255, 200, 0, 180), 1))
+        painter.drawLine(int(x), 0, int(x), pixmap.height())
+        painter.drawLine(0, int(y), pixmap.width(), int(y))
+        painter.end()
+
+    def _on_scroll(self, index):
+        direction = index - self.current_index
+        if direction:
+            self._scroll_direction = direction
+            self.current_index = index
+            self.index_changed.emit(self.axis, index)
+            if self._ready_mask() is not None:
+                self.loading.prioritize(index)  # 보고 있는 위치부터 디코딩
+        self.scheduler.request(self)
+
+    def _update_slice(self, index=None, fast=False):
+        """현재 슬라이스를 즉시 렌더링. 일반적으로는 scheduler 를 통해 호출된다."""
+        start = time.perf_counter()
+        with span("render.frame", view=self.view_type, fast=fast):
+            self._render_current(index, fast)
+        now = time.perf_counter()
+        self.last_frame_ms = (now - start) * 1000.0
+        self._frame_stamps.append(now)
+        if self.overlay is not None and self.overlay.isVisible():
+            self._update_overlay()
+
+    def _render_current(self, index, fast):
+        if index is not None and index != self.current_index:
+            self._scroll_direction = index - self.current_index
+            self.current_index = index
+        direction = self._scroll_direction
+
+        size = self.label.size()
+        key_for, render_for = self._render_functions(size)
+        key = key_for(self.current_index)
+        image = self.cache.get(key) if key is not None else None
+        render = render_for
+        if image is None and fast and key is not None:
+            # 조작 중에는 smooth 결과가 없으면 빠른 미리보기로 대체
+            fast_key_for, render = self._render_functions(size, fast=True)
+            key = fast_key_for(self.current_index)
+            image = self.cache.get(key)
+        if image is None:
+            image = render(self.current_index, self.frame_buffer)
+            if key is not None:
+                self.cache.put(key, image)
+        pixmap = QPixmap.fromImage(image)
+        self._pixmap_size = (pixmap.width(), pixmap.height())
+        if not fast:
+            self._ensure_proxy()  # 조작이 멈춘 뒤에만 만들어 W/L 드래그 중 재생성을 피함
+        if self.crosshair is not None and self.rotation is None:
+            self._draw_crosshair(pixmap)  # 캐시 원본이 아닌 화면용 pixmap 에만 그림
+        self.label.setPixmap(pixmap)
+
+        if self.playing:
+            # cine 재생 중에는 같은 슬라이스의 다음 frame 들을 미리 읽어 렌더링 (read-ahead)
+            frame_key_for, frame_render_for = self._frame_functions(size)
+            self.prefetcher.request(
+                self.current_frame,
+                1,
+                self.num_frames,
+                frame_key_for,
+                frame_render_for,
+                wrap=True,
             )
+            return
+
+        # 스크롤 방향(기본은 다음 슬라이스)으로 이웃 슬라이스 미리 렌더링
+        self.prefetcher.request(
+            self.current_index, direction, self.num_slices, key_for, render_for
         )
-        img = np.rot90(np.flip(img, axis=0))
 
-        pixmap = self._numpy_to_pixmap(img)
-        scaled = pixmap.scaled(
-            self.label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation
+    def _render_functions(self, size, fast=False):
+        # 워커 스레드에서도 쓰이므로 self 대신 현재 값을 캡처
+        tensor, axis, window, lut = self.tensor, self.axis, self.window, self.lut
+        slope, inter, frame = self.slope, self.inter, self.current_frame
+        crop, pyramid, ready = self._crop_rect(), self.pyramid, self._ready_mask()
+        proxy = self._current_proxy()
+        spacing, rotation, aspect = self.spacing, self.rotation, self._aspect()
+        resliced, interpolation = self._resliced(), self.interpolation
+        # 조작 중 미리보기는 nearest 로 샘플링
+        order = 0 if fast else INTERPOLATION_ORDERS[interpolation]
+        size_key = (
+            size.width(),
+            size.height(),
+            "fast" if fast else "smooth",
+            crop,
+            interpolation,
+            self.oblique if rotation is not None else None,
+        )
+        smooth = not fast and interpolation != "nearest"
+        transform = Qt.SmoothTransformation if smooth else Qt.FastTransformation
+
+        def key_for(index):
+            if ready is not None and not ready[index]:
+                return None  # placeholder 는 캐시하지 않음 (디코딩 후 같은 key 로 실제 슬라이스)
+            return (axis, index, window, size_key, frame)
+
+        def render_for(index, buffer=None):
+            if ready is not None and not ready[index]:
+                return placeholder_image(
+                    display_shape(tensor.shape, axis, crop), size, aspect=aspect
+                )
+            if resliced:
+                return render_resliced(
+                    tensor,
+                    axis,
+                    index,
+                    size,
+                    spacing,
+                    rotation,
+                    order,
+                    window,
+                    slope,
+                    inter,
+                    lut,
+                    buffer=buffer,
+                    crop=crop,
+                )
+            return render_slice(
+                tensor,
+                axis,
+                index,
+                size,
+                window,
+                slope,
+                inter,
+                lut,
+                transform=transform,
+                buffer=buffer,
+                crop=crop,
+                pyramid=pyramid,
+                proxy=proxy,
+                aspect=aspect,
+            )
+
+        return key_for, render_for
+
+    def _frame_functions(self, size):
+        """현재 슬라이스 위치에서 frame 을 바꿔가며 렌더링하는 (key_for, render_for)."""
+        source, axis, index = self.source, self.axis, self.current_index
+        window, lut, slope, inter = self.window, self.lut, self.slope, self.inter
+        crop, spacing, rotation = self._crop_rect(), self.spacing, self.rotation
+        aspect, resliced, interpolation = self._aspect(), self._resliced(), self.interpolation
+        size_key = (
+            size.width(),
+            size.height(),
+            "smooth",
+            crop,
+            interpolation,
+            self.oblique if rotation is not None else None,
         )
-        self.label.setPixmap(scaled)
+        transform = (
+            Qt.FastTransformation if interpolation == "nearest" else Qt.SmoothTransformation
+        )
+
+        def key_for(frame):
+            return (axis, index, window, size_key, frame)
+
+        def render_for(frame, buffer=None):
+            if resliced:
+                return render_resliced(
+                    source[..., frame],
+                    axis,
+                    index,
+                    size,
+                    spacing,
+                    rotation,
+                    INTERPOLATION_ORDERS[interpolation],
+                    window,
+                    slope,
+                    inter,
+                    lut,
+                    buffer=buffer,
+                    crop=crop,
+                )
+            return render_slice(
+                source[..., frame],
+                axis,
+                index,
+                size,
+                window,
+                slope,
+                inter,
+                lut,
+                transform=transform,
+                buffer=buffer,
+                crop=crop,
+                aspect=aspect,
+            )
+
+        return key_for, render_for
 
     def _numpy_to_pixmap(self, arr):
-        norm = (arr - arr.min()) / (arr.ptp() + 1e-5) * 255
-        img = norm.astype(np.uint8)
-        h, w = img.shape
-        qimg = QImage(img.tobytes(), w, h, w, QImage.Format_Grayscale8)
-        return QPixmap.fromImage(qimg)
+        window, lut = self.window, self.lut
+        with span("render.normalize"):
+            img = window_slice(arr, window, self.slope, self.inter, lut, self.frame_buffer)
+        with span("render.qimage"):
+            return QPixmap.fromImage(uint8_to_qimage(img))  # fromImage 에서 한 번만 복사
+
+    def set_overlay(self, enabled: bool, usage_provider=None):
+        """좌상단 성능 overlay 표시 여부. usage_provider 는 resident_bytes 를 담은 dict 반환."""
+        if usage_provider is not None:
+            self.usage_provider = usage_provider
+        if self.overlay is None:
+            if not enabled:
+                return
+            self.overlay = QLabel(self.label_container)
+            self.overlay.setAttribute(Qt.WA_TransparentForMouseEvents, True)
+            self.overlay.setStyleSheet(
+                "background-color: rgba(0, 0, 0, 160); color: rgb(120, 255, 120);"
+                "font-family: monospace; font-size: 10px; padding: 2px;"
+            )
+            self.overlay.move(4, 4)
+        self.overlay.setVisible(enabled)
+        if enabled:
+            self._update_overlay()
+            self.overlay.raise_()
+
+    def _fps(self):
+        stamps = self._frame_stamps
+        if len(stamps) < 2:
+            return 0.0
+        # 1초 이상 멈춰 있었으면 마지막 조작 구간만 계산되도록 최근 프레임만 사용
+        recent = [t for t in stamps if stamps[-1] - t <= 1.0]
+        if len(recent) < 2:
+            return 0.0
+        return (len(recent) - 1) / (recent[-1] - recent[0])
+
+    def _update_overlay(self):
+        lines = [
+            f"fps {self._fps():5.1f}",
+            f"frame {self.last_frame_ms:6.2f} ms",
+            f"cache hit {self.cache.hit_rate() * 100:5.1f} %",
+        ]
+        if self.usage_provider is not None:
+            resident = self.usage_provider().get("resident_bytes", 0)
+            lines.append(f"resident {resident / 1024**2:7.1f} MB")
+        self.overlay.setText("\n".join(lines))
+        self.overlay.adjustSize()
 
     def _set_view_type(self, view_type: str):
         if view_type not in ["axial", "coronal", "sagittal"]:
@@ -111,27 +681,98 @@ class SliceViewer(QWidget):
         self.axis = self._get_axis(view_type)
         self.num_slices = self.tensor.shape[self.axis]
         self.current_index = self.num_slices // 2
+        self._drop_proxy()
+        self.set_oblique(0.0, 0.0, update=False)  # 기울기는 축 평면 기준이라 초기화
 
-        self.label.repaint()  # 즉시 다시 그림
+        self._scroll_direction = 0
 
-        try:
-            self.scrollbar.valueChanged.disconnect(self._update_slice)
-        except TypeError:
-            pass
+        self.scrollbar.blockSignals(True)
         self.scrollbar.setMaximum(self.num_slices - 1)
         self.scrollbar.setValue(self.current_index)
-        self.scrollbar.valueChanged.connect(self._update_slice)
+        self.scrollbar.blockSignals(False)
+        self.update_loading()
 
         # 이미지 업데이트
-        self._update_slice(self.current_index)
+        self.scheduler.request(self, interactive=False)
 
     def wheelEvent(self, event):
         delta = event.angleDelta().y()
+        if event.modifiers() & Qt.ControlModifier:
+            # ctrl + wheel: 커서 위치 기준 확대/축소
+            if delta:
+                self.set_zoom(self.zoom * (1.25 if delta > 0 else 0.8), event.pos())
+            return
         if delta > 0 and self.current_index > 0:
             self.scrollbar.setValue(self.current_index - 1)
         elif delta < 0 and self.current_index < self.num_slices - 1:
             self.scrollbar.setValue(self.current_index + 1)
 
+    def mousePressEvent(self, event):
+        if event.button() == Qt.RightButton and self.window is not None:
+            self._drag_origin = (event.pos(), self.window)
+        elif event.button() == Qt.LeftButton and event.modifiers() & Qt.AltModifier:
+            self._oblique_origin = (event.pos(), self.oblique)
+        elif event.button() == Qt.LeftButton:
+            self._cursor_drag = True
+            self._emit_cursor(event.pos())
+        elif event.button() == Qt.MiddleButton and self.zoom > 1.0:
+            self._pan_origin = (event.pos(), self.pan, self._visible_rect())
+        else:
+            super().mousePressEvent(event)
+
+    def _emit_cursor(self, pos):
+        voxel = self._label_to_voxel(pos)
+        if voxel is not None:
+            self.cursor_clicked.emit(*voxel)
+
+    def mouseDoubleClickEvent(self, event):
+        if event.button() == Qt.LeftButton and event.modifiers() & Qt.AltModifier:
+            self.set_oblique(0.0, 0.0)  # alt + 더블클릭: 축 정렬 평면으로 복귀
+            return
+        super().mouseDoubleClickEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._cursor_drag:
+            return self._emit_cursor(event.pos())
+        if self._oblique_origin is not None:
+            origin, (yaw, pitch) = self._oblique_origin
+            delta = event.pos() - origin
+            # 화면 4 px = 1 도. 가로 드래그 = yaw, 세로 드래그 = pitch
+            self.set_oblique(yaw + delta.x() / 4.0, pitch + delta.y() / 4.0)
+            return
+        if self._pan_origin is not None and self._pixmap_size is not None:
+            origin, (pan_x, pan_y), (x0, y0, x1, y1) = self._pan_origin
+            delta = event.pos() - origin
+            rows, cols = display_shape(self.tensor.shape, self.axis)
+            # 화면 px → 원본 px → 슬라이스 비율 (드래그 방향으로 이미지가 따라 움직임)
+            self.pan = (
+                pan_x - delta.x() * (x1 - x0) / max(self._pixmap_size[0], 1) / cols,
+                pan_y - delta.y() * (y1 - y0) / max(self._pixmap_size[1], 1) / rows,
+            )
+            self.scheduler.request(self)
+            return
+        if self._drag_origin is None:
+            return super().mouseMoveEvent(event)
+        origin, (width, level) = self._drag_origin
+        delta = event.pos() - origin
+        # 볼륨 값 범위 기준 감도: 화면 512 px 드래그 = 전체 범위
+        value_range = (
+            self.stats["max"] - self.stats["min"] if self.stats is not None else width
+        )
+        step = max(value_range, 1.0) / 512.0
+        self.set_window(max(width + delta.x() * step, 1.0), level + delta.y() * step)
+        self.window_changed.emit(*self.window)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.RightButton:
+            self._drag_origin = None
+        elif event.button() == Qt.LeftButton:
+            self._cursor_drag = False
+            self._oblique_origin = None
+        elif event.button() == Qt.MiddleButton:
+            self._pan_origin = None
+        super().mouseReleaseEvent(event)
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        self._update_slice(self.current_index)
+        self.scheduler.request(self)  # 드래그 리사이즈 중에는 프레임당 한 번만
@@ -0,0 +1,60 @@
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLabel, QProgressBar, QPushButton
+from PyQt5.QtCore import Qt, pyqtSignal
+import os
+
+
+class LoadStatus(QWidget):
+    """로딩 중인 항목별 진행률 표시 + 취소 버튼 (상태 표시줄에 배치)."""
+
+    cancel_requested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.bars = {}  # key: path, value: QProgressBar
+        self._init_ui()
+        self.setVisible(False)
+
+    def _init_ui(self):
+        self.layout = QHBoxLayout(self)
+        self.layout.setContentsMargins(4, 0, 4, 0)
+        self.layout.setSpacing(4)
+        self.layout.setAlignment(Qt.AlignRight)
+
+        self.summary = QLabel()
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setFixedHeight(18)
+        self.cancel_button.clicked.connect(self.cancel_requested.emit)
+
+        self.layout.addWidget(self.summary)
+        self.layout.addWidget(self.cancel_button)
+
+    def add_item(self, path: str):
+        if path in self.bars:
+            return
+        bar = QProgressBar()
+        bar.setFixedSize(140, 16)
+        bar.setRange(0, 0)  # 시작 전에는 busy 표시
+        bar.setFormat(f"{os.path.basename(path) or path} %p%")
+        bar.setToolTip(path)
+        self.layout.insertWidget(self.layout.count() - 2, bar)
+        self.bars[path] = bar
+        self._refresh()
+
+    def update_item(self, path: str, done: int, total: int):
+        bar = self.bars.get(path)
+        if bar is None:
+            return
+        bar.setRange(0, max(total, 1))
+        bar.setValue(done)
+
+    def remove_item(self, path: str):
+        bar = self.bars.pop(path, None)
+        if bar is not None:
+            self.layout.removeWidget(bar)
+            bar.deleteLater()
+        self._refresh()
+
+    def _refresh(self):
+        count = len(self.bars)
+        self.summary.setText(f"Loading {count} item(s)")
+        self.setVisible(count > 0)
@@ -1,13 +1,52 @@
-from PyQt5.QtWidgets import QMenuBar
-
-
-class MenuBar(QMenuBar):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self._create_menus()
-
-    def _create_menus(self):
-        file_menu = self.addMenu("File")
-        edit_menu = self.addMenu("Edit")
-        tool_menu = self.addMenu("Tools")
-        help_menu = self.addMenu("Help")
+from PyQt5.QtWidgets import QMenuBar, QActionGroup
+from PyQt5.QtCore import pyqtSignal
+from functions.common.windowing import WINDOW_PRESETS
+from functions.utils.tracing import is_enabled
+
+
+class MenuBar(QMenuBar):
+    window_preset_selected = pyqtSignal(str)
+    tracing_toggled = pyqtSignal(bool)
+    overlay_toggled = pyqtSignal(bool)
+    trace_export_requested = pyqtSignal()
+    lazy_series_toggled = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._create_menus()
+
+    def _create_menus(self):
+        file_menu = self.addMenu("File")
+        edit_menu = self.addMenu("Edit")
+        tool_menu = self.addMenu("Tools")
+        help_menu = self.addMenu("Help")
+
+        # Window/Level preset (우클릭 드래그로도 조절 가능)
+        window_menu = tool_menu.addMenu("Window / Level")
+        window_group = QActionGroup(self)
+        for name in ["auto"] + list(WINDOW_PRESETS):
+            action = window_menu.addAction(name.capitalize())
+            action.setCheckable(True)
+            action.setChecked(name == "auto")
+            window_group.addAction(action)
+            action.triggered.connect(
+                lambda _, name=name: self.window_preset_selected.emit(name)
+            )
+
+        # DICOM 폴더: 헤더와 대표 슬라이스만 읽고 시리즈는 선택할 때 디코딩
+        lazy_action = file_menu.addAction("Decode Series on Demand")
+        lazy_action.setCheckable(True)
+        lazy_action.setChecked(True)
+        lazy_action.toggled.connect(self.lazy_series_toggled.emit)
+
+        # 성능 계측 (CARROT_TRACE=1 로 시작 시부터 기록)
+        perf_menu = tool_menu.addMenu("Performance")
+        trace_action = perf_menu.addAction("Record Trace")
+        trace_action.setCheckable(True)
+        trace_action.setChecked(is_enabled())
+        trace_action.toggled.connect(self.tracing_toggled.emit)
+        overlay_action = perf_menu.addAction("Show Overlay")
+        overlay_action.setCheckable(True)
+        overlay_action.toggled.connect(self.overlay_toggled.emit)
+        export_action = perf_menu.addAction("Export Trace...")
+        export_action.triggered.connect(lambda: self.trace_export_requested.emit())
@@ -0,0 +1,160 @@
+from PyQt5.QtWidgets import QWidget, QGridLayout, QLabel
+from PyQt5.QtCore import Qt
+from gui.layout.image_panel import SliceViewer
+from gui.layout.cine_bar import CineBar
+from gui.render.slice_cache import SliceCache
+from gui.render.scheduler import RenderScheduler
+from gui.render.pyramid import VolumePyramid
+import numpy as np
+
+
+class MprViewer(QWidget):
+    """2x2 MPR 레이아웃: axial / coronal / sagittal + 정보 패널.
+
+    세 뷰어는 같은 tensor 참조와 SliceCache, RenderScheduler, LOD 피라미드를 공유하고,
+    crosshair 는 한 번의 렌더 프레임으로 모든 패널에 반영된다.
+    """
+
+    def __init__(
+        self,
+        tensor: np.ndarray,
+        stats=None,
+        slope=1.0,
+        inter=0.0,
+        scheduler=None,
+        loading=None,
+        spacing=None,
+        interpolation="linear",
+    ):
+        super().__init__()
+        self.tensor = tensor
+        self.slope = slope
+        self.inter = inter
+        self.spacing = spacing  # RAS voxel 간격 (mm), 패널마다 화면 비율 보정
+        self.interpolation = interpolation
+        self.cache = SliceCache()  # 세 패널 공용 (key 에 axis 포함)
+        self.scheduler = scheduler if scheduler is not None else RenderScheduler(self)
+        self.scheduler.frame_rendered.connect(self._update_info)
+        self.cursor = [n // 2 for n in tensor.shape[:3]]
+        # 채우는 중인 볼륨은 다 채워진 뒤 (set_loading(None)) 에 피라미드 생성
+        self.pyramid = VolumePyramid(tensor) if tensor.ndim == 3 and loading is None else None
+        self._init_ui(stats, loading)
+
+    def _init_ui(self, stats, loading=None):
+        layout = QGridLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(2)
+        self.setStyleSheet("background-color: rgb(40, 40, 40);")
+
+        self.viewers = []
+        for view_type, (row, col) in [
+            ("axial", (0, 0)),
+            ("coronal", (0, 1)),
+            ("sagittal", (1, 0)),
+        ]:
+            viewer = SliceViewer(
+                self.tensor,
+                view_type,
+                cache=self.cache,
+                stats=stats,
+                slope=self.slope,
+                inter=self.inter,
+                scheduler=self.scheduler,
+                show_cine=False,  # 4D 는 아래의 공용 CineBar 로 세 패널을 같이 움직임
+                pyramid=self.pyramid,
+                loading=loading,
+                spacing=self.spacing,
+                interpolation=self.interpolation,
+            )
+            viewer.crosshair = self.cursor
+            viewer.set_index(self.cursor[viewer.axis], update=False)
+            viewer.cursor_clicked.connect(self._on_cursor_clicked)
+            viewer.index_changed.connect(self._on_index_changed)
+            viewer.window_changed.connect(self._on_window_changed)
+            layout.addWidget(viewer, row, col)
+            self.viewers.append(viewer)
+
+        self.info_label = QLabel()
+        self.info_label.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        self.info_label.setStyleSheet("background-color: black; color: #ddd; padding: 6px;")
+        layout.addWidget(self.info_label, 1, 1)
+
+        self.cine_bar = None
+        if self.tensor.ndim == 4:
+            self.cine_bar = CineBar(self.tensor.shape[3])
+            self.cine_bar.frame_changed.connect(self._on_frame_changed)
+            self.cine_bar.playing_changed.connect(self._on_playing_changed)
+            layout.addWidget(self.cine_bar, 2, 0, 1, 2)
+        self._update_info()
+
+    def _on_frame_changed(self, frame):
+        for viewer in self.viewers:
+            viewer.set_frame(frame, update=False)
+        self._schedule_render(self.viewers)
+
+    def _on_playing_changed(self, playing):
+        for viewer in self.viewers:
+            viewer.set_playing(playing)
+
+    def _schedule_render(self, viewers):
+        # 여러 패널의 변경을 모아 다음 프레임에 한 번만 그림
+        for viewer in viewers:
+            self.scheduler.request(viewer)
+
+    def _on_cursor_clicked(self, x, y, z):
+        self.cursor[:] = [x, y, z]
+        for viewer in self.viewers:
+            viewer.set_index(self.cursor[viewer.axis], update=False)
+        self._schedule_render(self.viewers)
+
+    def _on_index_changed(self, axis, index):
+        # 스크롤한 패널은 이미 그려졌으므로 나머지 패널의 crosshair 만 갱신
+        self.cursor[axis] = index
+        self._schedule_render([v for v in self.viewers if v.axis != axis])
+
+    def _on_window_changed(self, width, level):
+        for viewer in self.viewers:
+            if viewer.window != (width, level):
+                viewer.set_window(width, level, update=False)
+        self._schedule_render(self.viewers)
+
+    def set_loading(self, loading, tensor=None):
+        """세 패널의 백그라운드 로딩 상태 교체. 다 채워지면 공용 피라미드를 만든다.
+
+        tensor 가 주어지면 세 패널의 원본을 그 배열 (캐시에 저장한 memmap) 로 바꾼다.
+        """
+        if tensor is not None and tensor is not self.tensor:
+            self.tensor = tensor
+            self.pyramid = None
+            for viewer in self.viewers:
+                viewer.set_loading(viewer.loading, tensor)
+        if loading is None and self.pyramid is None and self.tensor.ndim == 3:
+            self.pyramid = VolumePyramid(self.tensor)
+            for viewer in self.viewers:
+                viewer.pyramid = self.pyramid
+        for viewer in self.viewers:
+            viewer.set_loading(loading)
+
+    def set_interpolation(self, interpolation):
+        self.interpolation = interpolation
+        for viewer in self.viewers:
+            viewer.set_interpolation(interpolation, update=False)
+        self._schedule_render(self.viewers)
+
+    def set_window_preset(self, name: str):
+        for viewer in self.viewers:
+            viewer.set_window_preset(name, update=False)
+        self._schedule_render(self.viewers)
+
+    def _update_info(self, *_):
+        x, y, z = self.cursor
+        frame = self.viewers[0].current_frame
+        value = self.viewers[0].tensor[x, y, z]  # 현재 frame 기준
+        value = float(value) * self.slope + self.inter
+        text = f"x: {x}  y: {y}  z: {z}\nvalue: {value:.1f}"
+        if self.tensor.ndim == 4:
+            text += f"\nt: {frame + 1} / {self.tensor.shape[3]}"
+        window = self.viewers[0].window
+        if window is not None:
+            text += f"\nW: {window[0]:.0f}  L: {window[1]:.0f}"
+        self.info_label.setText(text)
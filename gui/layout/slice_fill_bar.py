@@ -0,0 +1,30 @@
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtGui import QPainter, QColor
+import numpy as np
+
+
+class SliceFillBar(QWidget):
+    """scrollbar 옆의 얇은 막대. 디코딩이 끝난 슬라이스 구간을 위에서부터 (index 0) 표시."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.mask = None  # 슬라이스별 bool (True = 표시 가능)
+        self.setFixedWidth(4)
+        self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Expanding)
+
+    def set_mask(self, mask):
+        self.mask = None if mask is None else np.array(mask, dtype=bool)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(60, 60, 60))
+        if self.mask is not None and self.mask.size:
+            # 연속 구간 (run) 단위로 그려서 슬라이스 수와 무관하게 사각형 몇 개로 끝남
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], self.mask.view(np.int8), [0]))))
+            scale = self.height() / self.mask.size
+            color = QColor(90, 170, 90)
+            for start, stop in zip(edges[::2], edges[1::2]):
+                top = int(start * scale)
+                painter.fillRect(0, top, self.width(), max(1, int(stop * scale) - top), color)
+        painter.end()
@@ -34,6 +34,7 @@ class ClickableLabel(QLabel):
 
 class ToolBox(QWidget):
     view_changed = pyqtSignal(str)
+    interpolation_changed = pyqtSignal(str)  # nearest / linear / cubic
 
     def __init__(self, view_type="axial"):
         super().__init__()
@@ -62,6 +63,7 @@ class ToolBox(QWidget):
         self.info_container = DropDownContainer(json_path="gui/layout/dropdown.json")
         self.icon_container = IconContainer(view_type=self.view_type)
         self.icon_container.view_changed.connect(self._on_view_type_changed)
+        self.icon_container.interpolation_changed.connect(self.interpolation_changed.emit)
 
         self.menu_container.setFixedWidth(130)
         self.info_container.setFixedWidth(338)
@@ -88,10 +90,15 @@ class ToolBox(QWidget):
 
 class IconContainer(QWidget):
     view_changed = pyqtSignal(str)
+    interpolation_changed = pyqtSignal(str)
+
+    # interpolation 아이콘을 누를 때마다 순서대로 바뀜
+    INTERPOLATIONS = ["linear", "cubic", "nearest"]
 
     def __init__(self, view_type="axial"):
         super().__init__()
         self.view_type = view_type
+        self.interpolation = "linear"
         self.labels = []
         self._init_ui()
 
@@ -136,6 +143,7 @@ class IconContainer(QWidget):
             self.labels.append(label)
             layout.addWidget(label, i, j)
 
+        self.labels[0].setToolTip(f"Interpolation: {self.interpolation}")
         self._highlight_selected_icon(self.view_type)
 
     def _highlight_selected_icon(self, view_type):
@@ -167,13 +175,20 @@ class IconContainer(QWidget):
             label.style().polish(label)
 
     def _on_icon_clicked(self, index):
-        if index not in [4, 5, 6]:
+        if index == 0:
+            modes = self.INTERPOLATIONS
+            self.interpolation = modes[(modes.index(self.interpolation) + 1) % len(modes)]
+            self.labels[0].setToolTip(f"Interpolation: {self.interpolation}")
+            self.interpolation_changed.emit(self.interpolation)
+            return
+        if index not in [4, 5, 6, 7]:
             return
 
         view_type_map = {
             4: "axial",
             5: "sagittal",
             6: "coronal",
+            7: "grid",
         }
 
         new_view_type = view_type_map.get(index)
@@ -182,7 +197,7 @@ class IconContainer(QWidget):
 
         self.view_type = new_view_type
 
-        for i in range(4, 7):
+        for i in range(4, 8):
             self.labels[i].setProperty("selected", False)
         self.labels[index].setProperty("selected", True)
 
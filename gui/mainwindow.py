@@ -1,30 +1,69 @@
-from PyQt5.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QSizePolicy
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QMainWindow,
+    QWidget,
+    QHBoxLayout,
+    QVBoxLayout,
+    QSizePolicy,
+    QLabel,
+    QFileDialog,
+)
+from PyQt5.QtCore import Qt, QTimer
 from gui.layout.image_panel import SliceViewer
+from gui.layout.mpr_panel import MprViewer
 from gui.layout.containers import LeftContainer, RightContainer
 from gui.layout.image_label import LabelContainer
 from gui.layout.tool_box import ToolBox
 from gui.layout.menus import MenuBar
+from gui.layout.load_status import LoadStatus
+from gui.worker.load_worker import VolumeLoader
+from gui.render.scheduler import RenderScheduler
+from gui.render.thumbnail_cache import ThumbnailCache, thumbnail_slice
+from functions.io.study_store import StudyStore
+from functions.io.file_loader import start_series
+from functions.utils.load_file import ras_voxel_spacing
+from functions.utils import tracing
 from PyQt5.QtGui import QIcon
-import numpy as np
-from functions.io.file_loader import load_nifty, load_dicom
 import os
 
 
+def memory_budget_bytes(default_mb=4096):
+    try:
+        return int(os.environ.get("CARROT_MEMORY_BUDGET_MB", default_mb)) * 1024**2
+    except ValueError:
+        return default_mb * 1024**2
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.view_type = "axial"  # view type / default="axial"
-        self.setMenuBar(MenuBar(self))  # 메뉴 바 설정
+        self.menu_bar = MenuBar(self)
+        self.setMenuBar(self.menu_bar)  # 메뉴 바 설정
         self._init_ui()  # ui 셋업
         self.setAcceptDrops(True)  # drag & drop 허용
         self.study_dicts = {}  # 로드된 이미지 저장
         # local 파라미터
         self.view_type = "axial"
         self.interp_check = True
-        self.study_dicts = {}  # key: path, value: {tensor, header, affine, folder}
+        self.interp_type = "linear"  # 슬라이스 보간 (nearest / linear / cubic)
+        # key: path, value: {tensor, header, affine, folder, ...}
+        # 메모리 예산을 넘으면 오래 안 본 tensor 부터 내려놓음 (CARROT_MEMORY_BUDGET_MB)
+        self.study_dicts = StudyStore(max_bytes=memory_budget_bytes())
         self.label_groups = {}  # key: folder path, value: list of file paths
         self.label_containers = {}  # key: folder path, value: LabelContainer instance
+        self.show_overlay = False  # 뷰어 성능 overlay 표시 여부
+        self.current_key = None  # 현재 뷰어에 표시 중인 study key
+        self.current_folder = None  # 현재 LeftContainer 에 표시 중인 폴더
+        self._pending_sources = {}  # key: 드롭 경로, value: 캐시 썸네일로 먼저 표시한 key 목록
+        # key: 백그라운드로 채워지는 study (.nii.gz inflate, progressive DICOM),
+        # value: 마지막으로 확인한 진행 값
+        self._loading = {}
+        self._loading_timer = QTimer(self)
+        self._loading_timer.setInterval(100)
+        self._loading_timer.timeout.connect(self._poll_loading)
+        self.thumbnail_cache = ThumbnailCache(self)
+        self.thumbnail_cache.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self._init_loader()
 
     def _init_ui(self):
         self.setWindowTitle("Carrot Viewer")
@@ -64,19 +103,101 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(content_container)
         self.setCentralWidget(self.main_container)
         self.tool_container.view_changed.connect(self._update_view_type)
+        self.tool_container.interpolation_changed.connect(self._update_interp_type)
+        self.menu_bar.window_preset_selected.connect(self._update_window_preset)
+        self.menu_bar.tracing_toggled.connect(tracing.set_enabled)
+        self.menu_bar.overlay_toggled.connect(self._update_overlay)
+        self.menu_bar.trace_export_requested.connect(self._export_trace)
+        self.menu_bar.lazy_series_toggled.connect(self._update_lazy_series)
+
+        self.load_status = LoadStatus()  # 로딩 진행률 (상태 표시줄)
+        self.statusBar().addPermanentWidget(self.load_status)
+
+        # 모든 뷰어의 다시 그리기를 프레임 단위로 모으는 scheduler
+        self.render_scheduler = RenderScheduler(self)
+        self.frame_label = QLabel()
+        self.statusBar().addWidget(self.frame_label)
+        self.render_scheduler.frame_rendered.connect(self._update_frame_label)
+
+    def _update_frame_label(self, ms):
+        usage = self.study_dicts.usage()
+        self.frame_label.setText(
+            f"render {ms:.1f} ms | memory {usage['resident_bytes'] / 1024**2:.0f}"
+            f" / {usage['budget_bytes'] / 1024**2:.0f} MB"
+        )
+
+    def _init_loader(self):
+        # 드롭된 파일/폴더는 백그라운드 스레드 풀에서 디코딩
+        self.loader = VolumeLoader(self)
+        self.loader.signals.started.connect(self._on_load_started)
+        self.loader.signals.progress.connect(self.load_status.update_item)
+        self.loader.signals.loaded.connect(self._on_volume_loaded)
+        self.loader.signals.failed.connect(self._on_load_failed)
+        self.loader.signals.cancelled.connect(self.load_status.remove_item)
+        self.loader.signals.cancelled.connect(self._drop_pending)
+        self.load_status.cancel_requested.connect(self.loader.cancel)
+
+    def _update_lazy_series(self, enabled):
+        self.loader.lazy_series = enabled
 
     def _update_view_type(self, view_type):
         self.view_type = view_type
         viewer = self.right_container.slice_container
-        if isinstance(viewer, SliceViewer):
+        if view_type == "grid" or isinstance(viewer, MprViewer):
+            # 단일 뷰 ↔ MPR 전환은 뷰어 자체를 교체
+            if self.current_key is not None:
+                self._on_thumbnail_clicked(self.current_key)
+        elif isinstance(viewer, SliceViewer):
             viewer._set_view_type(view_type)
 
+    def _update_window_preset(self, name):
+        viewer = self.right_container.slice_container
+        if isinstance(viewer, (SliceViewer, MprViewer)):
+            viewer.set_window_preset(name)
+
+    def _slice_viewers(self, viewer=None):
+        viewer = viewer if viewer is not None else self.right_container.slice_container
+        if isinstance(viewer, SliceViewer):
+            return [viewer]
+        if isinstance(viewer, MprViewer):
+            return list(viewer.viewers)
+        return []
+
+    def _update_overlay(self, enabled):
+        self.show_overlay = enabled
+        for viewer in self._slice_viewers():
+            viewer.set_overlay(enabled, self.study_dicts.usage)
+
+    def _export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Trace", "carrot-trace.json", "Chrome Trace (*.json)"
+        )
+        if not path:
+            return
+        try:
+            count = tracing.export_chrome_trace(path)
+            print(f"[Info] Exported {count} trace events to {path}")
+        except OSError as e:
+            print(f"[Error] Failed to export trace: {e}")
+
     def _update_interp_type(self, interp_type):
         self.interp_type = interp_type
+        viewer = self.right_container.slice_container
+        if isinstance(viewer, (SliceViewer, MprViewer)):
+            viewer.set_interpolation(interp_type)
 
     def _update_viewer_instance(self, instance):
         grid_layout = self.right_container.grid_container.layout()
         old_viewer = self.right_container.slice_container
+        if isinstance(old_viewer, SliceViewer):
+            old_viewer.prefetcher.cancel()  # 이전 뷰어의 대기 중인 prefetch 제거
+            self.render_scheduler.discard(old_viewer)
+        elif isinstance(old_viewer, MprViewer):
+            for viewer in old_viewer.viewers:
+                viewer.prefetcher.cancel()
+                self.render_scheduler.discard(viewer)
+        for viewer in self._slice_viewers(instance):
+            viewer.set_overlay(self.show_overlay, self.study_dicts.usage)
         grid_layout.addWidget(instance)
         grid_layout.removeWidget(old_viewer)
         old_viewer.deleteLater()
@@ -84,16 +205,7 @@ class MainWindow(QMainWindow):
         self.right_container.slice_container = instance
 
     def _update_thmbnail_box(self, img_tensor):
-        ndim = img_tensor.ndim
-        if ndim == 2:
-            img_thmb = img_tensor
-        else:
-            slicing = [slice(None)] * 2
-            slicing.append(img_tensor.shape[2] // 2)
-            slicing += [0] * (ndim - len(slicing))
-            img_thmb = img_tensor[tuple(slicing)]
-        img_thmb = np.rot90(np.flip(img_thmb, axis=0))
-        self.left_container._add_thumbnail(img_thmb)
+        self.left_container._add_thumbnail(thumbnail_slice(img_tensor))
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -135,85 +247,233 @@ class MainWindow(QMainWindow):
 
         for url in urls:
             path = url.toLocalFile()
-            try:
-                if os.path.isfile(path):
-                    # --- NIfTI 처리 ---
-                    image_data = load_nifty(path)
-                    key = path
-                    folder = image_data["folder"]
-
-                    self.study_dicts[key] = image_data
-                    self.label_groups.setdefault(folder, []).append(key)
-
-                    if folder not in self.label_containers:
-                        label = LabelContainer()
-                        label.add_folder_button(folder, callback=self._on_label_clicked)
-                        self.label_containers[folder] = label
-                        self.right_container.label_container.layout.addWidget(label)
-
-                    self._on_label_clicked(folder)
-                    self._on_thumbnail_clicked(key)
-
-                elif os.path.isdir(path):
-                    # --- DICOM 처리 ---
-                    image_list = load_dicom(path)
-                    for image_data in image_list:
-                        key = image_data["key"]
-                        folder = image_data["folder"]
-
-                        self.study_dicts[key] = image_data
-                        self.label_groups.setdefault(folder, []).append(key)
-
-                        if folder not in self.label_containers:
-                            label = LabelContainer()
-                            label.add_folder_button(
-                                folder, callback=self._on_label_clicked
-                            )
-                            self.label_containers[folder] = label
-                            self.right_container.label_container.layout.addWidget(label)
-
-                        self._on_label_clicked(folder)
-                        self._on_thumbnail_clicked(key)
-
-                else:
-                    raise ValueError("Invalid drop item: not a file or directory.")
-
-            except Exception as e:
-                print(f"[Error] Failed to load image: {e}")
+            self._show_cached_thumbnails(path)
+            self.load_status.add_item(path)
+            self.loader.submit(path)
+
+    def _show_cached_thumbnails(self, path):
+        # 전에 열어본 원본이면 볼륨 로딩 전에 디스크 캐시 썸네일부터 표시
+        cached = self.thumbnail_cache.lookup_source(path)
+        folders = []
+        for key, folder, _ in cached:
+            if key in self.study_dicts:
                 continue
+            self.study_dicts[key] = {"key": key, "folder": folder, "pending": True}
+            self.label_groups.setdefault(folder, []).append(key)
+            self._pending_sources.setdefault(path, []).append(key)
+            self._ensure_label(folder)
+            folders.append(folder)
+        if folders:
+            self._on_label_clicked(folders[-1])
+
+    def _drop_pending(self, path):
+        # 로딩 실패/취소 또는 로딩 후에도 남은 placeholder 제거
+        removed = False
+        for key in self._pending_sources.pop(path, []):
+            item = self.study_dicts.get(key)
+            if item is not None and item.get("pending"):
+                del self.study_dicts[key]
+                self.label_groups[item["folder"]].remove(key)
+                removed = True
+        if removed and self.current_folder is not None:
+            self._on_label_clicked(self.current_folder)
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Escape and self.loader.is_busy():
+            self.loader.cancel()  # ESC 로 진행 중인 로딩 취소
+        else:
+            super().keyPressEvent(event)
+
+    def _on_load_started(self, path):
+        self.load_status.update_item(path, 0, 0)
+
+    def _on_load_failed(self, path, message):
+        self.load_status.remove_item(path)
+        self._drop_pending(path)
+        print(f"[Error] Failed to load image: {message}")
+
+    def _on_volume_loaded(self, path, image_list):
+        self.load_status.remove_item(path)
+        try:
+            for image_data in image_list:
+                self._register_study(image_data)
+            self._drop_pending(path)
+
+            if image_list:
+                likely = self._likely_series([d["key"] for d in image_list])
+                self._on_label_clicked(self.study_dicts[likely]["folder"], show_first=False)
+                self._on_thumbnail_clicked(likely)
+        except Exception as e:
+            print(f"[Error] Failed to load image: {e}")
 
-    def _on_label_clicked(self, folder: str):
+    def _register_study(self, image_data):
+        key = image_data["key"]
+        folder = image_data["folder"]
+
+        if key not in self.study_dicts:
+            self.label_groups.setdefault(folder, []).append(key)
+        self.study_dicts[key] = image_data
+        self._ensure_label(folder)
+
+        loading = image_data.get("loading")
+        if loading is not None and not loading.done.is_set():
+            # 다 채워진 뒤에 썸네일 생성 (그 전에는 뷰어만 점진적으로 갱신)
+            self._loading[key] = -1
+            self._loading_timer.start()
+            return
+
+        # 썸네일은 폴더 클릭 전에 워커에서 미리 생성
+        self.thumbnail_cache.request(key, image_data)
+
+    def _likely_series(self, keys):
+        """keys 중 먼저 보여줄 study. DICOM 은 슬라이스가 가장 많은 series (localizer 등 제외)."""
+        # 같으면 뒤쪽 (기존: 마지막으로 로드된 study 표시)
+        return max(reversed(keys), key=lambda k: len(self.study_dicts[k].get("path_list", ())))
+
+    def _prefetch_likely(self, folder):
+        """같은 폴더에서 다음으로 열 가능성이 큰 디코딩 전 series 를 미리 디코딩.
+
+        메모리 예산을 넘기게 되면 미리 풀지 않는다.
+        """
+        deferred = [
+            k for k in self.label_groups.get(folder, []) if self.study_dicts[k].get("deferred")
+        ]
+        if not deferred:
+            return
+        key = self._likely_series(deferred)
+        item = self.study_dicts[key]
+        needed = item["deferred"]["nbytes"]
+        if self.study_dicts.resident_total() + needed > self.study_dicts.max_bytes:
+            return
+        start_series(item)
+        self._register_study(item)
+
+    def _poll_loading(self):
+        for key, last_done in list(self._loading.items()):
+            entry = self.study_dicts.get(key)
+            loading = entry.get("loading") if entry is not None else None
+            if loading is None:
+                del self._loading[key]
+                continue
+            finished = loading.done.is_set()
+            done = loading.progress()[0]
+            if finished:
+                self._adopt_stored_tensor(key, entry)
+            if key == self.current_key and (finished or done != last_done):
+                self._refresh_loading_viewer(entry, finished)
+            self._loading[key] = done
+            if finished:
+                del self._loading[key]
+                entry.pop("loading", None)
+                if loading.error is None:
+                    self.thumbnail_cache.request(key, entry)
+                    if key == self.current_key:
+                        self._prefetch_likely(entry["folder"])  # 보고 있던 series 가 끝난 뒤에
+        if not self._loading:
+            self._loading_timer.stop()
+
+    def _adopt_stored_tensor(self, key, entry):
+        """디코딩이 끝나 캐시에 저장된 시리즈는 메모리의 볼륨을 memmap 으로 교체.
+
+        StudyStore 의 점유 bytes 도 다시 계산한다 (memmap 은 0). 뷰어는 이어서
+        _refresh_loading_viewer 가 entry["tensor"] 로 바꾼다.
+        """
+        stored = entry.pop("stored_tensor", None)
+        if stored is None:
+            return
+        entry["tensor"] = stored
+        self.study_dicts[key] = entry
+
+    def _refresh_loading_viewer(self, entry, finished):
+        container = self.right_container.slice_container
+        if finished and isinstance(container, (SliceViewer, MprViewer)):
+            container.set_loading(None, entry["tensor"])
+        for viewer in self._slice_viewers():
+            viewer.cache.clear()  # 아직 덜 채워진 상태로 그려진 슬라이스 폐기
+            viewer.update_loading()
+            if finished and viewer.stats is None and entry.get("stats") is not None:
+                viewer.stats = entry["stats"]
+                viewer.set_window_preset("auto", update=False)
+            self.render_scheduler.request(viewer, interactive=False)
+
+    def _ensure_label(self, folder):
+        if folder not in self.label_containers:
+            label = LabelContainer()
+            label.add_folder_button(folder, callback=self._on_label_clicked)
+            self.label_containers[folder] = label
+            self.right_container.label_container.layout.addWidget(label)
+
+    def _on_label_clicked(self, folder: str, show_first=True):
         self.left_container.clear()
+        self.current_folder = folder
 
         paths = self.label_groups.get(folder, [])
         for path in paths:
-            img_tensor = self.study_dicts[path]["tensor"]
-            thumbnail_img = self._safe_extract_slice(img_tensor)
-            self.left_container._add_thumbnail(
-                thumbnail_img,
-                key=path,
+            # 캐시에 없으면 placeholder 로 먼저 추가하고 생성되면 교체
+            self.left_container.add_thumbnail_image(
+                path,
+                self.thumbnail_cache.get(path),
                 callback=lambda key=path: self._on_thumbnail_clicked(key),
             )
 
-        if paths:
-            self._on_thumbnail_clicked(paths[0])  # 가장 앞에 있는 이미지 자동 표시
+        loaded = [
+            p
+            for p in paths
+            if not self.study_dicts[p].get("pending")
+            and not self.study_dicts.is_evicted(p)
+        ]
+        if show_first and loaded:
+            # 이미 디코딩된 가장 앞의 이미지, 없으면 가장 가능성 큰 series 자동 표시
+            decoded = [p for p in loaded if not self.study_dicts[p].get("deferred")]
+            self._on_thumbnail_clicked(decoded[0] if decoded else self._likely_series(loaded))
+
+    def _on_thumbnail_ready(self, key, image):
+        self.left_container.set_thumbnail_image(key, image)
 
     def _safe_extract_slice(self, img_tensor):
-        if img_tensor.ndim == 2:
-            return np.rot90(np.flip(img_tensor, axis=0))
-        elif img_tensor.ndim == 3:
-            index = img_tensor.shape[2] // 2
-            return np.rot90(np.flip(img_tensor[:, :, index], axis=0))
-        else:
-            raise ValueError("Invalid tensor shape")
+        return thumbnail_slice(img_tensor)
 
     def _on_thumbnail_clicked(self, key: str):
-        if key in self.study_dicts:
-            item = self.study_dicts[key]
-            tensor = item["tensor"]
-            instance = SliceViewer(tensor, self.view_type)
-            self._update_viewer_instance(instance)
-
-            # 선택 상태 표시
-            for path, thumb in self.left_container.thumbnails.items():
-                thumb.set_selected(path == key)
+        if key not in self.study_dicts or self.study_dicts[key].get("pending"):
+            return
+        item = self.study_dicts.open(key)
+        if item is None:
+            # 메모리 예산 때문에 내려간 study 는 백그라운드에서 다시 로드 후 표시
+            self.load_status.add_item(key)
+            self.loader.submit(key, load_fn=lambda: [self.study_dicts.reload(key)])
+            return
+        if item.get("deferred"):
+            # 헤더만 인덱싱된 series: 선택했을 때 볼륨 할당 + 백그라운드 디코딩 시작
+            start_series(item)
+            self._register_study(item)
+
+        tensor = item["tensor"]
+        if self.view_type == "grid":
+            instance = MprViewer(
+                tensor,
+                stats=item.get("stats"),
+                slope=item.get("slope", 1.0),
+                inter=item.get("inter", 0.0),
+                scheduler=self.render_scheduler,
+                loading=item.get("loading"),
+                spacing=ras_voxel_spacing(item.get("affine")),
+                interpolation=self.interp_type,
+            )
+        else:
+            instance = SliceViewer(
+                tensor,
+                self.view_type,
+                stats=item.get("stats"),
+                slope=item.get("slope", 1.0),
+                inter=item.get("inter", 0.0),
+                scheduler=self.render_scheduler,
+                loading=item.get("loading"),
+                spacing=ras_voxel_spacing(item.get("affine")),
+                interpolation=self.interp_type,
+            )
+        self._update_viewer_instance(instance)
+        self.current_key = key
+
+        # 선택 상태 표시
+        for path, thumb in self.left_container.thumbnails.items():
+            thumb.set_selected(path == key)
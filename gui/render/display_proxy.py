@@ -0,0 +1,124 @@
+"""coronal / sagittal 스크롤용 windowing 된 uint8 사본 (축별 display proxy).
+
+RAS 텐서에서 coronal / sagittal 한 장은 저장 순서와 어긋난 strided gather 라 느리다.
+proxy 는 window 를 적용한 uint8 볼륨을 proxy[index] 가 곧 화면 방향 슬라이스가 되도록
+(C-contiguous) 저장하므로, 이후 한 장은 연속 메모리 그대로 QImage 로 감쌀 수 있다.
+원본은 저장 순서 (가장 큰 stride 축) 로 chunk 씩 읽어 백그라운드에서 채운다.
+CARROT_PROXY_MB 예산은 살아 있는 모든 proxy (MPR 의 coronal + sagittal 등) 의 합 기준이다.
+"""
+import os
+import threading
+import weakref
+import numpy as np
+from functions.common.windowing import lut_scratch_dtype, window_into
+from functions.utils.tracing import span
+
+
+def proxy_budget_bytes(default_mb=1024):
+    try:
+        return int(os.environ.get("CARROT_PROXY_MB", default_mb)) * 1024**2
+    except ValueError:
+        return default_mb * 1024**2
+
+
+_live_bytes = 0  # 살아 있는 proxy 들의 uint8 사본 크기 합
+_live_lock = threading.Lock()
+
+
+def proxy_bytes():
+    with _live_lock:
+        return _live_bytes
+
+
+def _reserve(nbytes):
+    global _live_bytes
+    with _live_lock:
+        _live_bytes += nbytes
+
+
+def needs_proxy(tensor, axis, budget_bytes=None):
+    """axis 방향 슬라이스가 저장 순서상 연속이 아니고 uint8 사본이 (이미 있는 proxy 들과
+    합쳐서) 예산 안에 들어가는지."""
+    if tensor.ndim != 3:
+        return False
+    budget_bytes = proxy_budget_bytes() if budget_bytes is None else budget_bytes
+    if tensor.size > budget_bytes - proxy_bytes():
+        return False
+    strides = [abs(s) for s in tensor.strides]
+    return strides[axis] != max(strides)
+
+
+class DisplayProxy:
+    """tensor 의 axis 방향 슬라이스를 window (width, level) 로 변환해 둔 uint8 볼륨.
+
+    ready 가 set 되기 전에는 plane() 이 None 을 반환하므로 호출자는 원본 경로로 그린다.
+    window 가 바뀌면 새로 만들어야 한다 (matches 로 확인).
+    사본 크기는 만들 때 전체 예산에 잡히고 cancel 또는 GC 될 때 돌려준다.
+    """
+
+    def __init__(self, tensor, axis, window, slope=1.0, inter=0.0, lut=None, chunk_slices=16):
+        self.tensor = tensor
+        self.axis = axis
+        self.window = window
+        self.slope = slope
+        self.inter = inter
+        self.lut = lut
+        self.chunk_slices = chunk_slices
+        a_axis, b_axis = [ax for ax in range(3) if ax != axis]
+        # proxy[i] 는 display_plane(tensor, axis, i) 와 같은 (rows, cols) = (b, a) 화면 방향
+        self.data = np.empty(
+            (tensor.shape[axis], tensor.shape[b_axis], tensor.shape[a_axis]), dtype=np.uint8
+        )
+        # 같은 메모리를 RAS 순서 (x, y, z) 로 보는 view: 채울 때는 원본과 같은 index 로 기록
+        self.ras = np.moveaxis(self.data.transpose(0, 2, 1)[:, ::-1, ::-1], 0, axis)
+        _reserve(self.data.nbytes)
+        self._release = weakref.finalize(self, _reserve, -self.data.nbytes)
+        self.ready = threading.Event()
+        self._cancelled = False
+        self._thread = None
+
+    def matches(self, tensor, axis, window):
+        return self.tensor is tensor and self.axis == axis and self.window == window
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._build, daemon=True)
+            self._thread.start()
+
+    def cancel(self):
+        self._cancelled = True
+        self._release()  # 한 번만 돌려줌 (이후 GC 때는 호출되지 않음)
+
+    def wait(self, timeout=None):
+        return self.ready.wait(timeout)
+
+    def plane(self, index):
+        """화면 방향 uint8 슬라이스 (연속 메모리) 또는 아직 준비 안 됐으면 None."""
+        if not self.ready.is_set():
+            return None
+        return self.data[index]
+
+    def _build(self):
+        tensor = self.tensor
+        # 원본에서 가장 연속적인 (stride 가 가장 큰) 축으로 잘라야 chunk 읽기가 순차 접근
+        storage_axis = int(np.argmax([abs(s) for s in tensor.strides]))
+        width, level = self.window
+        try:
+            with span("render.proxy", axis=self.axis):
+                for start in range(0, tensor.shape[storage_axis], self.chunk_slices):
+                    if self._cancelled:
+                        return
+                    slicing = [slice(None)] * 3
+                    slicing[storage_axis] = slice(start, start + self.chunk_slices)
+                    slicing = tuple(slicing)
+                    chunk = tensor[slicing]
+                    out = np.empty(chunk.shape, dtype=np.uint8)
+                    scratch = np.empty(chunk.shape, dtype=lut_scratch_dtype(self.lut))
+                    window_into(
+                        chunk, out, width, level, self.slope, self.inter, self.lut, scratch
+                    )
+                    self.ras[slicing] = out
+        except Exception as e:
+            print(f"[Warning] Failed to build display proxy: {e}")
+            return
+        self.ready.set()
@@ -0,0 +1,22 @@
+import numpy as np
+
+
+class FrameBuffer:
+    """렌더링용 재사용 버퍼 (dtype 별 1개). 더 큰 크기가 필요할 때만 다시 할당.
+
+    반환되는 배열은 C-contiguous 이며 numpy 기본 정렬(>= 16 byte)을 따른다.
+    """
+
+    def __init__(self):
+        self._pool = {}  # key: dtype, value: 1D array
+        self.allocations = 0
+
+    def array(self, dtype, shape):
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape))
+        flat = self._pool.get(dtype)
+        if flat is None or flat.size < size:
+            flat = np.empty(size, dtype=dtype)
+            self._pool[dtype] = flat
+            self.allocations += 1
+        return flat[:size].reshape(shape)
@@ -0,0 +1,69 @@
+from PyQt5.QtCore import QRunnable, QThreadPool
+import threading
+
+
+class PrefetchTask(QRunnable):
+    def __init__(self, prefetcher, key, render):
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.key = key
+        self.render = render
+
+    def run(self):
+        try:
+            if self.key not in self.prefetcher.cache:
+                self.prefetcher.cache.put(self.key, self.render())
+        except Exception as e:
+            print(f"[Warning] Prefetch failed for {self.key}: {e}")
+        finally:
+            self.prefetcher._done(self.key)
+
+
+class SlicePrefetcher:
+    """스크롤 방향으로 이웃 슬라이스를 워커 스레드에서 미리 렌더링."""
+
+    def __init__(self, cache, depth=8, max_workers=2):
+        self.cache = cache
+        self.depth = depth
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_workers)
+        self._queued = set()
+        self._lock = threading.Lock()
+
+    def request(self, index, direction, num_slices, key_for, render_for, wrap=False):
+        """key_for(i) → 캐시 key (None 이면 캐시하지 않는 슬라이스), render_for(i) → QImage
+        (워커 스레드에서 실행).
+
+        wrap 이면 끝에서 처음으로 이어서 예약 (cine 반복 재생).
+        """
+        # 이전 방향의 대기 작업은 버리고 새 방향 기준으로 다시 예약
+        self.pool.clear()
+        with self._lock:
+            self._queued.clear()
+
+        step = -1 if direction < 0 else 1
+        for offset in range(1, self.depth + 1):
+            target = index + step * offset
+            if wrap:
+                target %= num_slices
+            elif not 0 <= target < num_slices:
+                break
+            key = key_for(target)
+            if key is None or key in self.cache:
+                continue
+            with self._lock:
+                if key in self._queued:
+                    continue
+                self._queued.add(key)
+            self.pool.start(
+                PrefetchTask(self, key, lambda target=target: render_for(target))
+            )
+
+    def cancel(self):
+        self.pool.clear()
+        with self._lock:
+            self._queued.clear()
+
+    def _done(self, key):
+        with self._lock:
+            self._queued.discard(key)
@@ -0,0 +1,60 @@
+from functions.common.resample import downsample_2x
+from functions.utils.tracing import span
+import threading
+
+
+class VolumePyramid:
+    """볼륨의 level-of-detail 피라미드 (2x, 4x 축소본). 보는 방향 (axis) 별로 처음 필요할 때
+    백그라운드에서 생성.
+
+    axis 방향 level k 의 슬라이스 s 는 원본 슬라이스 s 를 평면 안에서만 k x k block 평균한
+    것이다. 슬라이스 방향으로는 섞지 않으므로 작은 화면에서도 정확히 그 슬라이스를 보여준다.
+    """
+
+    def __init__(self, tensor, factors=(2, 4)):
+        self.tensor = tensor
+        self.factors = tuple(sorted(factors))
+        self.levels = {}  # key: (axis, factor), value: 축소 볼륨
+        self._lock = threading.Lock()
+        self._threads = {}  # key: axis
+
+    def _build(self, axis):
+        try:
+            previous = self.tensor
+            built = 1
+            for factor in self.factors:
+                with span("render.pyramid", axis=axis, factor=factor):
+                    # 바로 아래 level 에서 2배씩 축소 (4x 는 2x 결과에서)
+                    while built < factor:
+                        previous = downsample_2x(previous, axis)
+                        built *= 2
+                with self._lock:
+                    self.levels[(axis, factor)] = previous
+        except Exception as e:
+            print(f"[Warning] Failed to build LOD pyramid: {e}")
+
+    def ensure_started(self, axis):
+        with self._lock:
+            if axis not in self._threads:
+                thread = threading.Thread(target=self._build, args=(axis,), daemon=True)
+                self._threads[axis] = thread
+                thread.start()
+
+    def select(self, scale, axis):
+        """화면 배율 scale (표시 px / 원본 px) 을 덮는 axis 방향의 가장 작은 level → (factor, 볼륨).
+
+        필요한 level 이 아직 없으면 생성을 시작하고 그 사이에는 있는 것 중 가장 가까운 level.
+        """
+        wanted = 1
+        for factor in self.factors:
+            if factor * scale <= 1.0:
+                wanted = factor
+        if wanted == 1:
+            return 1, self.tensor
+        self.ensure_started(axis)
+        with self._lock:
+            available = [f for a, f in self.levels if a == axis and f <= wanted]
+            if not available:
+                return 1, self.tensor
+            factor = max(available)
+            return factor, self.levels[(axis, factor)]
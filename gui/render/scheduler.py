@@ -0,0 +1,75 @@
+from PyQt5.QtCore import QObject, QTimer, Qt, pyqtSignal
+from PyQt5 import sip
+from collections import deque
+import time
+
+
+class RenderScheduler(QObject):
+    """뷰어의 다시 그리기 요청을 모아서 디스플레이 프레임당 최대 한 번만 렌더링.
+
+    사용자가 조작하는 동안에는 FastTransformation 미리보기로 그리고,
+    입력이 idle_ms 동안 없으면 SmoothTransformation 으로 최종 프레임을 다시 그린다.
+    """
+
+    frame_rendered = pyqtSignal(float)  # 프레임 렌더링 시간 (ms)
+
+    def __init__(self, parent=None, fps=60, idle_ms=150):
+        super().__init__(parent)
+        self.frame_interval = 1000.0 / fps
+        self.frame_times = deque(maxlen=120)  # 최근 프레임 렌더링 시간 (ms)
+        self._pending = {}  # 순서 유지용 dict, key: viewer
+        self._previewed = {}  # fast 미리보기로 그려진 뷰어 (idle 시 다시 그림)
+        self._interacting = False
+        self._last_frame = 0.0
+
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setTimerType(Qt.PreciseTimer)
+        self._frame_timer.timeout.connect(self._render_frame)
+
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(idle_ms)
+        self._idle_timer.timeout.connect(self._on_idle)
+
+    def request(self, viewer, interactive=True):
+        self._pending[viewer] = True
+        if interactive:
+            self._interacting = True
+            self._idle_timer.start()  # 입력이 올 때마다 idle 판정 연기
+        if not self._frame_timer.isActive():
+            elapsed = (time.perf_counter() - self._last_frame) * 1000.0
+            self._frame_timer.start(int(max(0.0, self.frame_interval - elapsed)))
+
+    def discard(self, viewer):
+        self._pending.pop(viewer, None)
+        self._previewed.pop(viewer, None)
+
+    def _render_frame(self):
+        pending, self._pending = self._pending, {}
+        fast = self._interacting
+        start = time.perf_counter()
+        for viewer in pending:
+            if sip.isdeleted(viewer):
+                continue
+            viewer._update_slice(fast=fast)
+            if fast:
+                self._previewed[viewer] = True
+            else:
+                self._previewed.pop(viewer, None)
+        self._last_frame = time.perf_counter()
+        elapsed_ms = (self._last_frame - start) * 1000.0
+        self.frame_times.append(elapsed_ms)
+        self.frame_rendered.emit(elapsed_ms)
+
+    def _on_idle(self):
+        self._interacting = False
+        previewed, self._previewed = self._previewed, {}
+        for viewer in previewed:
+            self.request(viewer, interactive=False)
+
+    def last_frame_ms(self):
+        return self.frame_times[-1] if self.frame_times else 0.0
+
+    def mean_frame_ms(self):
+        return sum(self.frame_times) / len(self.frame_times) if self.frame_times else 0.0
@@ -0,0 +1,188 @@
+from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QImage, QPainter, QColor
+from functions.common.normalization import min_max_normalize
+from functions.common.orientation import crop_view, display_shape
+from functions.common.reslice import plane_sampler
+from functions.common.windowing import lut_scratch_dtype, window_into, window_plane_into
+from gui.render.frame_buffer import FrameBuffer
+from functions.utils.tracing import span
+import numpy as np
+import threading
+
+AXIS_OF_VIEW = {"axial": 2, "coronal": 1, "sagittal": 0}
+
+_local = threading.local()  # prefetch 워커 스레드별 버퍼
+
+
+def thread_frame_buffer():
+    if not hasattr(_local, "buffer"):
+        _local.buffer = FrameBuffer()
+    return _local.buffer
+
+
+def uint8_to_qimage(img):
+    """C-contiguous uint8 배열을 복사 없이 감싼 QImage. img 는 QImage 를 쓰는 동안 유지해야 한다."""
+    h, w = img.shape
+    return QImage(img.data, w, h, img.strides[0], QImage.Format_Grayscale8)
+
+
+def window_slice(view, window, slope, inter, lut, buffer):
+    """방향 전환된 view → buffer 안의 uint8 프레임 (추가 할당 없음).
+
+    window 가 None 이면 view 자체 min-max 범위로 정규화.
+    """
+    if window is None:
+        lut = None
+    out = buffer.array(np.uint8, view.shape)
+    scratch = buffer.array(lut_scratch_dtype(lut), view.shape)
+    if window is None:
+        return min_max_normalize(view, out=out, scratch=scratch, slope=slope, inter=inter)
+    return window_into(view, out, window[0], window[1], slope, inter, lut, scratch)
+
+
+def display_size(width, height, size, aspect=None):
+    """원본 해상도 width x height 픽셀 영역을 size 안에 비율 유지로 맞춘 크기.
+
+    aspect 는 화면 가로/세로 한 픽셀의 실제 간격 (mm). 주어지면 물리적 비율을 따른다.
+    """
+    if aspect is None:
+        return QSize(width, height).scaled(size, Qt.KeepAspectRatio)
+    width_mm, height_mm = width * aspect[0], height * aspect[1]
+    scale = min(size.width() / width_mm, size.height() / height_mm)
+    return QSize(max(1, int(width_mm * scale)), max(1, int(height_mm * scale)))
+
+
+def render_slice(
+    tensor,
+    axis,
+    index,
+    size,
+    window=None,
+    slope=1.0,
+    inter=0.0,
+    lut=None,
+    transform=Qt.SmoothTransformation,
+    buffer=None,
+    crop=None,
+    pyramid=None,
+    proxy=None,
+    aspect=None,
+):
+    """슬라이스 추출 → (crop) → windowing → QImage → 스케일링.
+
+    window 가 None 이면 슬라이스별 min-max 범위로 windowing. QPixmap 을 쓰지 않으므로
+    워커 스레드에서도 호출 가능 (buffer 가 없으면 스레드별 버퍼 사용).
+    crop 은 원본 해상도 화면 좌표의 (x0, y0, x1, y1) 이며 windowing 전에 잘라낸다.
+    pyramid 가 있으면 표시 크기를 덮는 가장 작은 LOD level (평면 안에서만 축소) 에서 읽는다.
+    원본 해상도로 그릴 때 같은 window 로 만든 proxy (DisplayProxy) 가 준비돼 있으면
+    windowing 없이 proxy 의 연속 메모리 슬라이스를 그대로 쓴다.
+    aspect (화면 가로/세로 픽셀 간격, mm) 가 있으면 비등방 voxel 도 실제 비율로 늘려 그린다.
+    """
+    rows, cols = display_shape(tensor.shape, axis)
+    x0, y0, x1, y1 = crop if crop is not None else (0, 0, cols, rows)
+    target = display_size(x1 - x0, y1 - y0, size, aspect)
+    factor = 1
+    if pyramid is not None:
+        # 비등방 voxel 은 늘어나는 방향이 더 큰 배율이 필요하므로 큰 쪽 기준
+        scale = max(target.width() / max(x1 - x0, 1), target.height() / max(y1 - y0, 1))
+        factor, tensor = pyramid.select(scale, axis)
+    if factor > 1:
+        # level 은 평면 안에서만 축소돼 있으므로 슬라이스 index 는 그대로
+        x0, y0 = x0 // factor, y0 // factor
+        x1, y1 = max(x1 // factor, x0 + 1), max(y1 // factor, y0 + 1)
+    if crop is not None or factor > 1:
+        crop = (x0, y0, x1, y1)
+    plane = proxy.plane(index) if proxy is not None and factor == 1 else None
+    if plane is not None:
+        with span("render.qimage"):
+            # crop 한 view 는 행 사이가 떨어져 있으므로 작은 영역만 복사
+            qimg = uint8_to_qimage(np.ascontiguousarray(crop_view(plane, crop)))
+        with span("render.scale"):
+            return scale_image(qimg, size, transform, target)
+    if buffer is None:
+        buffer = thread_frame_buffer()
+    if window is None:
+        lut = None
+    with span("render.normalize"):
+        shape = display_shape(tensor.shape, axis, crop)
+        img = window_plane_into(
+            tensor,
+            axis,
+            index,
+            buffer.array(np.uint8, shape),
+            window,
+            slope,
+            inter,
+            lut,
+            buffer.array(lut_scratch_dtype(lut), shape),
+            crop,
+        )
+    with span("render.qimage"):
+        qimg = uint8_to_qimage(img)
+
+    with span("render.scale"):
+        return scale_image(qimg, size, transform, target)
+
+
+def render_resliced(
+    tensor,
+    axis,
+    index,
+    size,
+    spacing,
+    rotation=None,
+    order=1,
+    window=None,
+    slope=1.0,
+    inter=0.0,
+    lut=None,
+    buffer=None,
+    crop=None,
+    fill=0,
+):
+    """voxel spacing / 회전을 반영한 평면을 표시 크기 그대로 보간해 QImage 로.
+
+    index 는 회전 전 axis 방향 슬라이스 번호 (평면 중심의 위치). 출력이 이미 표시
+    크기라 Qt 스케일링이 없으며, nearest (order 0) 일 때만 원본 dtype 이라 LUT 를 쓴다.
+    """
+    rows, cols = display_shape(tensor.shape, axis)
+    x0, y0, x1, y1 = crop if crop is not None else (0, 0, cols, rows)
+    a_axis, b_axis = [ax for ax in range(3) if ax != axis]
+    target = display_size(x1 - x0, y1 - y0, size, (spacing[a_axis], spacing[b_axis]))
+    sampler = plane_sampler(
+        tensor.shape, spacing, axis, rotation, (target.height(), target.width()), crop
+    )
+    offset = sampler.offset_of(index)
+    with span("render.reslice", order=order):
+        plane = sampler.sample(tensor, offset, order)
+    if buffer is None:
+        buffer = thread_frame_buffer()
+    with span("render.normalize"):
+        img = window_slice(plane, window, slope, inter, lut if order == 0 else None, buffer)
+        outside = sampler.outside(offset)
+        if outside is not None:
+            img[outside] = fill  # oblique 평면에서 볼륨 밖은 window 와 무관하게 검정
+    with span("render.qimage"):
+        return uint8_to_qimage(img).copy()  # buffer 는 다음 프레임에 재사용되므로 분리
+
+
+def scale_image(qimg, size, transform=Qt.SmoothTransformation, target=None):
+    """KeepAspectRatio 스케일링 (target 이 있으면 그 크기로). 결과는 원본 버퍼와 분리된 QImage."""
+    if target is None:
+        target = qimg.size().scaled(size, Qt.KeepAspectRatio)
+    if target == qimg.size():
+        return qimg.copy()  # 같은 크기면 scaled() 가 버퍼를 공유하므로 분리
+    return qimg.scaled(target, Qt.IgnoreAspectRatio, transform)
+
+
+def placeholder_image(shape, size, text="Loading...", aspect=None):
+    """아직 디코딩되지 않은 슬라이스 자리에 그릴 이미지 (슬라이스와 같은 화면 비율)."""
+    rows, cols = shape
+    target = display_size(cols, rows, size, aspect)
+    image = QImage(max(target.width(), 1), max(target.height(), 1), QImage.Format_Grayscale8)
+    image.fill(QColor(24, 24, 24))
+    painter = QPainter(image)
+    painter.setPen(QColor(140, 140, 140))
+    painter.drawText(image.rect(), Qt.AlignCenter, text)
+    painter.end()
+    return image
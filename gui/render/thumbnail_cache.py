@@ -0,0 +1,191 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QSize, pyqtSignal
+from PyQt5.QtGui import QImage
+from functions.common.orientation import to_display
+from functions.common.windowing import default_window
+from gui.render.frame_buffer import FrameBuffer
+from functions.utils.tracing import traced
+from gui.render.slice_renderer import (
+    scale_image,
+    uint8_to_qimage,
+    window_slice,
+)
+import hashlib
+import json
+import os
+import threading
+
+THUMBNAIL_SIZE = (120, 130)
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "carrot-viewer", "thumbnails"
+)
+
+
+def thumbnail_slice(tensor):
+    """썸네일용 2D 화면 방향 view (3D 는 가운데 axial 슬라이스, 4D 는 첫 frame 기준)."""
+    if tensor.ndim == 2:
+        return to_display(tensor)
+    elif tensor.ndim == 3:
+        return to_display(tensor[:, :, tensor.shape[2] // 2])
+    elif tensor.ndim == 4:
+        return to_display(tensor[:, :, tensor.shape[2] // 2, 0])
+    else:
+        raise ValueError("Invalid tensor shape")
+
+
+@traced("thumbnail.render")
+def render_thumbnail(img_array, window=None, slope=1.0, inter=0.0):
+    """2D 배열 → 썸네일 QImage. QPixmap 을 쓰지 않으므로 워커 스레드에서도 호출 가능."""
+    # 한 장뿐이라 65536 칸 LUT 를 만드는 것보다 float32 작업 버퍼 한 번이 가볍다
+    buffer = FrameBuffer()
+    qimg = uint8_to_qimage(window_slice(img_array, window, slope, inter, None, buffer))
+    return scale_image(qimg, QSize(*THUMBNAIL_SIZE))
+
+
+def source_signature(path):
+    """디스크 캐시 key 의 기준: 원본 경로 + mtime + size (폴더는 폴더 자체의 stat)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}"
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class ThumbnailTask(QRunnable):
+    def __init__(self, cache, key, image_data):
+        super().__init__()
+        self.cache = cache
+        self.key = key
+        self.image_data = image_data
+
+    def run(self):
+        try:
+            image = self.cache._load_or_render(self.key, self.image_data)
+        except Exception as e:
+            print(f"[Warning] Failed to create thumbnail for {self.key}: {e}")
+            self.cache.thumbnail_failed.emit(self.key)  # 다음 request 때 다시 시도
+            return
+        self.cache.thumbnail_ready.emit(self.key, image)
+
+
+class ThumbnailCache(QObject):
+    """study key 별 썸네일을 워커에서 한 번만 만들고 메모리 + 디스크에 보관.
+
+    디스크 캐시는 원본 (NIfTI 파일 / DICOM 폴더) 의 경로 + mtime + size 로 구분하며,
+    원본별 manifest 로 어떤 study 가 있었는지 기억해서 다시 드롭했을 때
+    볼륨 로딩이 끝나기 전에 썸네일을 먼저 보여줄 수 있다.
+    """
+
+    thumbnail_ready = pyqtSignal(str, QImage)  # key, thumbnail
+    thumbnail_failed = pyqtSignal(str)  # key
+
+    def __init__(self, parent=None, cache_dir=DEFAULT_CACHE_DIR, max_workers=2):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.images = {}  # key: study key, value: QImage
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers)
+        self._requested = set()
+        self._manifest_lock = threading.Lock()
+        self.thumbnail_ready.connect(self._store)
+        self.thumbnail_failed.connect(self._requested.discard)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError as e:
+            print(f"[Warning] Thumbnail disk cache disabled: {e}")
+            self.cache_dir = None
+
+    def get(self, key):
+        return self.images.get(key)
+
+    def request(self, key, image_data):
+        """썸네일이 없으면 워커에서 생성 (완료 시 thumbnail_ready).
+
+        image_data 는 얕은 복사로 넘긴다. 작업이 돌기 전에 StudyStore 가 study 를 내려놓아도
+        (entry["tensor"] = None) 요청 시점의 tensor 로 그린다.
+        """
+        if key in self.images or key in self._requested:
+            return
+        self._requested.add(key)
+        self.pool.start(ThumbnailTask(self, key, dict(image_data)))
+
+    def _store(self, key, image):
+        self.images[key] = image
+        self._requested.discard(key)
+
+    # --- 디스크 캐시 ---
+
+    def _disk_path(self, signature, key):
+        return os.path.join(self.cache_dir, _digest(f"{signature}|{key}") + ".png")
+
+    def _manifest_path(self, source):
+        return os.path.join(self.cache_dir, _digest(os.path.abspath(source)) + ".json")
+
+    def _load_or_render(self, key, image_data):
+        source = image_data.get("source")
+        signature = source_signature(source) if source else None
+        disk_path = None
+        if self.cache_dir is not None and signature is not None:
+            disk_path = self._disk_path(signature, key)
+            if os.path.isfile(disk_path):
+                image = QImage(disk_path)
+                if not image.isNull():
+                    return image
+
+        stats = image_data.get("stats")
+        preview = image_data.get("preview")  # 디코딩 전 (lazy) DICOM 시리즈의 대표 슬라이스
+        image = render_thumbnail(
+            preview if preview is not None else thumbnail_slice(image_data["tensor"]),
+            window=default_window(stats) if stats is not None else None,
+            slope=image_data.get("slope", 1.0),
+            inter=image_data.get("inter", 0.0),
+        )
+        if disk_path is not None:
+            image.save(disk_path, "PNG")
+            self._add_to_manifest(source, signature, key, image_data["folder"])
+        return image
+
+    def _add_to_manifest(self, source, signature, key, folder):
+        path = self._manifest_path(source)
+        with self._manifest_lock:
+            manifest = self._read_manifest(path)
+            if manifest.get("signature") != signature:
+                manifest = {"signature": signature, "entries": []}
+            if all(entry["key"] != key for entry in manifest["entries"]):
+                manifest["entries"].append({"key": key, "folder": folder})
+            try:
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(manifest, f)
+            except OSError as e:
+                print(f"[Warning] Failed to write thumbnail manifest: {e}")
+
+    def _read_manifest(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def lookup_source(self, source):
+        """이전에 본 적 있는 원본이면 [(key, folder, QImage)] 반환 (로딩 전 미리보기용)."""
+        if self.cache_dir is None:
+            return []
+        signature = source_signature(source)
+        manifest = self._read_manifest(self._manifest_path(source))
+        if signature is None or manifest.get("signature") != signature:
+            return []
+
+        result = []
+        for entry in manifest["entries"]:
+            key = entry["key"]
+            image = self.images.get(key)
+            if image is None:
+                image = QImage(self._disk_path(signature, key))
+                if image.isNull():
+                    continue
+                self.images[key] = image
+            result.append((key, entry["folder"], image))
+        return result
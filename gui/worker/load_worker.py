@@ -0,0 +1,110 @@
+import os
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from functions.io.file_loader import load_nifty, load_dicom, LoadCancelled
+
+
+class LoadSignals(QObject):
+    started = pyqtSignal(str)  # path
+    progress = pyqtSignal(str, int, int)  # path, done, total
+    loaded = pyqtSignal(str, object)  # path, list of image_data
+    failed = pyqtSignal(str, str)  # path, error message
+    cancelled = pyqtSignal(str)  # path
+
+
+class LoadTask(QRunnable):
+    def __init__(self, path, signals, cancel_event, load_fn=None, lazy=False):
+        super().__init__()
+        self.path = path
+        self.signals = signals
+        self.cancel_event = cancel_event
+        self.load_fn = load_fn  # 지정하면 경로 대신 이 함수로 로드 (예: 내려간 study 복구)
+        self.lazy = lazy  # DICOM 폴더는 헤더 + 시리즈별 대표 슬라이스만 읽음
+
+    def run(self):
+        # 취소 시그널은 VolumeLoader.cancel() 에서 한 번만 보내므로 여기서는 조용히 종료
+        if self.cancel_event.is_set():
+            return
+
+        self.signals.started.emit(self.path)
+        try:
+            image_list = self._load()
+        except LoadCancelled:
+            return
+        except Exception as e:
+            self.signals.failed.emit(self.path, str(e))
+            return
+
+        if not self.cancel_event.is_set():
+            self.signals.loaded.emit(self.path, image_list)
+
+    def _load(self):
+        if self.load_fn is not None:
+            return self.load_fn()
+
+        if os.path.isfile(self.path):
+            # --- NIfTI 처리 ---
+            image_data = load_nifty(self.path)
+            image_data["key"] = self.path
+            image_list = [image_data]
+            self.signals.progress.emit(self.path, 1, 1)
+
+        elif os.path.isdir(self.path):
+            # --- DICOM 처리 ---
+            image_list = load_dicom(
+                self.path,
+                progress_callback=lambda done, total: self.signals.progress.emit(
+                    self.path, done, total
+                ),
+                cancel_event=self.cancel_event,
+                progressive=True,  # 가운데 슬라이스부터 보이고 나머지는 백그라운드에서 채움
+                lazy=self.lazy,
+            )
+
+        else:
+            raise ValueError("Invalid drop item: not a file or directory.")
+
+        for image_data in image_list:
+            image_data["source"] = self.path  # 썸네일 디스크 캐시 key 기준
+        return image_list
+
+
+class VolumeLoader(QObject):
+    """드롭된 경로들을 QThreadPool 에서 병렬로 디코딩하고 결과를 시그널로 전달."""
+
+    def __init__(self, parent=None, max_workers=None):
+        super().__init__(parent)
+        self.signals = LoadSignals()
+        self.pool = QThreadPool(self)
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 2) - 1)  # GUI 스레드 몫 남김
+        self.pool.setMaxThreadCount(max_workers)
+        self.lazy_series = True  # DICOM 시리즈는 썸네일을 클릭할 때 디코딩
+        self._cancel_event = threading.Event()
+        self._pending = set()  # 아직 끝나지 않은 경로
+
+        self.signals.loaded.connect(lambda path, _: self._discard(path))
+        self.signals.failed.connect(lambda path, _: self._discard(path))
+        self.signals.cancelled.connect(self._discard)
+
+    def submit(self, path: str, load_fn=None):
+        if path in self._pending:
+            return
+        self._pending.add(path)
+        self.pool.start(
+            LoadTask(path, self.signals, self._cancel_event, load_fn, self.lazy_series)
+        )
+
+    def cancel(self):
+        # 대기 중인 작업은 큐에서 제거, 실행 중인 작업은 이벤트로 중단
+        self.pool.clear()
+        self._cancel_event.set()
+        for path in list(self._pending):
+            self.signals.cancelled.emit(path)
+        self._cancel_event = threading.Event()
+
+    def is_busy(self):
+        return bool(self._pending)
+
+    def _discard(self, path):
+        self._pending.discard(path)